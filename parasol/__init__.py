@@ -1,2 +1,9 @@
 # Initialize by calling Controller, controller will call other necessary modules
-from .controller import Controller
+# Controller is imported on first access so importing a submodule (e.g. the UIs) does not load it
+
+
+def __getattr__(name):
+    if name == "Controller":
+        from .controller import Controller
+        return Controller
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -84,6 +84,7 @@ class Analysis:
         # Analyze JV files: for each module export scalars_{module}.csv
         analyzed_waves = self.analyze_files(
             jv_folders, jv_dict, mpp_folder, mpp_dict, env_folders, env_dict, analyzed_folder[0],
+            stringpath=stringpath,
         )
 
         return analyzed_waves
@@ -155,6 +156,8 @@ class Analysis:
         env_folder:list,
         env_dict: dict,
         analyzed_folder: str,
+        env: tuple = None,
+        stringpath: str = None,
     ) -> list:
 
         """Cycle through JV files, analyze, and make output file for parameters
@@ -167,6 +170,8 @@ class Analysis:
             analyzed_folder (str): analyzed folder path
             env_dict (dict): dictionary mapping env folders to file paths
             env_folder (str): env folder path
+            env (tuple, optional): (t, temp, rh, intensity) arrays from load_test_env, loaded from env_dict if None
+            stringpath (str, optional): path to test folder, used to load station environmental data if needed
         Returns:
             list[str]: path to analyzed files
         """
@@ -216,11 +221,21 @@ class Analysis:
             for k, v in scalardict_fwd.items():
                 scalardict[k] = v
 
-            # Interpolate environmental data for each set of JV curves
-            t = np.asarray([t_epoch for t_epoch in all_t])
-            env_headers, env_data = self.interp_env_data(t, env_dict[env_folder[0]])
-            for idx in range(1, len(env_headers)):
-                scalardict[env_headers[idx]] = env_data[idx]
+            # Use the environmental reading recorded with each set of JV curves, otherwise interpolate
+            env_headers, env_data = self.load_jv_envs(jv_file_paths)
+            if env_data is not None:
+                for idx in range(len(env_headers)):
+                    scalardict[env_headers[idx]] = env_data[idx]
+            else:
+                # Load environmental data once, only if a module needs it
+                if env is None and stringpath is not None:
+                    env = self.load_test_env(stringpath, env_dict[env_folder[0]])
+                elif env is None:
+                    env = self.load_env_files(env_dict[env_folder[0]])
+                t = np.asarray([t_epoch for t_epoch in all_t])
+                env_headers, env_data = self.interp_env_data(t, env=env)
+                for idx in range(1, len(env_headers)):
+                    scalardict[env_headers[idx]] = env_data[idx]
             
             # TODO: Check verify off Photodiode reading
             scalardict["REV PCE Norm (%)"] = np.asarray(scalardict["REV PCE (%)"])*np.asarray(scalardict["Intensity (# Suns)"])
@@ -381,12 +396,13 @@ class Analysis:
         
         return returndict
 
-    def interp_env_data(self, epochstamps: np.ndarray, files:list) -> list:
+    def interp_env_data(self, epochstamps: np.ndarray, files:list = None, env: tuple = None) -> list:
         """Interpolates the env matrix to the timestamps
 
         Args:
             epochstamps (np.ndarray): list of timestamps to interpolate to
             files (list(str)): list of filepaths to env data
+            env (tuple, optional): (t, temp, rh, intensity) arrays, used instead of files if given
 
         Returns:
             list(str): headers for interpolated dataframe
@@ -394,7 +410,9 @@ class Analysis:
         """
         
         # NEWNEW Pass list, get numpy arrays of all the data
-        t, temp, rh, intensity = self.load_env_files(files)
+        if env is None:
+            env = self.load_env_files(files)
+        t, temp, rh, intensity = env
         df_data = [t, temp, rh, intensity]
         df_headers = ["Time (Epoch)", "Temperature (C)", "RH (%)", "Intensity (# Suns)"]
 
@@ -507,17 +525,11 @@ class Analysis:
         """
 
         # Get time information
-        with open(jv_file_path) as f:
-            reader = csv.reader(f)
-            _ = next(reader)  # date
-            _ = next(reader)  # time
-            t = float(next(reader)[-1])  # epoch time
-            _ = next(reader)  # string
-            _ = next(reader)  # module
-            _ = next(reader)  # area
-
-        # Load rest of dataframe, split into paramters, and return
-        all_data = np.loadtxt(jv_file_path, delimiter=",", skiprows=8)
+        header = self.load_jv_header(jv_file_path)
+        t = float(header["epoch_time:"])
+
+        # Load rest of dataframe (after header rows, column names, and first point), split into paramters, and return
+        all_data = np.loadtxt(jv_file_path, delimiter=",", skiprows=len(header) + 2)
         all_data = np.transpose(all_data)
         if len(all_data)>0:
             v = all_data[0]
@@ -542,6 +554,51 @@ class Analysis:
 
         return t, v, vm_fwd, i_fwd, j_fwd, p_fwd, vm_rev, i_rev, j_rev, p_rev
 
+    def load_jv_header(self, jv_file_path: str) -> dict:
+        """Loads the "key:, value" header rows at the top of a JV file
+
+        Args:
+            jv_file_path (string): path to JV file
+
+        Returns:
+            dict: header[key] = value (str), in file order
+        """
+
+        header = {}
+        with open(jv_file_path) as f:
+            for line in csv.reader(f):
+                if len(line) < 2 or not line[0].endswith(":"):
+                    break
+                header[line[0]] = line[1]
+
+        return header
+
+    def load_jv_envs(self, jv_file_paths: list) -> list:
+        """Loads the environmental readings recorded with each JV file
+
+        Args:
+            jv_file_paths (list[str]): list of paths to jv files
+
+        Returns:
+            list(str): headers for environmental data
+            list(np.ndarray): environmental data per header, None if any file has no reading
+        """
+
+        keys = ["Temperature Dark (C):", "RH (%):", "Intensity (# Suns):", "Env Age (s):"]
+        env_headers = ["Temperature (C)", "RH (%)", "Intensity (# Suns)", "Env Age (s)"]
+
+        env_data = [[] for _ in keys]
+        for jv_file_path in jv_file_paths:
+            header = self.load_jv_header(jv_file_path)
+
+            # Files written without monitoring (or before readings were recorded) need interpolation
+            if not all(key in header for key in keys):
+                return env_headers, None
+            for idx, key in enumerate(keys):
+                env_data[idx].append(float(header[key]))
+
+        return env_headers, [np.asarray(data) for data in env_data]
+
     def load_mpp_files(self, mpp_file_paths: list) -> np.ndarray:
         """Loads MPP files contained in mpp_file_paths, returns data
 
@@ -684,6 +741,63 @@ class Analysis:
 
         return t_s, temp_s, rh_s, int_s
 
+    def load_test_env(self, stringpath: str, env_file_paths: list) -> np.ndarray:
+        """Loads environmental data for a test from its monitoring station, or its own env files for older tests
+
+        Args:
+            stringpath (str): path to test folder
+            env_file_paths (list[str]): paths to env files in the test folder
+
+        Returns:
+            np.ndarray: epoch time
+            np.ndarray: temperature
+            np.ndarray: relative humidity
+            np.ndarray: intensity
+        """
+
+        reference = self.filestructure.read_environment_reference(stringpath)
+        if reference is None:
+            return self.load_env_files(env_file_paths)
+
+        station, start, end = reference
+        return self.load_station_env(station, start, end)
+
+    def load_station_env(self, station: int, start: float, end: float = None) -> np.ndarray:
+        """Loads environmental data of a monitoring station between two times
+
+        Args:
+            station (int): monitoring station
+            start (float): start time (epoch)
+            end (float, optional): end time (epoch), None for everything after start. Defaults to None.
+
+        Returns:
+            np.ndarray: epoch time
+            np.ndarray: temperature
+            np.ndarray: relative humidity
+            np.ndarray: intensity
+        """
+
+        if end is None:
+            end = np.inf
+
+        # Only open daily files that can overlap the time range
+        station_folder = self.filestructure.get_station_environment_folder(station)
+        files = sorted(self.filestructure.get_subfiles(station_folder, ".csv"), key=self.filestructure.environment_file_epoch)
+        files = [
+            file for file in files
+            if start - 24 * 3600 < self.filestructure.environment_file_epoch(file) <= end
+        ]
+
+        # Load by column name, then slice to the time range
+        columns = ["Time (Epoch)", "Temperature Dark (C)", "RH (%)", "Intensity (# Suns)"]
+        if files:
+            df = pd.concat([pd.read_csv(file, usecols=columns) for file in files])
+            df = df[(df["Time (Epoch)"] >= start) & (df["Time (Epoch)"] <= end)]
+        else:
+            df = pd.DataFrame(columns=columns)
+
+        return tuple(df[column].to_numpy(dtype=float) for column in columns)
+
     def load_env_file(self, env_file_path: str) -> list:
         """Loads Environmental File
 
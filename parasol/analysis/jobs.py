@@ -0,0 +1,286 @@
+import os
+import sys
+import json
+import time
+import logging
+from threading import RLock
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+
+logger = logging.getLogger("PARASOL")
+
+# Job states, jobs that are queued or running when the controller stops are resubmitted on restart
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def _lower_priority() -> None:
+    """Drops the priority of an analysis worker process below the measurement process"""
+
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            BELOW_NORMAL_PRIORITY_CLASS = 0x4000
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), BELOW_NORMAL_PRIORITY_CLASS)
+        else:
+            os.nice(10)
+    except (OSError, AttributeError):
+        pass
+
+
+def _run_job(saveloc: str) -> list:
+    """Analyzes one test folder, runs in a worker process
+
+    Args:
+        saveloc (str): path to test folder
+
+    Returns:
+        list[str]: paths to analyzed files
+    """
+
+    from parasol.analysis.analysis import Analysis
+
+    return Analysis().analyze_from_savepath(saveloc)
+
+
+class AnalysisQueue:
+    """Runs post test analysis in worker processes from a job queue kept on disk
+
+    Jobs are written to a JSON file as they change state so a controller restart picks up any job that was
+    queued or interrupted. Worker processes run below normal priority so analysis never competes with the
+    threads timing relays and MPP tracking.
+    """
+
+    def __init__(self, path: str, max_workers: int = 1, resume: bool = True) -> None:
+        """Initializes the queue, resubmitting unfinished jobs from a previous run
+
+        Args:
+            path (str): path to the job file
+            max_workers (int): number of worker processes
+            resume (bool): resubmit jobs left queued/running in the job file
+        """
+
+        self.path = path
+        self.max_workers = max_workers
+        self.lock = RLock()
+        self.jobs = self._load()
+        self.pending = deque() # job ids waiting for a worker, in submission order
+        self.active = {} # active[job id] = worker process future
+        self.futures = {} # futures[job id] = future handed to the caller
+        self.pool = None
+        self.closed = False
+
+        if resume:
+            for job in sorted(self.jobs.values(), key=lambda job: job["submitted"]):
+                if job["status"] in [QUEUED, RUNNING]:
+                    logger.info(f"Resuming analysis of {job['saveloc']}")
+                    job.update(status=QUEUED, started=None)
+                    self._submit(job)
+
+    def _load(self) -> dict:
+        """Reads the job file
+
+        Returns:
+            dict: jobs[job id] = job dict
+        """
+
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return {job["id"]: job for job in json.load(f)}
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Could not read analysis jobs at {self.path}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        """Writes the job file, replacing it in one step so a crash never leaves half a file"""
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(list(self.jobs.values()), f, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def _update(self, job_id: str, **values) -> None:
+        """Updates a job and writes the job file"""
+
+        with self.lock:
+            self.jobs[job_id].update(values)
+            self._save()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Starts the worker processes on first use"""
+
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_lower_priority)
+        return self.pool
+
+    def submit(self, saveloc: str) -> Future:
+        """Queues analysis of a test folder
+
+        Args:
+            saveloc (str): path to test folder
+
+        Returns:
+            Future: result is the list of analyzed file paths
+        """
+
+        job = {
+            "id": f"{time.time():.6f}_{os.path.basename(os.path.normpath(saveloc))}",
+            "saveloc": saveloc,
+            "status": QUEUED,
+            "submitted": time.time(),
+            "started": None,
+            "finished": None,
+            "result": None,
+            "error": None,
+        }
+        with self.lock:
+            self.jobs[job["id"]] = job
+            self._save()
+
+        return self._submit(job)
+
+    def _submit(self, job: dict) -> Future:
+        """Adds a job to the pending jobs and starts it if a worker is free
+
+        Returns:
+            Future: result is the list of analyzed file paths
+        """
+
+        future = Future()
+        with self.lock:
+            self.futures[job["id"]] = future
+            self.pending.append(job["id"])
+            self._dispatch()
+        return future
+
+    def _dispatch(self) -> None:
+        """Hands pending jobs to the worker processes, one per free worker so running is exact"""
+
+        with self.lock:
+            while not self.closed and self.pending and len(self.active) < self.max_workers:
+                job_id = self.pending.popleft()
+                self.jobs[job_id].update(status=RUNNING, started=time.time())
+                self._save()
+                self.active[job_id] = self._get_pool().submit(_run_job, self.jobs[job_id]["saveloc"])
+                self.active[job_id].add_done_callback(lambda f, job_id=job_id: self._finish(job_id, f))
+
+    def _finish(self, job_id: str, pool_future: Future) -> None:
+        """Records the outcome of a job, passes it to the caller's future, and starts the next job"""
+
+        with self.lock:
+            self.active.pop(job_id, None)
+            future = self.futures.pop(job_id, None)
+            saveloc = self.jobs[job_id]["saveloc"]
+
+            # Cancelled by shutdown, leave it queued for the next start
+            if pool_future.cancelled():
+                self.jobs[job_id].update(status=QUEUED, started=None)
+                self._save()
+                if future is not None:
+                    future.cancel()
+                return
+
+            error = pool_future.exception()
+            if error is None:
+                self.jobs[job_id].update(status=DONE, finished=time.time(), result=pool_future.result())
+            else:
+                self.jobs[job_id].update(status=FAILED, finished=time.time(), error=repr(error))
+            self._save()
+
+        if error is None:
+            logger.info(f"Analysis saved at : {saveloc}")
+            if future is not None:
+                future.set_result(pool_future.result())
+        else:
+            logger.error(f"Analysis of {saveloc} failed: {error!r}")
+            if future is not None:
+                future.set_exception(error)
+
+        self._dispatch()
+
+    def status(self, job_id: str = None):
+        """Reports job status
+
+        Args:
+            job_id (str, optional): job to report, all jobs if None
+
+        Returns:
+            dict | list[dict]: job dict(s) with saveloc, status, submitted/started/finished times, result, error
+        """
+
+        with self.lock:
+            if job_id is not None:
+                return dict(self.jobs[job_id])
+            return [dict(job) for job in self.jobs.values()]
+
+    def summary(self) -> dict:
+        """Counts jobs in each state
+
+        Returns:
+            dict: counts[status] = number of jobs
+        """
+
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        with self.lock:
+            for job in self.jobs.values():
+                counts[job["status"]] += 1
+        return counts
+
+    def retry_failed(self) -> list:
+        """Resubmits failed jobs
+
+        Returns:
+            list[Future]: futures of the resubmitted jobs
+        """
+
+        with self.lock:
+            failed = [job for job in self.jobs.values() if job["status"] == FAILED]
+        futures = []
+        for job in failed:
+            self._update(job["id"], status=QUEUED, error=None, finished=None)
+            futures.append(self._submit(job))
+        return futures
+
+    def clear_finished(self) -> None:
+        """Removes finished jobs from the job file"""
+
+        with self.lock:
+            self.jobs = {k: job for k, job in self.jobs.items() if job["status"] in [QUEUED, RUNNING]}
+            self._save()
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stops the worker processes
+
+        Without wait, jobs that have not started stay queued in the job file and run on the next start, running
+        jobs are left to finish. With wait, all jobs finish first.
+
+        Args:
+            wait (bool): wait for all jobs to finish
+        """
+
+        if wait:
+            for future in list(self.futures.values()):
+                try:
+                    future.result()
+                except Exception:
+                    pass
+
+        with self.lock:
+            self.closed = True
+            pending = list(self.pending)
+            self.pending.clear()
+            for job_id in pending:
+                future = self.futures.pop(job_id, None)
+                if future is not None:
+                    future.cancel()
+            pool = self.pool
+            self.pool = None
+
+        if pool is not None:
+            pool.shutdown(wait=wait)
@@ -1,6 +1,9 @@
 import numpy as np
 import time
+from threading import Event
 
+from parasol.mppt import make_tracker
+from parasol.hardware.aio import run_sync
 from parasol.configuration.configuration import Configuration
 config = Configuration()
 constants = config.get_config()['characterization']
@@ -31,10 +34,20 @@ class Characterization:
         self.mpp_options = {
             0: "Perturb and Observe (constant V step)",
             1: "75% of Voc",
+            2: "Adaptive perturb and observe",
+            3: "Incremental conductance",
+            4: "Golden section (JV seeded)",
         }
 
-    def scan_jv(self, d: dict, scanner: object) -> np.ndarray:
-        """Conducts JV scan
+        # Map MPP modes to trackers registered in parasol.mppt
+        self.mpp_trackers = {
+            2: "adaptive_perturb_observe",
+            3: "incremental_conductance",
+            4: "golden_section",
+        }
+
+    async def scan_jv_async(self, d: dict, scanner: object) -> np.ndarray:
+        """Conducts JV scan from a coroutine, cancelling stops the sweep after the current point
 
         Args:
             d (dict): dictionary containing all necessary information (defined in controller.py)
@@ -55,11 +68,11 @@ class Characterization:
         if jv_mode == 0:
 
             # Run reverse scan
-            _, rev_vm, rev_i = scanner.iv_sweep(
+            _, rev_vm, rev_i = await scanner.iv_sweep_async(
                 vstart=d["jv"]["vmax"], vend=d["jv"]["vmin"], steps=d["jv"]["steps"]
             )
             # Run forward scan
-            v, fwd_vm, fwd_i = scanner.iv_sweep(
+            v, fwd_vm, fwd_i = await scanner.iv_sweep_async(
                 vstart=d["jv"]["vmin"], vend=d["jv"]["vmax"], steps=d["jv"]["steps"]
             )
 
@@ -67,25 +80,25 @@ class Characterization:
         elif jv_mode == 1:
 
             # Run forward scan
-            v, fwd_vm, fwd_i = scanner.iv_sweep(
+            v, fwd_vm, fwd_i = await scanner.iv_sweep_async(
                 vstart=d["jv"]["vmin"], vend=d["jv"]["vmax"], steps=d["jv"]["steps"]
             )
             # Run reverse scan
-            _, rev_vm, rev_i = scanner.iv_sweep(
+            _, rev_vm, rev_i = await scanner.iv_sweep_async(
                 vstart=d["jv"]["vmax"], vend=d["jv"]["vmin"], steps=d["jv"]["steps"]
             )
 
         # Mode = 2 scan rev then fwd (quadrant 4 only)
         elif jv_mode == 2:
 
-            v, fwd_vm, fwd_i, rev_vm, rev_i = scanner.iv_sweep_quadrant_rev_fwd(
+            v, fwd_vm, fwd_i, rev_vm, rev_i = await scanner.iv_sweep_quadrant_rev_fwd_async(
                 vstart=d["jv"]["vmin"], vend=d["jv"]["vmax"], steps=d["jv"]["steps"]
             )
 
         # Mode = 3, scan fwd then rev (quadrant 4 only)
         elif jv_mode == 3:
 
-            v, fwd_vm, fwd_i, rev_vm, rev_i = scanner.iv_sweep_quadrant_fwd_rev(
+            v, fwd_vm, fwd_i, rev_vm, rev_i = await scanner.iv_sweep_quadrant_fwd_rev_async(
                 vstart=d["jv"]["vmin"], vend=d["jv"]["vmax"], steps=d["jv"]["steps"]
             )
         
@@ -101,7 +114,7 @@ class Characterization:
                     np.array([np.nan,np.nan])
                     ]
             else:
-                v, fwd_vm, fwd_i, rev_vm, rev_i = scanner.iv_sweep_quadrant_fwd_rev(
+                v, fwd_vm, fwd_i, rev_vm, rev_i = await scanner.iv_sweep_quadrant_fwd_rev_async(
                     vstart=d["jv"]["vmin"], vend=d["jv"]["vmax"], steps=d["jv"]["steps"]
                 )
         
@@ -118,17 +131,37 @@ class Characterization:
                     np.array([np.nan,np.nan])
                     ]
             else:
-                v, fwd_vm, fwd_i, rev_vm, rev_i = scanner.iv_sweep_quadrant_fwd_rev(
+                v, fwd_vm, fwd_i, rev_vm, rev_i = await scanner.iv_sweep_quadrant_fwd_rev_async(
                     vstart=d["jv"]["vmin"], vend=d["jv"]["vmax"], steps=d["jv"]["steps"]
                 )
             
         return v, fwd_vm, fwd_i, rev_vm, rev_i
-    
-    
+
+    def scan_jv(self, d: dict, scanner: object, cancel: Event = None) -> np.ndarray:
+        """Conducts JV scan
+
+        Args:
+            d (dict): dictionary containing all necessary information (defined in controller.py)
+            scanner (object): pointer to the controller for the scanner
+            cancel (Event, optional): set from another thread to stop the scan after the current point
+
+        Raises:
+            asyncio.CancelledError: cancel was set before the scan finished
+
+        Returns:
+            np.ndarray: voltage (V) values
+            np.ndarray: FWD voltage measured (V) values
+            np.ndarray: FWD current (A) values
+            np.ndarray: REV voltage measured (V) values
+            np.ndarray: REV current (A) values
+        """
+
+        return run_sync(self.scan_jv_async(d, scanner), cancel)
+
 
     def track_mpp(
         self, d: dict, chroma: object, ch: int, vmpp_last: float
-    ) -> np.ndarray:
+    ) -> list:
         """Tracks Vmpp for next point
 
         Args:
@@ -138,10 +171,8 @@ class Characterization:
             vmpp_last (float): last maximum power point tracking voltage (V)
 
         Returns:
-            np.ndarray: time (epoch) values
-            np.ndarray: voltage applied (V) values
-            np.ndarray: voltage measured (V) values
-            np.ndarray: current (A) values
+            list[tuple]: (time (epoch), voltage applied (V), voltage measured (V), current (A)) for each point
+                taken, the load is left at the last point
         """
 
         # TODO Community: Expand! Examples below.
@@ -232,7 +263,32 @@ class Characterization:
             t = time.time()
             vm, i = chroma.set_V_measure_I(ch, v)
 
-        return t, v, vm, i
+        # Modes >= 2, registered trackers that can take several points per wakeup
+        elif mpp_mode in self.mpp_trackers:
+
+            # Make tracker for the string if we dont have one yet
+            tracker = d["mpp"].get("_tracker")
+            if tracker is None or tracker.name != self.mpp_trackers[mpp_mode]:
+                tracker = make_tracker(self.mpp_trackers[mpp_mode])
+                d["mpp"]["_tracker"] = tracker
+                d["mpp"]["_tracker_seed"] = None
+
+            # Reseed from the JV curves whenever a new set of scans is available
+            if d["mpp"].get("_tracker_seed") != d["jv"]["scan_count"]:
+                vmpp_jv, voc_jv = self.calc_jv_vmp_voc(d)
+                if vmpp_jv is not None:
+                    tracker.seed(vmpp_jv, voc_jv)
+                    d["mpp"]["_tracker_seed"] = d["jv"]["scan_count"]
+
+            # Run tracker, leave load at last point
+            return tracker.track(
+                lambda v_set: chroma.set_V_measure_I(ch, v_set),
+                vmpp_last,
+                d["mpp"]["vmin"],
+                d["mpp"]["vmax"],
+            )
+
+        return [(t, v, vm, i)]
 
 
     def calc_last_vmp(self, d: dict) -> float:
@@ -278,6 +334,59 @@ class Characterization:
 
         return vmpp
 
+    def calc_jv_vmp_voc(self, d: dict) -> tuple:
+        """Calculates Vmpp and Voc from the last set of JV curves on the string
+
+        Args:
+            d (dict): dictionary containing all necessary information (defined in controller.py)
+
+        Returns:
+            float: maximum power point voltage (V), None if JV curves are not filled
+            float: open circuit voltage (V), None if JV curves are not filled
+        """
+
+        num_modules = len(d["module_channels"])
+        if d["jv"]["j_fwd"][num_modules - 1] is None:
+            return None, None
+
+        # Average fwd and rev currents across modules (parallel)
+        v = d["jv"]["v"][0]
+        j = (np.nanmean(d["jv"]["j_fwd"], axis=0) + np.nanmean(d["jv"]["j_rev"], axis=0)) / 2
+
+        # Ignore nan values (quadrant sweeps, night)
+        if np.all(np.isnan(j)):
+            return None, None
+        vmpp = v[np.nanargmax(v * j)]
+        voc = v[np.nanargmin(np.abs(j))]
+
+        return vmpp, voc
+
+    def calc_jsc_voc(self, v: np.ndarray, j: np.ndarray) -> tuple:
+        """Calculates Jsc and Voc from a JV curve
+
+        Args:
+            v (np.ndarray): voltage (V) values, increasing
+            j (np.ndarray): current density (mA/cm2) values, positive under illumination
+
+        Returns:
+            float: short circuit current density (mA/cm2), None if V = 0 is outside the curve
+            float: open circuit voltage (V), None if the current does not cross zero
+        """
+
+        v = np.asarray(v, dtype=float)
+        j = np.asarray(j, dtype=float)
+
+        jsc = float(np.interp(0, v, j)) if v[0] <= 0 <= v[-1] else None
+
+        # First crossing from generating to consuming current above V = 0
+        voc = None
+        crossings = np.where((j[:-1] > 0) & (j[1:] <= 0) & (v[1:] > 0))[0]
+        if len(crossings):
+            k = crossings[0]
+            voc = float(v[k] + (v[k + 1] - v[k]) * j[k] / (j[k] - j[k + 1]))
+
+        return jsc, voc
+
     def check_orientation(self, scanner: object) -> bool:
         """Checks the orientation of the module by verifying that Jsc > 0
         
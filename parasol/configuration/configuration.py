@@ -1,4 +1,6 @@
 import os
+import logging
+from threading import Thread, Lock, Event
 import yaml
 
 
@@ -6,28 +8,466 @@ MODULE_DIR = os.path.dirname(__file__)
 DEFAULT_USER_CONFIG = os.path.join(MODULE_DIR, "hardwareconstants.yaml")
 CUSTOM_USER_CONFIG = os.path.join(MODULE_DIR, "userconstants.yaml")
 
+logger = logging.getLogger(__name__)
+
+# Types used in the schema, ints are accepted wherever a float is
+NUMBER = (int, float)
+
+# Schema for the config file: SCHEMA[section][key] = (type(s), min, max), None for no bound
+# Keys not listed are allowed so user configs can carry extra entries
+SCHEMA = {
+    "filestructure": {
+        "root_dir": (str, None, None),
+        "analysis_dir": (str, None, None),
+    },
+    "topology": {
+        "num_strings": (int, 1, None),
+        "modules_per_string": (int, 1, None),
+        "load_channels": (list, None, None),
+        "outdoor_stations": (list, None, None),
+        "indoor_stations": (list, None, None),
+    },
+    "relay": {
+        "relay_mode": (int, 0, None),
+        "multi_relay_frames": (bool, None, None),
+        "break_before_make": (bool, None, None),
+        "baud_rate": (int, 1, None),
+        "turnaround_delay": (NUMBER, 0, None),
+        "rx_timeout": (NUMBER, 0, None),
+        "adapter_latency": (NUMBER, 0, None),
+        "device_identifiers": (dict, None, None),
+    },
+    "yokogawa": {
+        "address": (str, None, None),
+        "timeout": (NUMBER, 0, None),
+        "source_delay": (NUMBER, 0, None),
+        "sense_delay": (NUMBER, 0, None),
+        "integration_time": (NUMBER, 0, None),
+        "max_voltage": (NUMBER, 0.2, 110),
+        "max_current": (NUMBER, 2e-6, 3),
+        "bus_priority": (int, 0, None),
+        "pool": (list, None, None),
+    },
+    "chroma": {
+        "address": (str, None, None),
+        "time_out": (NUMBER, 0, None),
+        "source_delay": (NUMBER, 0, None),
+        "sense_delay": (str, None, None),
+        "avg_num": (int, 1, None),
+        "voltage_range": (str, None, None),
+        "current_range": (NUMBER, 0, None),
+        "settle_detect": (bool, None, None),
+        "settle_tolerance": (NUMBER, 0, None),
+        "settle_samples": (int, 2, None),
+        "settle_min_time": (NUMBER, 0, None),
+        "bus_priority": (int, 0, None),
+    },
+    "gpib": {
+        "max_wait": (NUMBER, 0, None),
+    },
+    "replay": {
+        "mode": (str, None, None),
+        "path": (str, None, None),
+        "speed": (NUMBER, 0, None),
+        "strict": (bool, None, None),
+    },
+    "labjack": {
+        "voltage_port": (int, 0, 13),
+        "ground_port": (int, 0, 13),
+        "thermocouple2_port": (int, 0, 13),
+        "thermocouple1_port": (int, 0, 13),
+        "hygrometer_port": (int, 0, 13),
+        "photodiode_port": (int, 0, 13),
+        "average_num": (int, 1, None),
+        "delay_time": (NUMBER, 0, None),
+        "acquisition_mode": (str, None, None),
+    },
+    "hotplate": {
+        "poll_max_age": (NUMBER, 0, None),
+    },
+    "environmental": {},
+    "characterization": {
+        "mppt_voltage_step": (NUMBER, 0, None),
+        "mppt_min_voltage_step": (NUMBER, 0, None),
+        "mppt_max_voltage_step": (NUMBER, 0, None),
+        "mppt_max_substeps": (int, 1, None),
+        "nightmode_starthour": (int, 0, 23),
+        "nightmode_endhour": (int, 0, 23),
+    },
+    "analysis": {
+        "derivative_v_percent": (NUMBER, 0, None),
+    },
+    "controller": {
+        "monitor_delay": (NUMBER, 0, None),
+        "measurement_delay": (NUMBER, 0, None),
+        "config_reload_interval": (NUMBER, 0, None),
+        "settle_detect": (bool, None, None),
+        "settle_tolerance": (NUMBER, 0, None),
+        "settle_samples": (int, 2, None),
+        "mpp_points": (int, 1, None),
+        "analysis_workers": (int, 1, None),
+        "idle_mode": (bool, None, None),
+        "idle_enter_intensity": (NUMBER, 0, None),
+        "idle_exit_intensity": (NUMBER, 0, None),
+        "probe_interval": (NUMBER, 0, None),
+        "probe_tolerance": (NUMBER, 0, None),
+        "probe_sweep": (bool, None, None),
+        "outdoor_config": (dict, None, None),
+        "indoor_config": (dict, None, None),
+    },
+    "LAUNCH_UI": {
+        "function": (int, 0, 1),
+        "mode": (int, 0, 1),
+        "bypass": (bool, None, None),
+        "hide_after_launch": (bool, None, None),
+    },
+    "RUN_UI": {
+        "area": (NUMBER, 0, None),
+        "jv_mode": (int, 0, None),
+        "mpp_mode": (int, 0, None),
+        "jv_frequency": (NUMBER, 0, None),
+        "mpp_frequency": (NUMBER, 0, None),
+        "v_min": (NUMBER, None, None),
+        "v_max": (NUMBER, None, None),
+        "v_steps": (int, 2, None),
+        "temp": (NUMBER, None, None),
+        "rh": (NUMBER, None, None),
+        "intensity": (NUMBER, None, None),
+    },
+    "GRAPH_UI": {
+        "font_size": (NUMBER, 1, None),
+        "marker_size": (NUMBER, 0, None),
+        "n_rows": (int, 1, None),
+        "n_cols": (int, 1, None),
+    },
+}
+
+# Keys that can change while tests are running, everything else needs a restart
+RUNTIME_KEYS = {
+    "controller": [
+        "monitor_delay",
+        "measurement_delay",
+        "idle_enter_intensity",
+        "idle_exit_intensity",
+    ],
+    "characterization": [
+        "mppt_voltage_step",
+        "mppt_min_voltage_step",
+        "mppt_max_voltage_step",
+        "mppt_max_substeps",
+    ],
+}
+
+# Optional keys get these defaults when missing so older user configs keep working
+DEFAULTS = {
+    "topology": {
+        "num_strings": 6,
+        "modules_per_string": 4,
+        "load_channels": [1, 2, 3, 4, 7, 8],
+        "outdoor_stations": [0],
+        "indoor_stations": [1, 2, 3, 4, 5, 6],
+    },
+    "relay": {
+        "multi_relay_frames": False,
+        "break_before_make": True,
+        "baud_rate": 9600,
+        "turnaround_delay": 0.005,
+        "rx_timeout": 0.1,
+        "adapter_latency": 0.016,
+    },
+    "yokogawa": {
+        "bus_priority": 1,
+        "pool": [],
+    },
+    "chroma": {
+        "bus_priority": 0,
+        "settle_detect": True,
+        "settle_tolerance": 0.02,
+        "settle_samples": 2,
+        "settle_min_time": 0.02,
+    },
+    "labjack": {
+        "acquisition_mode": "batch",
+    },
+    "hotplate": {
+        "poll_max_age": 5,
+    },
+    "gpib": {
+        "max_wait": 0.5,
+    },
+    "replay": {
+        "mode": "off",
+        "path": "",
+        "speed": 1,
+        "strict": True,
+    },
+    "characterization": {
+        "mppt_min_voltage_step": 0.02,
+        "mppt_max_voltage_step": 2,
+        "mppt_max_substeps": 5,
+    },
+    "controller": {
+        "settle_detect": True,
+        "settle_tolerance": 0.005,
+        "settle_samples": 3,
+        "idle_mode": True,
+        "idle_enter_intensity": 0.02,
+        "idle_exit_intensity": 0.05,
+        "config_reload_interval": 0,
+        "analysis_workers": 1,
+        "probe_interval": 0,
+        "probe_tolerance": 0.1,
+        "probe_sweep": True,
+    },
+}
+
+# Process wide config: loaded once, runtime keys updated in place on reload
+_constants = None
+_mtime = None
+_callbacks = []
+_lock = Lock()
+
+
+def config_path() -> str:
+    """Returns the path of the config file in use, user config if it exists"""
+
+    if os.path.exists(CUSTOM_USER_CONFIG):
+        return CUSTOM_USER_CONFIG
+    return DEFAULT_USER_CONFIG
+
+
+def validate(constants: dict) -> dict:
+    """Checks the config against the schema and fills in defaults
+
+    Args:
+        constants (dict): parsed config
+
+    Raises:
+        ValueError: config has missing keys, wrong types, or out of range values
+
+    Returns:
+        dict: the config
+    """
+
+    errors = []
+    if not isinstance(constants, dict):
+        raise ValueError(f"Config must be a mapping of sections, got {type(constants).__name__}")
+
+    # Configs from before the topology section keep their number of strings
+    relay = constants.get("relay")
+    if "topology" not in constants and isinstance(relay, dict) and "num_strings" in relay:
+        constants["topology"] = {"num_strings": relay["num_strings"]}
+
+    for section, keys in SCHEMA.items():
+        # Sections made only of defaulted keys may be missing entirely
+        if section not in constants and set(keys) <= set(DEFAULTS.get(section, {})):
+            constants[section] = {}
+        values = constants.get(section)
+        if values is None and not keys:
+            continue
+        if not isinstance(values, dict):
+            errors.append(f"missing section '{section}'")
+            continue
+
+        for key, default in DEFAULTS.get(section, {}).items():
+            values.setdefault(key, default)
+
+        for key, (types, vmin, vmax) in keys.items():
+            if key not in values:
+                errors.append(f"missing key '{section}.{key}'")
+                continue
+            value = values[key]
+
+            # bool is an int subclass, only allow it where a bool is asked for
+            if isinstance(value, bool) and types is not bool:
+                errors.append(f"'{section}.{key}' must be {_type_name(types)}, got bool")
+                continue
+            if not isinstance(value, types):
+                errors.append(f"'{section}.{key}' must be {_type_name(types)}, got {type(value).__name__}")
+                continue
+            if vmin is not None and value < vmin:
+                errors.append(f"'{section}.{key}' = {value} is below the minimum {vmin}")
+            if vmax is not None and value > vmax:
+                errors.append(f"'{section}.{key}' = {value} is above the maximum {vmax}")
+
+    # Cross key checks
+    if not errors:
+        controller = constants["controller"]
+        if controller["idle_exit_intensity"] < controller["idle_enter_intensity"]:
+            errors.append("'controller.idle_exit_intensity' must be >= 'controller.idle_enter_intensity'")
+        characterization = constants["characterization"]
+        if not (
+            characterization["mppt_min_voltage_step"]
+            <= characterization["mppt_voltage_step"]
+            <= characterization["mppt_max_voltage_step"]
+        ):
+            errors.append("MPPT voltage steps must satisfy min <= step <= max")
+        wired = set()
+        for index, entry in enumerate(constants["yokogawa"]["pool"]):
+            if not isinstance(entry, dict) or not isinstance(entry.get("address"), str) or not isinstance(entry.get("modules"), list):
+                errors.append(f"'yokogawa.pool[{index}]' must have an address and a list of modules")
+                continue
+            for module in entry["modules"]:
+                if module in wired:
+                    errors.append(f"Module {module} is in more than one 'yokogawa.pool' entry")
+                wired.add(module)
+
+    if errors:
+        raise ValueError("Invalid config:\n  " + "\n  ".join(errors))
+    return constants
+
+
+def _type_name(types) -> str:
+    """Readable name of a schema type"""
+
+    if isinstance(types, tuple):
+        return "a number"
+    return types.__name__
+
+
+def _load(path: str) -> dict:
+    """Reads and validates the config file at path"""
+
+    with open(path, "r") as f:
+        constants = yaml.safe_load(f)
+    return validate(constants)
+
+
+def subscribe(callback) -> None:
+    """Registers a function to call with the changed runtime keys after a reload
+
+    Args:
+        callback (function): called as callback(changes) with changes[section][key] = new value
+    """
+
+    with _lock:
+        if callback not in _callbacks:
+            _callbacks.append(callback)
+
+
+def unsubscribe(callback) -> None:
+    """Removes a function registered with subscribe"""
+
+    with _lock:
+        if callback in _callbacks:
+            _callbacks.remove(callback)
+
+
+def reload() -> dict:
+    """Re-reads the config file and applies changed runtime keys
+
+    The cached sections are updated in place, so modules holding a section (constants = get_config()[...])
+    see the new values. Changes to other keys are ignored until restart. An invalid file leaves the
+    config untouched.
+
+    Returns:
+        dict: changes[section][key] = new value for runtime keys that changed
+    """
+
+    global _mtime
+
+    constants = Configuration().get_config()
+    path = config_path()
+    try:
+        _mtime = os.path.getmtime(path)
+        new_constants = _load(path)
+    except (OSError, yaml.YAMLError, ValueError) as e:
+        logger.warning(f"Config reload skipped: {e}")
+        return {}
+
+    changes = {}
+    with _lock:
+        for section, keys in RUNTIME_KEYS.items():
+            for key in keys:
+                if new_constants[section][key] != constants[section][key]:
+                    constants[section][key] = new_constants[section][key]
+                    changes.setdefault(section, {})[key] = new_constants[section][key]
+
+        for section, values in new_constants.items():
+            for key, value in values.items() if isinstance(values, dict) else []:
+                if key not in RUNTIME_KEYS.get(section, []) and value != constants.get(section, {}).get(key):
+                    logger.info(f"Config key '{section}.{key}' changed, restart to apply it")
+
+        callbacks = list(_callbacks)
+
+    if changes:
+        logger.info(f"Config reloaded: {changes}")
+        for callback in callbacks:
+            callback(changes)
+
+    return changes
+
+
+class ConfigWatcher:
+    """Watches the config file and reloads runtime keys when it changes"""
+
+    def __init__(self, interval: float = 5) -> None:
+        """Initializes the watcher
+
+        Args:
+            interval (float): time between checks of the file (s)
+        """
+
+        self.interval = interval
+        self.stop_event = Event()
+        self.thread = None
+
+    def start(self) -> None:
+        """Starts watching in a background thread"""
+
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stops watching"""
+
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self) -> None:
+        """Checks the modified time of the config file, reloads on change"""
+
+        while not self.stop_event.wait(self.interval):
+            try:
+                mtime = os.path.getmtime(config_path())
+            except OSError:
+                continue
+            if mtime != _mtime:
+                reload()
+
+
 class Configuration:
-    
+
     def __init__(self):
         pass
-    
+
     def create_custom_config(self):
 
         # open default file
         with open(DEFAULT_USER_CONFIG, "r") as f:
             default_constants = yaml.safe_load(f)
-        
+
         # copy contents to desired location
         with open(CUSTOM_USER_CONFIG, 'w') as file:
             user_constants = yaml.dump(default_constants, file)
-        
+
         print(f"We started a custom user config file for you at {CUSTOM_USER_CONFIG}. Please edit this file to point parasol to your directories.")
 
     def get_config(self):
-        if os.path.exists(CUSTOM_USER_CONFIG):
-            with open(CUSTOM_USER_CONFIG, "r") as f:
-                constants = yaml.safe_load(f)
-        else:
-            with open(DEFAULT_USER_CONFIG, "r") as f:
-                constants = yaml.safe_load(f)        
-        return constants
\ No newline at end of file
+        """Returns the process wide config, the file is read and validated on the first call only"""
+
+        global _constants, _mtime
+
+        if _constants is None:
+            with _lock:
+                if _constants is None:
+                    path = config_path()
+                    _mtime = os.path.getmtime(path)
+                    _constants = _load(path)
+        return _constants
+
@@ -1,7 +1,7 @@
 import time
 import asyncio
-from threading import Thread, Lock
-from concurrent.futures import ThreadPoolExecutor
+from threading import Thread, Lock, Event
+from concurrent.futures import ThreadPoolExecutor, Future
 from concurrent.futures._base import CancelledError
 import os
 import csv
@@ -17,15 +17,19 @@ import smtplib
 import numpy as np
 
 from parasol.relay.relay import Relay
-from parasol.hardware.yokogawa import Yokogawa
-from parasol.hardware.chroma import Chroma
-from parasol.environmental import Environmental
+from parasol.hardware.settle import SettleDetector
+from parasol.hardware import gpib
+from parasol.hardware.scanner_pool import ScannerPool, pool_config
 
-from parasol.analysis.analysis import Analysis
+# Hardware drivers (pyvisa, u6, serial) and Analysis (pandas) are imported on first use, see customize and analysis
 from parasol.characterization import Characterization
+from parasol.analysis.jobs import AnalysisQueue
+from parasol.journal import Journal
+from parasol.mppt import make_tracker
 from parasol.filestructure import FileStructure
+from parasol.topology import get_topology
 
-from parasol.configuration.configuration import Configuration
+from parasol.configuration.configuration import Configuration, ConfigWatcher, subscribe
 config = Configuration()
 constants = config.get_config()['controller']
 
@@ -52,18 +56,39 @@ class Controller:
         self.monitor_delay = constants["monitor_delay"]
         self.measurement_delay = constants["measurement_delay"]
         self.mpp_points = constants["mpp_points"]
-        self.num_modules = constants["num_modules"]
-        self.num_strings = constants["num_strings"]
+        self.idle_mode = constants["idle_mode"]
+        self.idle_enter_intensity = constants["idle_enter_intensity"]
+        self.idle_exit_intensity = constants["idle_exit_intensity"]
+        self.probe_interval = constants["probe_interval"]
+        self.probe_tolerance = constants["probe_tolerance"]
+        self.probe_sweep = constants["probe_sweep"]
+
+        # Settle detection after relay switching, measurement_delay is used as the maximum wait
+        self.settle_detect = constants["settle_detect"]
+        self.settle = SettleDetector(
+            tolerance=constants["settle_tolerance"],
+            samples=constants["settle_samples"],
+            max_time=self.measurement_delay,
+            relative=True,
+        )
+
+        # Watch the config file so delays, idle intensities, and MPPT steps can be tuned while tests run
+        self.config_watcher = None
+        if constants["config_reload_interval"]:
+            self.config_watcher = ConfigWatcher(constants["config_reload_interval"])
+        subscribe(self.apply_config)
         
         # Load modules that dont have hardware associated & Relay (needed for base organization), load optionals as False (load in during customize)
         self.characterization = Characterization()
-        self.analysis = Analysis()
+        self._analysis = None
         self.filestructure = FileStructure() 
         # self.fstructure_backup = FileStructure(backup = self.backup)# added by ZJD 01/29/2024
-        self.relay = Relay()
-        
+
+        # Hardware is connected in customize, all instruments at once
+        self.relay = False
         self.environment = False
         self.scanner = False
+        self.scanner_pool = None
         self.load = False
         self.monitor = False
         self.env_control = False
@@ -81,34 +106,47 @@ class Controller:
         # Create blank message that can be checked from other programs (used in RUN_UI)
         self.message = None
 
+        # Rack layout from the topology config section
+        self.topology = get_topology()
+        self.num_strings = self.topology.num_strings
+        self.num_modules = self.topology.num_modules
+
         # Map string ID to load port and channel
-        self.load_channels = {
-            1: 1,
-            2: 2,
-            3: 3,
-            4: 4,
-            5: 7,
-            6: 8,
-        }
+        self.load_channels = self.topology.load_channels
 
         # Maps string ID to module channels
-        self.module_channels = {
-            1: [1, 2, 3, 4],
-            2: [5, 6, 7, 8],
-            3: [9, 10, 11, 12],
-            4: [13, 14, 15, 16],
-            5: [17, 18, 19, 20],
-            6: [21, 22, 23, 24],
-        }
+        self.module_channels = self.topology.module_channels
         
+        # Relay frames, transitions and time saved by ordering module visits, see record_switching
+        self.switching_lock = Lock()
+        self.switching = {
+            "cycles": 0,
+            "frames": 0,
+            "saved_frames": 0,
+            "transitions": 0,
+            "saved_transitions": 0,
+            "time": 0.0,
+            "saved_time": 0.0,
+        }
+
+        # Create a blank dictionary to hold the latest health probe of each module, see probe_string
+        self.probe_results = {}
+
         # Create a blank dictionary to hold all info about monitoring stations
         self.monitor_stations = {}
+
+        # Create a blank dictionary to hold idle (dark) status of each monitoring station
+        self.idle_stations = {}
+
+        # Create a blank dictionary to hold the latest environmental reading of each monitoring station
+        # env_readings[station] = (t, temp_dark, temp_light, rh, intensity)
+        self.env_readings = {}
         
         # Create blank dictionary to hold all info about strings
         self.strings = {}
 
         # Create list of active strings
-        self.active_strings = [False] * (len(self.load_channels)+1)
+        self.active_strings = [False] * (self.num_strings+1)
         
         # Create characterization and logging directories
         self.characterizationdir = self.filestructure.get_characterization_dir()
@@ -147,8 +185,35 @@ class Controller:
             self.logger.addHandler(fh)
             self.logger.addHandler(sh)
 
-        # Create workers (1 for scanner, 1 for loads, 1 for random tasks, 1 for environment) & start queue
-        self.threadpool = ThreadPoolExecutor(max_workers=4)
+        # SMUs to connect, JV sweeps are spread over them (one JV worker per scanner)
+        self.scanner_configs = pool_config()
+        self.jv_workers = [f"jv{n+1}" for n in range(len(self.scanner_configs))]
+
+        # Readiness handshakes: event loop running, each worker listening, all hardware connected
+        self.loop_ready = Event()
+        self.workers_ready = {name: Event() for name in ["monitor", "mpp", "check_orientation", "probe"] + self.jv_workers}
+        self.hardware_ready = Event()
+        self.init_times = {}
+
+        # Create workers (1 per scanner, 1 for loads, 1 for random tasks, 1 for health probes, 1 for environment) & start queue
+        self.threadpool = ThreadPoolExecutor(max_workers=4 + len(self.jv_workers))
+
+        # Pool for sweeping the modules of one string on several scanners at once
+        self.sweep_pool = ThreadPoolExecutor(max_workers=len(self.scanner_configs))
+
+        # Pool for converting and writing JV sweeps while the next module is swept, 1 per scanner
+        self.save_pool = ThreadPoolExecutor(max_workers=len(self.scanner_configs))
+
+        # Pool for resetting hardware on unload so it does not hold up measurements
+        self.teardown_pool = ThreadPoolExecutor(max_workers=4)
+
+        # Journal of string configuration and tracker state, used by resume after a crash/restart
+        self.journal = Journal(self.filestructure.get_journal_path())
+
+        # Post test analysis runs in low priority worker processes, jobs left from a previous run are resumed
+        self.analysis_queue = AnalysisQueue(
+            self.filestructure.get_analysis_queue_path(), constants["analysis_workers"]
+        )
         self.start()
         
         # Initialize appropriate modules for the mode
@@ -157,79 +222,128 @@ class Controller:
 
     def customize(self) -> None:
         """Initializes hardware for test type"""
+
+        # Collect the instruments the mode needs, they are connected together at the end
+        devices = {"relay": Relay}
         
         if self.mode == 'outdoor':
 
             if constants['outdoor_config']['scanner']:
-                self.scanner = Yokogawa()
+                from parasol.hardware.yokogawa import Yokogawa
+                for scanner in self.scanner_configs:
+                    devices[scanner["name"]] = lambda scanner=scanner: Yokogawa(scanner["address"], scanner["name"])
             if constants['outdoor_config']['load']:
-                self.load = Chroma()
+                from parasol.hardware.chroma import Chroma
+                devices["load"] = Chroma
             if constants['outdoor_config']['monitor']:
                 self.monitor = True
             if constants['outdoor_config']['env_control']:
                 self.env_control = False
             
-            # Map string id to monitoring station
-            self.monitor_stations = {
-                1: 0,
-                2: 0,
-                3: 0,
-                4: 0,
-                5: 0,
-                6: 0,
-            }
-            
         if self.mode == 'indoor':
 
             if constants['indoor_config']['scanner']:
-                self.scanner = Yokogawa()
+                from parasol.hardware.yokogawa import Yokogawa
+                for scanner in self.scanner_configs:
+                    devices[scanner["name"]] = lambda scanner=scanner: Yokogawa(scanner["address"], scanner["name"])
             if constants['indoor_config']['load']:
                 self.load = False
             if constants['indoor_config']['monitor']:
                 self.monitor = True
             if constants['indoor_config']['env_control']:
                 self.env_control = True
-            
-            
-            # Map string id to monitoring station
-            self.monitor_stations = {
-                1: 1,
-                2: 2,
-                3: 3,
-                4: 4,
-                5: 5,
-                6: 6,
-            }
+
+        # Map string id to monitoring station
+        self.monitor_stations = self.topology.get_stations(self.mode)
         
         if self.monitor or self.env_control:
+            from parasol.environmental import Environmental
             stations = list(set(self.monitor_stations.values()))
-            self.environment = Environmental(self.mode, stations)
+            devices["environment"] = lambda: Environmental(self.mode, stations)
+
+        # Connect independent instruments concurrently, then let the workers start taking jobs
+        instruments = self.init_hardware(devices)
+        scanners = [instruments.pop(scanner["name"]) for scanner in self.scanner_configs if scanner["name"] in instruments]
+        for name, instrument in instruments.items():
+            setattr(self, name, instrument)
+
+        # Tie each scanner to the relay boards of its modules
+        if scanners:
+            self.scanner = scanners[0]
+            self.scanner_pool = ScannerPool(scanners, [scanner["modules"] for scanner in self.scanner_configs], self.relay)
+        self.hardware_ready.set()
+
+    def init_hardware(self, devices: dict) -> dict:
+        """Initializes independent instruments concurrently, logging how long each takes
+
+        Args:
+            devices (dict): devices[name] = function that connects and returns the instrument
+
+        Raises:
+            Exception: first error raised by an instrument, after all instruments have finished. The instruments
+                that did connect are disconnected and the workers stopped first, so a retry finds the ports free
+
+        Returns:
+            dict: instruments[name] = instrument
+        """
+
+        def timed_init(name, make):
+            start = time.perf_counter()
+            instrument = make()
+            self.init_times[name] = time.perf_counter() - start
+            self.logger.debug(f"Initialized {name} in {self.init_times[name]:.2f} s")
+            return instrument
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(len(devices), 1)) as pool:
+            futures = {name: pool.submit(timed_init, name, make) for name, make in devices.items()}
+
+        instruments = {}
+        errors = []
+        for name, future in futures.items():
+            try:
+                instruments[name] = future.result()
+            except Exception as e:
+                self.logger.error(f"Failed to initialize {name}: {e}")
+                errors.append(e)
+        if errors:
+            for name, instrument in instruments.items():
+                try:
+                    instrument.disconnect()
+                    self.logger.debug(f"Disconnected {name}")
+                except Exception as e:
+                    self.logger.error(f"Failed to disconnect {name}: {e}")
+            self.stop_workers()
+            raise errors[0]
+
+        self.logger.info(f"Initialized hardware in {time.perf_counter() - start:.2f} s")
+        return instruments
+
+    async def wait_for_hardware(self) -> None:
+        """Waits without blocking the event loop until customize has connected all hardware"""
+
+        while not self.hardware_ready.is_set():
+            await asyncio.sleep(0.05)
+
+    @property
+    def analysis(self):
+        """Analysis class, created on first use so pandas is not imported at startup"""
+
+        if self._analysis is None:
+            from parasol.analysis.analysis import Analysis
+            self._analysis = Analysis()
+        return self._analysis
 
     def update_monitoring(self):
         
-        # for all active strings, calculate strings that must be monitored
-        self.monitor_list = []
-        for id in range(len(self.active_strings)):
+        # create dictionary to map monitoring stations to the active string ids on them, one pass over loaded strings
+        self.station_to_id = {}
+        for id in sorted(self.strings):
             if self.active_strings[id]:
-                self.monitor_list.append(self.monitor_stations[id])
-        self.monitor_list = list(set(self.monitor_list))
+                self.station_to_id.setdefault(self.monitor_stations[id], []).append(id)
 
-        # create dictionary to map monitoring stations to string ids for saving
-        self.station_to_id = {}
-
-        # cycle through monitor stations
-        for monitor_station in self.monitor_list:
-            
-            # if string is active and its station is the monitor station were on, then add to list
-            temp = []
-            for id in range(len(self.active_strings)):
-                if self.active_strings[id]:
-                    if self.monitor_stations[id] == monitor_station:
-                        temp.append(id)
-            
-            # create dict item for each monitoring station
-            self.station_to_id[monitor_station] = temp
-        
+        # stations that must be monitored
+        self.monitor_list = list(self.station_to_id)
 
 
     def load_string(
@@ -279,109 +393,201 @@ class Controller:
 
         # Ensure id is not already in use and can be used
         if id in self.strings:
+            if not self.active_strings[id]:
+                raise ValueError(f"String {id} is still unloading!")
             raise ValueError(f"String {id} already loaded!")
         if id not in self.load_channels:
             raise ValueError(f"{id} not valid string id!")
 
-        # Setup JV and MPP timers in main loop if interval exists, else set to None
-        if jv_interval:
-            jv_future = asyncio.run_coroutine_threadsafe(self.jv_timer(id=id), self.loop)
-            jv_future.add_done_callback(future_callback)
-        else:
-            jv_future = None
-        if mpp_interval:
-            mpp_future = asyncio.run_coroutine_threadsafe(self.mpp_timer(id=id), self.loop)
-            mpp_future.add_done_callback(future_callback)
-        else:
-            mpp_future = None
-            
-        # If we are not already monitoring the environment, start the monitor
-        if not any(self.active_strings):
-            self.logger.debug(f"Starting environmental monitoring")
-            self.monitor_future = asyncio.run_coroutine_threadsafe(
-                self.monitor_timer(), self.loop
-            )
-            self.monitor_future.add_done_callback(future_callback)
-            self.logger.info(f"Started environmental monitoring")
+        # Keep the string configuration so the test can be resumed after a restart
+        config = {
+            "startdate": startdate,
+            "name": name,
+            "area": area,
+            "jv_mode": jv_mode,
+            "mpp_mode": mpp_mode,
+            "module_channels": module_channels,
+            "jv_interval": jv_interval,
+            "mpp_interval": mpp_interval,
+            "jv_vmin": jv_vmin,
+            "jv_vmax": jv_vmax,
+            "jv_steps": jv_steps,
+            "temp": temp,
+            "rh": rh,
+            "intensity": intensity,
+        }
 
-        # Make string active, update monitoring list
-        self.active_strings[id] = True
-        self.update_monitoring()
+        # Make directories/file structure
+        savedir, name = self.filestructure.make_module_subdir(name, module_channels, startdate)
+
+        # Point the test at the environmental data of its monitoring station
+        if self.monitor:
+            self.filestructure.write_environment_reference(savedir, self.monitor_stations[id], time.time())
+
+        # # Make backup directories/file structure, added by ZJD 01/29/2024
+        # (
+        #     self.strings[id]["_savedir"],
+        #     self.strings[id]["name"],
+        # ) = self.fstructure_backup.make_module_subdir(name, module_channels, startdate)        
+
+        self.journal.load(id, config, savedir, name)
+        self.start_string(id, config, savedir, name)
+        self.logger.info(f"String {id} loaded")
+
+        return name
+
+    def start_string(self, id: int, config: dict, savedir: str, name: str, state: dict = None) -> None:
+        """Builds the string dictionary, turns on control/load, and starts the timers
+
+        Args:
+            id (int): string number
+            config (dict): arguments of load_string
+            savedir (str): path to test folder
+            name (str): test name
+            state (dict, optional): journal state record to continue from (scan count, MPP history, tracker)
+        """
+
+        module_channels = config["module_channels"]
+        jv_interval = config["jv_interval"]
+        mpp_interval = config["mpp_interval"]
 
         # Setup string dict with important information for running the program
         self.strings[id] = {
             "name": name,
-            "area": area,
-            "start_date": startdate,
+            "area": config["area"],
+            "start_date": config["startdate"],
             "module_channels": module_channels,
             "jv": {
-                "mode": jv_mode,
+                "mode": config["jv_mode"],
                 "interval": jv_interval,
-                "vmin": jv_vmin,
-                "vmax": jv_vmax,
-                "steps": jv_steps,
+                "vmin": config["jv_vmin"],
+                "vmax": config["jv_vmax"],
+                "steps": config["jv_steps"],
                 "scan_count": 0,
-                "_future": jv_future,
+                "_future": None,
                 "v": [None for i in range(len(module_channels))],
                 "j_fwd": [None for i in range(len(module_channels))],
                 "j_rev": [None for i in range(len(module_channels))],
+                "intensity": [None for i in range(len(module_channels))],
             },
             "mpp": {
-                "mode": mpp_mode,
+                "mode": config["mpp_mode"],
                 "interval": mpp_interval,
-                "vmin": jv_vmin,
-                "vmax": jv_vmax,
+                "vmin": config["jv_vmin"],
+                "vmax": config["jv_vmax"],
                 "last_currents": [None]*self.mpp_points,
                 "last_powers": [None]*self.mpp_points,
                 "last_voltages": [None]*self.mpp_points,
-                "_future": mpp_future,
+                "_future": None,
+                "_tracker": None,
                 "vmpp": None,
             },
             "setpoints": {
-                "temp": temp,
-                "rh": rh,
-                "intensity": intensity,
+                "temp": config["temp"],
+                "rh": config["rh"],
+                "intensity": config["intensity"],
+            },
+            "probe": {
+                "count": 0,
+                "_future": None,
             },
             "lock": Lock(),
+            "cancel": Event(), # set on unload to stop a sweep in progress
+            "_savedir": savedir,
         }
+        d = self.strings[id]
 
         # TODO: check if this works
         # if JV scans are off, set first mpp to 0 so that MPP progresses
         if jv_interval is None:
-            self.strings[id]["mpp"]["last_currents"][0] = 0
-            self.strings[id]["mpp"]["last_powers"][0] = 0
-            self.strings[id]["mpp"]["last_voltages"][0] = 0
-            self.strings[id]["mpp"]["vmpp"] = 0
+            d["mpp"]["last_currents"][0] = 0
+            d["mpp"]["last_powers"][0] = 0
+            d["mpp"]["last_voltages"][0] = 0
+            d["mpp"]["vmpp"] = 0
+
+        # Continue scan numbering and MPP tracking from the journal
+        if state is not None:
+            d["jv"]["scan_count"] = state["scan_count"]
+            d["mpp"]["vmpp"] = state["vmpp"]
+            for key in ["last_voltages", "last_currents", "last_powers"]:
+                d["mpp"][key] = (state[key] + [None]*self.mpp_points)[:self.mpp_points]
+            if state["tracker"] is not None:
+                tracker = make_tracker(state["tracker"])
+                tracker.set_state(state["tracker_state"])
+                d["mpp"]["_tracker"] = tracker
+                d["mpp"]["_tracker_seed"] = state["tracker_seed"]
 
-        # Make directories/file structure
-        (
-            self.strings[id]["_savedir"],
-            self.strings[id]["name"],
-        ) = self.filestructure.make_module_subdir(name, module_channels, startdate)
+        # If we are not already monitoring the environment, start the monitor
+        if not any(self.active_strings):
+            self.logger.debug(f"Starting environmental monitoring")
+            self.monitor_future = asyncio.run_coroutine_threadsafe(
+                self.monitor_timer(), self.loop
+            )
+            self.monitor_future.add_done_callback(future_callback)
+            self.logger.info(f"Started environmental monitoring")
+
+        # Make string active, update monitoring list
+        self.active_strings[id] = True
+        self.update_monitoring()
 
-        # # Make backup directories/file structure, added by ZJD 01/29/2024
-        # (
-        #     self.strings[id]["_savedir"],
-        #     self.strings[id]["name"],
-        # ) = self.fstructure_backup.make_module_subdir(name, module_channels, startdate)        
-        self.logger.info(f"String {id} loaded")
-        
         # start environmental control
         if self.env_control:
-            if self.strings[id]["setpoints"]["temp"]:
-                self.environment.set_temperature(id, self.strings[id]["setpoints"]["temp"])
-            if self.strings[id]["setpoints"]["rh"]:
-                self.environment.set_rh(id, self.strings[id]["setpoints"]["rh"])
-            if self.strings[id]["setpoints"]["intensity"]:
-                self.environment.set_intensity(id, self.strings[id]["setpoints"]["intensity"])
-
-        # Turn on the load here, stays on when not being scanned
+            if d["setpoints"]["temp"]:
+                self.environment.set_temperature(id, d["setpoints"]["temp"])
+            if d["setpoints"]["rh"]:
+                self.environment.set_rh(id, d["setpoints"]["rh"])
+            if d["setpoints"]["intensity"]:
+                self.environment.set_intensity(id, d["setpoints"]["intensity"])
+
+        # Turn on the load here (at the last Vmpp when resuming), stays on when not being scanned
         if self.load:
             self.logger.debug(f"Turning on load output for string {id}")
             ch = self.load_channels[id]
-            self.load.load_on(ch, 0.00)
-            self.logger.debug(f"Turned off load output for string {id}")
-        return self.strings[id]["name"]
+            vmp = d["mpp"]["vmpp"] if state is not None else None
+            self.load.load_on(ch, vmp if vmp is not None else 0.00)
+            self.logger.debug(f"Turned on load output for string {id}")
+
+        # Idle is only acted on when a station changes state, so a string loaded at night goes idle here
+        if self.is_idle(id):
+            self.logger.info(f"String {id} loaded while station is idle")
+            self.enter_idle(id)
+
+        # Setup JV and MPP timers in main loop if interval exists, after the string dict so the timers can read it
+        if jv_interval:
+            d["jv"]["_future"] = asyncio.run_coroutine_threadsafe(self.jv_timer(id=id), self.loop)
+            d["jv"]["_future"].add_done_callback(future_callback)
+        if mpp_interval:
+            d["mpp"]["_future"] = asyncio.run_coroutine_threadsafe(self.mpp_timer(id=id), self.loop)
+            d["mpp"]["_future"].add_done_callback(future_callback)
+        if self.probe_interval:
+            d["probe"]["_future"] = asyncio.run_coroutine_threadsafe(self.probe_timer(id=id), self.loop)
+            d["probe"]["_future"].add_done_callback(future_callback)
+
+    def resume(self) -> list:
+        """Resumes the strings that were running when the controller last stopped, using the journal
+
+        Tests continue in the same folders with the same scan numbering, and MPP tracking picks up from the
+        last tracked point.
+
+        Returns:
+            list[int]: ids of resumed strings
+        """
+
+        resumed = []
+        for id, (load, state) in sorted(self.journal.get_strings().items()):
+            if id in self.strings:
+                self.logger.info(f"String {id} already loaded, not resumed")
+                continue
+            if not os.path.exists(load["savedir"]):
+                self.logger.error(f"Test folder {load['savedir']} for string {id} is missing, not resumed")
+                continue
+
+            self.start_string(id, load["config"], load["savedir"], load["name"], state)
+            resumed.append(id)
+            scan_count = 0 if state is None else state["scan_count"]
+            self.logger.info(f"String {id} resumed at scan {scan_count} in {load['savedir']}")
+
+        return resumed
     
     
 
@@ -398,86 +604,153 @@ class Controller:
         check_task_future.add_done_callback(future_callback)
 
 
-    def unload_string(self, id: int) -> None:
-        """Unloads a string of modules
+    def load_probe(self, ids: list = None) -> None:
+        """Queues health probes of strings, by default every loaded string in the rack
+
+        Args:
+            ids (list[int], optional): strings to probe. Defaults to all active strings.
+        """
+
+        if ids is None:
+            ids = [id for id in self.strings if self.active_strings[id]]
+        for id in ids:
+            self.loop.call_soon_threadsafe(self.probe_queue.put_nowait, id)
+
+    def unload_string(self, id: int) -> Future:
+        """Unloads a string of modules, returns right away while the hardware is reset in the background
+
+        The string is made inactive immediately, resetting its load/environmental control and queuing the
+        analysis run on the event loop (see teardown_string).
 
         Args:
             id (int): string number
 
         Raises:
             ValueError: string ID not loaded
+
+        Returns:
+            Future: handle for the teardown, cancellable, result is the analysis future
         """
 
         # Log unload
         self.logger.debug(f"Unloading string {id}")
 
-        # Get string saveloc
+        # Get string
         d = self.strings.get(id, None)
-        if id not in self.strings:
+        if d is None or not self.active_strings[id]:
             raise ValueError(f"String {id} not loaded!")
 
-        # Lock all actions on string
-        with d["lock"]:
-            
-            # Get saveloc
-            saveloc = d["_savedir"]
-
-            # Destroy all future tasks for the string if that task has a future
-            if id not in self.strings:
-                raise ValueError(f"String {id} not loaded!")
-            self.logger.debug(f"Canceling tasks for {id}")
-            if self.strings[id]["jv"]["_future"]:
-                self.strings[id]["jv"]["_future"].cancel()
-            if self.strings[id]["mpp"]["_future"]:
-                self.strings[id]["mpp"]["_future"].cancel()
-            self.logger.debug(f"Canceled tasks for {id}")
-
-            # Remove all tasks in que not already started (can start 1 from each worker)
-            self.logger.debug(f"Removing tasks from que for {id}")
-            while id in self.jv_queue._queue:
-                self.jv_queue._queue.remove(id)
-            while id in self.mpp_queue._queue:
-                self.mpp_queue._queue.remove(id)
-            self.logger.debug(f"Removed tasks from que for {id}")
-
-            # Make string inactive, and update monitoring list
-            self.active_strings[id] = False
-            self.update_monitoring()
-
-            # If we have no active tests, stop monitoring
-            if not any(self.active_strings):
-                self.logger.debug(f"Canceling environmental monitoring")
-                time.sleep(self.monitor_delay)
-                self.monitor_future.cancel()
-                self.logger.info(f"Environmental monitoring canceled")
+        # Destroy all future tasks for the string if that task has a future
+        self.logger.debug(f"Canceling tasks for {id}")
+        if d["jv"]["_future"]:
+            d["jv"]["_future"].cancel()
+        if d["mpp"]["_future"]:
+            d["mpp"]["_future"].cancel()
+        if d["probe"]["_future"]:
+            d["probe"]["_future"].cancel()
+        d["cancel"].set()
+        self.logger.debug(f"Canceled tasks for {id}")
+
+        # Make string inactive (workers skip it from here on), and update monitoring list
+        self.active_strings[id] = False
+        self.journal.unload(id)
+        self.update_monitoring()
+
+        # If we have no active tests, stop monitoring, a reading already underway still finishes
+        if not any(self.active_strings):
+            self.logger.debug(f"Canceling environmental monitoring")
+            self.monitor_future.cancel()
+            self.logger.info(f"Environmental monitoring canceled")
+
+        # Tear down on the event loop
+        future = asyncio.run_coroutine_threadsafe(self.teardown_string(id, d), self.loop)
+        future.add_done_callback(future_callback)
+        return future
+
+    async def teardown_string(self, id: int, d: dict) -> Future:
+        """Resets the hardware of an unloaded string in parallel and queues its analysis
+
+        Args:
+            id (int): string number
+            d (dict): string dictionary
+
+        Returns:
+            Future: analysis of the string in the analysis queue, result is the list of analyzed files
+        """
+
+        loop = asyncio.get_running_loop()
+        saveloc = d["_savedir"]
+
+        # Remove all tasks in que not already started (can start 1 from each worker)
+        self.logger.debug(f"Removing tasks from que for {id}")
+        for queue in [self.jv_queue, self.mpp_queue, self.probe_queue]:
+            for _ in range(queue.qsize()):
+                queued_id = queue.get_nowait()
+                queue.task_done()
+                if queued_id != id:
+                    queue.put_nowait(queued_id)
+        self.logger.debug(f"Removed tasks from que for {id}")
+
+        # Wait for a scan in progress to finish, without blocking the loop. Release the lock if we are cancelled first
+        acquire = loop.run_in_executor(self.teardown_pool, d["lock"].acquire)
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            acquire.add_done_callback(lambda _: d["lock"].release())
+            raise
+
+        try:
+            # Reset each resource independently
+            steps = []
 
             # Turn load output off
             if self.load:
-                self.logger.debug(f"Resetting load for {id}")
-                ch = self.load_channels[id]
-                self.load.load_off(ch)
-                self.logger.debug(f"Load reset for {id}")
-            
+                steps.append(("load", self.load.load_off, self.load_channels[id]))
+
             # Turn off environmental control
             if self.env_control:
-                if self.strings[id]["setpoints"]["temp"]:
-                    self.environment.temperature_off(id)
-                if self.strings[id]["setpoints"]["rh"]:
-                    self.environment.rh_off(id)
-                if self.strings[id]["setpoints"]["intensity"]:
-                    self.environment.intensity_off(id)
-
-            # Analyze the saveloc in a new thread
-            self.logger.debug(f"Saving analysis at : {saveloc}")
-            analyze_thread = Thread(
-                target=self.analysis.analyze_from_savepath, args=(saveloc,)
+                if d["setpoints"]["temp"]:
+                    steps.append(("temperature", self.environment.temperature_off, id))
+                if d["setpoints"]["rh"]:
+                    steps.append(("rh", self.environment.rh_off, id))
+                if d["setpoints"]["intensity"]:
+                    steps.append(("intensity", self.environment.intensity_off, id))
+
+            # Close the time range of environmental data for the test
+            steps.append(("environment reference", self.close_environment_reference, saveloc))
+
+            self.logger.debug(f"Resetting {[name for name, _, _ in steps]} for {id}")
+            results = await asyncio.gather(
+                *[loop.run_in_executor(self.teardown_pool, f, arg) for _, f, arg in steps],
+                return_exceptions=True,
             )
-            analyze_thread.start()
+            for (name, _, _), result in zip(steps, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Failed to reset {name} for {id}: {result}")
+            self.logger.debug(f"Reset string {id}")
+
+        finally:
+            d["lock"].release()
+
+        # Delete the string if it was not reloaded meanwhile
+        if self.strings.get(id) is d:
+            del self.strings[id]
+
+        # Queue analysis of the saveloc in the analysis worker processes
+        self.logger.debug(f"Queuing analysis of {saveloc}")
+        return self.analysis_queue.submit(saveloc)
 
-        # Delete the string
-        del self.strings[id]
+    def close_environment_reference(self, saveloc: str) -> None:
+        """Sets the end time of the environmental data range of a test
 
-        self.logger.info(f"Analysis saved at : {saveloc}")
+        Args:
+            saveloc (str): path to test folder
+        """
+
+        reference = self.filestructure.read_environment_reference(saveloc)
+        if reference is not None:
+            station, start, _ = reference
+            self.filestructure.write_environment_reference(saveloc, station, start, time.time())
 
     def make_mpp_file(self, id: int, backup_mpp = False) -> None:
         """Creates base file for MPP data
@@ -530,6 +803,11 @@ class Controller:
                         "Current (mA)",
                         "Current Density (mA/cm2)",
                         "Power Density (mW/cm2)",
+                        "Temperature Dark (C)",
+                        "Temperature Light (C)",
+                        "RH (%)",
+                        "Intensity (# Suns)",
+                        "Env Age (s)",
                     ]
                 )
 
@@ -539,22 +817,19 @@ class Controller:
         # else:
         #     return backup_fpath
 
-    def make_env_file(self, id, backup_env = False) -> None:
-        """Creates base file for environmental monitoring data
+    def make_env_file(self, monitor_station: int, backup_env = False) -> None:
+        """Creates base file for environmental monitoring data of a monitoring station
         
         Args:
-            id (int): string number
+            monitor_station (int): monitoring station
         """
 
-        # Get dictionary for string
-        d = self.strings.get(id, None)
-
         # Get date/time
         currenttime = datetime.now()
         cdate = currenttime.strftime("x%Y%m%d")
 
-        # Get environment folder and file
-        envfolder = self.filestructure.get_environment_folder(d["start_date"], d["name"])
+        # Get station environment folder and file
+        envfolder = self.filestructure.make_station_environment_folder(monitor_station)
         envfile = self.filestructure.get_environment_file_name(cdate)
         fpath = os.path.join(envfolder, envfile)
 
@@ -589,15 +864,17 @@ class Controller:
 
     # Workers
 
-    async def jv_worker(self, loop: asyncio.AbstractEventLoop) -> None:
-        """Worker for JV sweeps
+    async def jv_worker(self, loop: asyncio.AbstractEventLoop, name: str) -> None:
+        """Worker for JV sweeps, one runs per scanner so strings on different scanners sweep at the same time
 
         Args:
             loop (asyncio.AbstractEventLoop): timer loop to insert JV worker into
+            name (str): worker name
         """
 
-        # We need a sleep here or it never gets added to the queue
-        time.sleep(0.5)
+        # Signal we are listening, take jobs once the hardware is connected
+        self.workers_ready[name].set()
+        await self.wait_for_hardware()
 
         # While the loop is running, add JV scans to queue
         while self.running:
@@ -623,8 +900,9 @@ class Controller:
             loop (asyncio.AbstractEventLoop): timeer loop to insert MPP worker into
         """
 
-        # We need a sleep here or it never gets added to the queue
-        time.sleep(0.5)
+        # Signal we are listening, take jobs once the hardware is connected
+        self.workers_ready["mpp"].set()
+        await self.wait_for_hardware()
 
         # While the loop is running, add mpp scans to queue
         while self.running:
@@ -650,8 +928,9 @@ class Controller:
             loop (asyncio.AbstractEventLoop): timer loop to insert MPP worker into
         """
 
-        # We need a sleep here or it never gets added to the queue
-        time.sleep(0.5)
+        # Signal we are listening, take jobs once the hardware is connected
+        self.workers_ready["check_orientation"].set()
+        await self.wait_for_hardware()
 
         # While the loop is running, add mpp scans to queue
         while self.running:
@@ -669,6 +948,33 @@ class Controller:
             await scan_future
             self.random_queue.task_done()
 
+    async def probe_worker(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Worker for Isc/Voc health probes of strings
+
+        Args:
+            loop (asyncio.AbstractEventLoop): timer loop to insert probe worker into
+        """
+
+        # Signal we are listening, take jobs once the hardware is connected
+        self.workers_ready["probe"].set()
+        await self.wait_for_hardware()
+
+        # While the loop is running, add probes to queue
+        while self.running:
+            id = await self.probe_queue.get()
+            probe_future = asyncio.gather(
+                loop.run_in_executor(
+                    self.threadpool,
+                    self.probe_string,
+                    id,
+                )
+            )
+            probe_future.add_done_callback(future_callback)
+
+            # Probe the string
+            await probe_future
+            self.probe_queue.task_done()
+
     async def monitor_worker(self, loop: asyncio.AbstractEventLoop) -> None:
         """Worker for monitoring the evnironment
 
@@ -676,8 +982,9 @@ class Controller:
             loop (asyncio.AbstractEventLoop): timer loop to insert monitor worker into
         """
 
-        # We need a sleep here or it never gets added to the queue
-        time.sleep(0.5)
+        # Signal we are listening, take jobs once the hardware is connected
+        self.workers_ready["monitor"].set()
+        await self.wait_for_hardware()
 
         # While the loop is running, add monitor scans to queue
         while self.running:
@@ -710,9 +1017,10 @@ class Controller:
             id (int): string number
         """
         # Add worker to que and start when possible
-        await asyncio.sleep(1)
+        await self.wait_for_hardware()
         while self.running:
-            self.jv_queue.put_nowait(id)
+            if not self.is_idle(id):
+                self.jv_queue.put_nowait(id)
             await asyncio.sleep(self.strings[id]["jv"]["interval"])
 
     async def mpp_timer(self, id: int) -> None:
@@ -723,17 +1031,33 @@ class Controller:
         """
 
         # Add worker to que and start when possible
-        await asyncio.sleep(1)
+        await self.wait_for_hardware()
         while self.running:           
             # Add worker to queue, increase mpp worker count
-            self.mpp_queue.put_nowait(id)
+            if not self.is_idle(id):
+                self.mpp_queue.put_nowait(id)
             await asyncio.sleep(self.strings[id]["mpp"]["interval"])
 
+    async def probe_timer(self, id: int) -> None:
+        """Manages timing for the probe worker, the first probe comes an interval after loading so it
+        falls between JV scans
+
+        Args:
+            id (int): string number
+        """
+
+        # Add worker to que and start when possible
+        await self.wait_for_hardware()
+        while self.running:
+            await asyncio.sleep(self.probe_interval)
+            if not self.is_idle(id):
+                self.probe_queue.put_nowait(id)
+
     async def monitor_timer(self) -> None:
         """Manages scanning for monitor worker"""
 
         # Add worker to que and start when possible
-        await asyncio.sleep(1)
+        await self.wait_for_hardware()
         while self.running:
             self.monitor_queue.put_nowait(1)
             await asyncio.sleep(self.monitor_delay)
@@ -755,7 +1079,9 @@ class Controller:
         self.jv_queue = asyncio.Queue()
         self.mpp_queue = asyncio.Queue()
         self.random_queue = asyncio.Queue()
+        self.probe_queue = asyncio.Queue()
         self.monitor_queue = asyncio.Queue()
+        self.loop.call_soon(self.loop_ready.set)
         self.loop.run_forever()
 
     def start(self) -> None:
@@ -764,13 +1090,17 @@ class Controller:
         # Start background event loops
         self.thread = Thread(target=self.__make_background_event_loop)
         self.thread.start()
-        time.sleep(0.5)
+        self.loop_ready.wait()
+
+        # Turn on running before the workers check it
+        self.running = True
 
         # Create Monitor worker for RH, Temp, illumination intensity
         asyncio.run_coroutine_threadsafe(self.monitor_worker(self.loop), self.loop)
 
-        # Create JV worker for scanner
-        asyncio.run_coroutine_threadsafe(self.jv_worker(self.loop), self.loop)
+        # Create JV workers for scanners
+        for name in self.jv_workers:
+            asyncio.run_coroutine_threadsafe(self.jv_worker(self.loop, name), self.loop)
 
         # Create MPP workers for load
         asyncio.run_coroutine_threadsafe(self.mpp_worker(self.loop), self.loop)
@@ -780,39 +1110,115 @@ class Controller:
             self.check_orientation_worker(self.loop), self.loop
         )
 
-        # Turn on running
-        self.running = True
+        # Create health probe worker
+        asyncio.run_coroutine_threadsafe(self.probe_worker(self.loop), self.loop)
 
+        # Wait for every worker to be listening on its queue
+        for event in self.workers_ready.values():
+            event.wait()
 
-    def stop(self) -> None:
-        """Delete workers,  stop queue, and reset hardware"""
+        # Start watching the config file
+        if self.config_watcher:
+            self.config_watcher.start()
 
-        # Unload all strings, reset loads
-        ids = list(self.strings.keys())
-        for id in ids:
-            self.unload_string(id)
+
+    def stop_workers(self) -> None:
+        """Stops the config watcher, event loop and worker pools started by start"""
+
+        # Stop watching the config file
+        if self.config_watcher:
+            self.config_watcher.stop()
 
         # Cancel loops, join threads
         self.loop.call_soon_threadsafe(self.loop.stop)
         self.thread.join()
 
-        # force wait until all active strings have been terminated
-        while any(self.active_strings):
-            time.sleep(1)
+        # Let running analyses finish, the rest stay queued on disk for the next start
+        self.analysis_queue.shutdown(wait=False)
+        self.threadpool.shutdown(wait=False)
+        self.teardown_pool.shutdown(wait=False)
+        self.sweep_pool.shutdown(wait=False)
+        self.save_pool.shutdown(wait=True)
+
+    def stop(self) -> None:
+        """Delete workers,  stop queue, and reset hardware"""
+
+        # Unload all strings, reset loads, wait for the teardowns to finish
+        ids = [id for id in self.strings.keys() if self.active_strings[id]]
+        teardowns = [self.unload_string(id) for id in ids]
+        for teardown in teardowns:
+            try:
+                teardown.result()
+            except Exception as e:
+                self.logger.error(f"Teardown failed: {e}")
+
+        self.stop_workers()
 
         # Close all channels on the relay
         self.logger.debug(f"Turning off relays")
         self.relay.all_off()
         self.logger.debug(f"Turned off relays")
 
-        # Reset scanner
-        self.logger.debug(f"Resetting scanner")
-        self.scanner.output_off()
-        self.logger.debug(f"Scanner reset")
+        # Reset scanners
+        if self.scanner_pool:
+            self.logger.debug(f"Resetting scanners")
+            for scanner in self.scanner_pool.scanners:
+                scanner.output_off()
+            self.logger.debug(f"Scanners reset")
+            for name, stats in self.scanner_stats().items():
+                self.logger.info(f"{name} swept {stats['scans']} modules, occupancy {stats['occupancy']:.1%}")
+        stats = self.switching_stats()
+        if stats["cycles"]:
+            self.logger.info(
+                f"Relay switching saved {stats['saved_frames']} frames ({stats['saved_time']:.1f} s) "
+                f"over {stats['cycles']} JV cycles"
+            )
+
+        # Report how busy the GPIB boards were over the run
+        for board, stats in self.bus_stats().items():
+            self.logger.info(f"{board} occupancy {stats['occupancy']:.1%} over {stats['transactions']} transactions")
 
         # Turn off running
         self.running = False
 
+    def apply_config(self, changes: dict) -> None:
+        """Applies runtime config keys reloaded from the config file
+
+        Args:
+            changes (dict): changes[section][key] = new value
+        """
+
+        controller_changes = changes.get("controller", {})
+        if "monitor_delay" in controller_changes:
+            self.monitor_delay = controller_changes["monitor_delay"]
+        if "measurement_delay" in controller_changes:
+            self.measurement_delay = controller_changes["measurement_delay"]
+            self.settle.max_time = self.measurement_delay
+        if "idle_enter_intensity" in controller_changes:
+            self.idle_enter_intensity = controller_changes["idle_enter_intensity"]
+        if "idle_exit_intensity" in controller_changes:
+            self.idle_exit_intensity = controller_changes["idle_exit_intensity"]
+
+        # Update the MPPT step of the characterization and of trackers already running on strings
+        characterization_changes = changes.get("characterization", {})
+        if "mppt_voltage_step" in characterization_changes:
+            self.characterization.et_voltage_step = characterization_changes["mppt_voltage_step"]
+        tracker_keys = {
+            "mppt_voltage_step": "voltage_step",
+            "mppt_min_voltage_step": "min_voltage_step",
+            "mppt_max_voltage_step": "max_voltage_step",
+            "mppt_max_substeps": "max_substeps",
+        }
+        for d in list(self.strings.values()):
+            tracker = d["mpp"].get("_tracker")
+            if tracker is None:
+                continue
+            for key, attribute in tracker_keys.items():
+                if key in characterization_changes:
+                    setattr(tracker, attribute, characterization_changes[key])
+
+        self.logger.info(f"Applied config changes {changes}")
+
     # Worker Functions
 
     def scan_jv(self, id: int) -> None:
@@ -840,103 +1246,39 @@ class Controller:
                 self.logger.info(f"Last JV scan of string {id} aborted")
                 return
 
+            # If string went idle while queued return
+            if self.is_idle(id):
+                self.logger.debug(f"JV scan of string {id} skipped, string idle")
+                return
+
             # Turn off load output
+            ch = self.load_channels[id]
             if self.load:
                 self.logger.debug(f"Turning off load output for string {id}")
-                ch = self.load_channels[id]
                 self.load.load_off(ch)
                 self.logger.debug(f"Turned off load output for string {id}")
 
-            # Cycle through each device on the string
-            for index, module in enumerate(d["module_channels"]):
-
-                # Get date/time and make filepath
-                date_str = datetime.now().strftime("%Y-%m-%d")
-                time_str = datetime.now().strftime("%H:%M:%S")
-                epoch_str = time.time()
-
-                # Save in base filepath: stringname: JV_modulechannel: stringname_stringid_modulechannel_JV_scannumber
-                jvfolder = self.filestructure.get_jv_folder(
-                    d["start_date"], d["name"], module
-                )
-
-                jvfile = self.filestructure.get_jv_file_name(
-                    d["start_date"], d["name"], id, module, d["jv"]["scan_count"]
-                )
-
-
-                # # Save in backup base filepath: stringname: JV_modulechannel: stringname_stringid_modulechannel_JV_scannumber, added by ZJD 01/29/2024
-                # backup_jvfolder = self.fstructure_backup.get_jv_folder(
-                #     d["start_date"], d["name"], module
-                # )
-
-                fpath = os.path.join(jvfolder, jvfile) 
-                # backup_fpath = os.path.join(backup_jvfolder, jvfile) 
-
-                
+            # Spread the modules over the scanners, groups sweep in parallel
+            assignments = self.scanner_pool.assign(d["module_channels"])
+            if len(assignments) == 1:
+                [(group, modules)] = assignments.items()
+                completed = self.scan_modules(id, d, group, modules)
+            else:
+                futures = [
+                    self.sweep_pool.submit(self.scan_modules, id, d, group, modules)
+                    for group, modules in assignments.items()
+                ]
+                completed = all([future.result() for future in futures])
+            if not completed:
+                self.logger.info(f"JV scan of string {id} stopped, string unloaded")
+                return
 
-                # Open relay, scan device foward + reverse, turn off relay
-                self.logger.debug(f"Opening relay for string {id}")
-                self.relay.on(module)
-                self.logger.debug(f"Opened relay for string {id}")
-                self.logger.debug(f"Scanning string {id}")
-
-                # Wait set time and scan
-                time.sleep(self.measurement_delay)
-                v, fwd_vm, fwd_i, rev_vm, rev_i = self.characterization.scan_jv(d, self.scanner)
-
-
-                self.logger.debug(f"Scanned string {id}")
-                self.logger.debug(f"Closing relay for string {id}")
-                self.relay.all_off()
-                self.logger.debug(f"Closed relay for string {id}")
-
-                # Convert to mA, calculate parameters
-                fwd_i *= -1000
-                rev_i *= -1000
-                fwd_j = fwd_i / d["area"]
-                fwd_p = fwd_vm * fwd_j
-                rev_j = rev_i / d["area"]
-                rev_p = rev_vm * rev_j
-
-                # Open file, write header/column names then fill
-                with open(fpath, "w", newline="") as f:
-                    writer = csv.writer(f, delimiter=",")
-                    writer.writerow(["Date:", date_str])
-                    writer.writerow(["Time:", time_str])
-                    writer.writerow(["epoch_time:", epoch_str])
-                    writer.writerow(["String ID:", id])
-                    writer.writerow(["Module ID:", module])
-                    writer.writerow(["Area (cm2):", d["area"]])
-                    writer.writerow(
-                        [
-                            "Applied Voltage (V)",
-                            "FWD Voltage (V)",
-                            "FWD Current (mA)",
-                            "FWD Current Density (mA/cm2)",
-                            "FWD Power Density (mW/cm2)",
-                            "REV Voltage (V)",
-                            "REV Current (mA)",
-                            "REV Current Density (mA/cm2)",
-                            "REV Power Density (mW/cm2)",
-                        ]
-                    )
-                    for line in zip(v, fwd_vm, fwd_i, fwd_j, fwd_p, rev_vm, rev_i, rev_j, rev_p):
-                        writer.writerow(line)
-                # shutil.copy(fpath, backup_fpath)# ZJD 01/29/2024
-                self.logger.debug(f"Writing JV file for {id} at {fpath}")
-                # self.logger.debug(f"Backup'ed JV file for {id} at {backup_fpath}")# ZJD 01/29/2024
-
-                # Save any useful raw data to the string dictionary
-                d["jv"]["v"][index] = v
-                d["jv"]["j_fwd"][index] = fwd_j
-                d["jv"]["j_rev"][index] = rev_j
-
-            # Increase JV scan count
+            # Increase JV scan count, checkpoint with the Vmpp of the new scans
             d["jv"]["scan_count"] += 1
+            self.journal.checkpoint(id, d)
             
-            # After last scan/relay shut, wait 0.5s before turning on mpp
-            time.sleep(self.measurement_delay)
+            # After last scan/relay shut, wait for string to settle on the load before turning on mpp
+            self.wait_for_relay_settle("jv_relay_off", ch)
 
             # Turn on load output at old vmpp if we have one
             if self.load:
@@ -949,6 +1291,468 @@ class Controller:
             self.logger.info(f"Scanned {id}")
 
 
+    def scan_modules(self, id: int, d: dict, group, modules: list) -> bool:
+        """Sweeps modules of a string on one scanner group, holding the group for the whole pass
+
+        Sweeps are pipelined: a module's data is converted and written in the save pool while the relays
+        move to the next module and it is swept, so the scanner is the only thing the cycle waits on.
+
+        Args:
+            id (int): string number
+            d (dict): string dictionary
+            group (ScannerGroup): scanner and relay boards the modules are wired to
+            modules (list[tuple]): (index in module_channels, module channel) to sweep
+
+        Returns:
+            bool: False if the string was unloaded mid sweep
+        """
+
+        indexes = dict((module, index) for index, module in modules)
+        switching = 0.0
+        saves = []
+
+        # Hold the group for the whole pass so strings sharing it do not interleave module by module
+        with group.lock:
+
+            # Order the visits so relays shared by consecutive modules stay latched
+            plan = self.relay.plan_scan([module for _, module in modules], group.boards)
+
+            # The relays of a module stay on until the next module moves them, after the last module they are
+            # closed before the group is released
+            for visit, module in enumerate(plan["order"]):
+                start = time.perf_counter()
+                sweep, elapsed = self.scan_module(id, d, group, module)
+                switching += elapsed
+                if sweep is not None and visit == len(plan["order"]) - 1:
+                    self.logger.debug(f"Closing relays of string {id} on {group.name}")
+                    switch_start = time.perf_counter()
+                    self.relay.all_off(group.boards)
+                    switching += time.perf_counter() - switch_start
+                    self.logger.debug(f"Closed relays of string {id} on {group.name}")
+                self.scanner_pool.record(group, time.perf_counter() - start)
+                if sweep is None:
+                    return False
+
+                # Convert and write while the next module is switched and swept
+                saves.append(self.save_pool.submit(self.save_jv, id, d, indexes[module], module, *sweep))
+
+        # Wait for the last files, the string data must be complete before the checkpoint and Vmpp
+        start = time.perf_counter()
+        for save in saves:
+            save.result()
+        self.logger.debug(f"Waited {time.perf_counter() - start:.3f} s for JV files of string {id} on {group.name}")
+
+        self.record_switching(id, group, plan, switching)
+        return True
+
+    def record_switching(self, id: int, group, plan: dict, elapsed: float) -> None:
+        """Logs and totals the relay frames and time the ordered visits of one JV cycle saved
+
+        Args:
+            id (int): string number
+            group (ScannerGroup): scanner group the modules were swept on
+            plan (dict): visit plan (see Relay.plan_scan)
+            elapsed (float): time spent switching relays (s)
+        """
+
+        # Time saved is estimated from the time per frame of this cycle
+        saved_frames = plan["naive_frames"] - plan["frames"]
+        saved_time = saved_frames * elapsed / plan["frames"] if plan["frames"] else 0.0
+        self.logger.debug(
+            f"Switched string {id} on {group.name} in {plan['frames']} frames ({elapsed:.3f} s), "
+            f"saved {saved_frames} frames ({saved_time:.3f} s) and "
+            f"{plan['naive_transitions'] - plan['transitions']} relay transitions"
+        )
+
+        with self.switching_lock:
+            stats = self.switching
+            stats["cycles"] += 1
+            stats["frames"] += plan["frames"]
+            stats["saved_frames"] += saved_frames
+            stats["transitions"] += plan["transitions"]
+            stats["saved_transitions"] += plan["naive_transitions"] - plan["transitions"]
+            stats["time"] += elapsed
+            stats["saved_time"] += saved_time
+
+    def scan_module(self, id: int, d: dict, group, module: int) -> tuple:
+        """Switches to one module and sweeps it, call with the group lock held
+
+        The module's relays are left on, relays it shares with the next module stay latched.
+
+        Args:
+            id (int): string number
+            d (dict): string dictionary
+            group (ScannerGroup): scanner and relay boards the module is wired to
+            module (int): module channel
+
+        Returns:
+            tuple: (date, time, epoch time, v, fwd_vm, fwd_i, rev_vm, rev_i) for save_jv, None if the string
+                was unloaded mid sweep
+            float: time spent switching relays (s)
+        """
+
+        # Get date/time of the sweep
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        time_str = datetime.now().strftime("%H:%M:%S")
+        epoch_str = time.time()
+
+        # Move the relays from the last module to this one on the group's boards only, scan device foward + reverse
+        self.logger.debug(f"Opening relay for module {module} of string {id} on {group.name}")
+        switch_start = time.perf_counter()
+        self.relay.move_to(module, group.boards)
+        switching = time.perf_counter() - switch_start
+        self.logger.debug(f"Opened relay for module {module} of string {id}")
+        self.logger.debug(f"Scanning module {module} of string {id}")
+
+        # Wait for relays to settle and scan
+        self.wait_for_relay_settle("jv_relay_on", scanner=group.scanner)
+        try:
+            v, fwd_vm, fwd_i, rev_vm, rev_i = self.characterization.scan_jv(d, group.scanner, d["cancel"])
+        except asyncio.CancelledError:
+            # Unloaded mid sweep, the scanner output is already off
+            self.relay.all_off(group.boards)
+            return None, switching
+
+        self.logger.debug(f"Scanned module {module} of string {id}")
+        return (date_str, time_str, epoch_str, v, fwd_vm, fwd_i, rev_vm, rev_i), switching
+
+    def save_jv(
+        self,
+        id: int,
+        d: dict,
+        index: int,
+        module: int,
+        date_str: str,
+        time_str: str,
+        epoch_str: float,
+        v: np.ndarray,
+        fwd_vm: np.ndarray,
+        fwd_i: np.ndarray,
+        rev_vm: np.ndarray,
+        rev_i: np.ndarray,
+    ) -> None:
+        """Converts one module sweep, writes its JV file and saves the data to the string dictionary
+
+        Args:
+            id (int): string number
+            d (dict): string dictionary
+            index (int): index of the module in module_channels
+            module (int): module channel
+            date_str (str): date of the sweep
+            time_str (str): time of the sweep
+            epoch_str (float): epoch time of the sweep
+            v (np.ndarray): voltage (V) values
+            fwd_vm (np.ndarray): FWD voltage measured (V) values
+            fwd_i (np.ndarray): FWD current (A) values
+            rev_vm (np.ndarray): REV voltage measured (V) values
+            rev_i (np.ndarray): REV current (A) values
+        """
+
+        # Save in base filepath: stringname: JV_modulechannel: stringname_stringid_modulechannel_JV_scannumber
+        jvfolder = self.filestructure.get_jv_folder(
+            d["start_date"], d["name"], module
+        )
+
+        jvfile = self.filestructure.get_jv_file_name(
+            d["start_date"], d["name"], id, module, d["jv"]["scan_count"]
+        )
+
+
+        # # Save in backup base filepath: stringname: JV_modulechannel: stringname_stringid_modulechannel_JV_scannumber, added by ZJD 01/29/2024
+        # backup_jvfolder = self.fstructure_backup.get_jv_folder(
+        #     d["start_date"], d["name"], module
+        # )
+
+        fpath = os.path.join(jvfolder, jvfile) 
+        # backup_fpath = os.path.join(backup_jvfolder, jvfile) 
+
+        # Convert to mA, calculate parameters
+        fwd_i *= -1000
+        rev_i *= -1000
+        fwd_j = fwd_i / d["area"]
+        fwd_p = fwd_vm * fwd_j
+        rev_j = rev_i / d["area"]
+        rev_p = rev_vm * rev_j
+
+        # Attach the latest environmental reading of the station to the sweep
+        env = self.get_env_snapshot(id, epoch_str)
+
+        # Open file, write header/column names then fill
+        with open(fpath, "w", newline="") as f:
+            writer = csv.writer(f, delimiter=",")
+            writer.writerow(["Date:", date_str])
+            writer.writerow(["Time:", time_str])
+            writer.writerow(["epoch_time:", epoch_str])
+            writer.writerow(["String ID:", id])
+            writer.writerow(["Module ID:", module])
+            writer.writerow(["Area (cm2):", d["area"]])
+            if env is not None:
+                writer.writerow(["Temperature Dark (C):", env[0]])
+                writer.writerow(["Temperature Light (C):", env[1]])
+                writer.writerow(["RH (%):", env[2]])
+                writer.writerow(["Intensity (# Suns):", env[3]])
+                writer.writerow(["Env Age (s):", env[4]])
+            writer.writerow(
+                [
+                    "Applied Voltage (V)",
+                    "FWD Voltage (V)",
+                    "FWD Current (mA)",
+                    "FWD Current Density (mA/cm2)",
+                    "FWD Power Density (mW/cm2)",
+                    "REV Voltage (V)",
+                    "REV Current (mA)",
+                    "REV Current Density (mA/cm2)",
+                    "REV Power Density (mW/cm2)",
+                ]
+            )
+            for line in zip(v, fwd_vm, fwd_i, fwd_j, fwd_p, rev_vm, rev_i, rev_j, rev_p):
+                writer.writerow(line)
+        # shutil.copy(fpath, backup_fpath)# ZJD 01/29/2024
+        self.logger.debug(f"Writing JV file for {id} at {fpath}")
+        # self.logger.debug(f"Backup'ed JV file for {id} at {backup_fpath}")# ZJD 01/29/2024
+
+        # Save any useful raw data to the string dictionary
+        d["jv"]["v"][index] = v
+        d["jv"]["j_fwd"][index] = fwd_j
+        d["jv"]["j_rev"][index] = rev_j
+        d["jv"]["intensity"][index] = env[3] if env is not None else None
+
+    def probe_string(self, id: int) -> dict:
+        """Spot checks Isc and Voc of every module of a string against its last JV scan
+
+        Much faster than a JV scan: modules are visited in the relay planned order, and each gets one scanner
+        output cycle that waits for Voc to settle and measures Voc and Isc. When a module deviates more than
+        probe_tolerance and probe_sweep is on, a full JV scan of the string is queued right away.
+
+        Args:
+            id (int): string number
+
+        Returns:
+            dict: results[module] = {string, time, voc (V), isc (A), jsc (mA/cm2), voc_ref, jsc_ref, deviation,
+                deviates, settle (s)}, empty if the string was not probed
+        """
+
+        self.logger.debug(f"Probing {id}")
+
+        # Get dictionary information
+        d = self.strings.get(id, None)
+
+        # If dictionary is not found, return
+        if d is None:
+            self.logger.info(f"Empty dictionary passed to probe")
+            return {}
+
+        # Lock the string
+        with d['lock']:
+
+            # If string is not active or went idle while queued return
+            if self.active_strings[id] == False:
+                self.logger.info(f"Last probe of string {id} aborted")
+                return {}
+            if self.is_idle(id):
+                self.logger.debug(f"Probe of string {id} skipped, string idle")
+                return {}
+
+            # Turn off load output
+            ch = self.load_channels[id]
+            if self.load:
+                self.load.load_off(ch)
+
+            # Spread the modules over the scanners, groups probe in parallel
+            assignments = self.scanner_pool.assign(d["module_channels"])
+            if len(assignments) == 1:
+                [(group, modules)] = assignments.items()
+                readings = [self.probe_modules(id, d, group, modules)]
+            else:
+                futures = [
+                    self.sweep_pool.submit(self.probe_modules, id, d, group, modules)
+                    for group, modules in assignments.items()
+                ]
+                readings = [future.result() for future in futures]
+            if None in readings:
+                self.logger.info(f"Probe of string {id} stopped, string unloaded")
+                return {}
+
+            # Put the string back on the load at the last Vmpp
+            self.wait_for_relay_settle("jv_relay_off", ch)
+            if self.load:
+                vmp = self.characterization.calc_last_vmp(d)
+                if vmp is not None:
+                    self.load.load_on(ch, vmp)
+
+            # Compare against the last JV scan of each module
+            results = {}
+            for group_readings in readings:
+                for index, module, t, voc, isc, settle in group_readings:
+                    results[module] = self.check_probe(id, d, index, t, voc, isc, settle)
+            d["probe"]["count"] += 1
+            self.probe_results.update(results)
+            self.save_probe(id, d, results)
+
+        # Sweep the string right away if a module changed
+        deviating = [module for module, result in results.items() if result["deviates"]]
+        if deviating:
+            self.logger.info(f"Modules {deviating} of string {id} deviate from their last JV scan")
+            if self.probe_sweep:
+                self.loop.call_soon_threadsafe(self.jv_queue.put_nowait, id)
+
+        self.logger.info(f"Probed {id}")
+        return results
+
+    def probe_modules(self, id: int, d: dict, group, modules: list) -> list:
+        """Spot checks modules of a string on one scanner group, holding the group for the whole pass
+
+        Args:
+            id (int): string number
+            d (dict): string dictionary
+            group (ScannerGroup): scanner and relay boards the modules are wired to
+            modules (list[tuple]): (index in module_channels, module channel) to probe
+
+        Returns:
+            list[tuple]: (index, module, epoch time, voc (V), isc (A), settle (s)) per module, None if the string
+                was unloaded mid probe
+        """
+
+        indexes = dict((module, index) for index, module in modules)
+        detector = self.settle if self.settle_detect else None
+
+        readings = []
+
+        # Hold the group for the whole pass so strings sharing it do not interleave module by module
+        with group.lock:
+
+            # Order the visits so relays shared by consecutive modules stay latched
+            plan = self.relay.plan_scan([module for _, module in modules], group.boards)
+
+            for visit, module in enumerate(plan["order"]):
+                if d["cancel"].is_set():
+                    self.relay.all_off(group.boards)
+                    return None
+                start = time.perf_counter()
+                self.relay.move_to(module, group.boards)
+                if detector is None:
+                    time.sleep(self.measurement_delay)
+                voc, isc, settle = group.scanner.spot_check(detector, "probe_relay_on")
+                readings.append((indexes[module], module, time.time(), voc, isc, settle))
+                if visit == len(plan["order"]) - 1:
+                    self.relay.all_off(group.boards)
+                self.scanner_pool.record(group, time.perf_counter() - start)
+                self.logger.debug(f"Probed module {module} of string {id}: Voc {voc:.3f} V, Isc {isc:.5f} A")
+
+        return readings
+
+    def check_probe(self, id: int, d: dict, index: int, t: float, voc: float, isc: float, settle: float) -> dict:
+        """Compares one module's probe with Jsc and Voc of its last JV scan
+
+        Args:
+            id (int): string number
+            d (dict): string dictionary
+            index (int): index of the module in module_channels
+            t (float): epoch time of the probe
+            voc (float): open circuit voltage (V)
+            isc (float): short circuit current (A)
+            settle (float): time waited for the settle (s)
+
+        Returns:
+            dict: {string, time, voc, isc, jsc, voc_ref, jsc_ref, intensity_ratio, deviation, deviates, settle},
+                jsc_ref is scaled to the intensity of the probe, deviation is the largest relative change, None
+                without a JV scan to compare to
+        """
+
+        # Same sign and units as the JV files
+        jsc = -isc * 1000 / d["area"]
+
+        jsc_ref, voc_ref = None, None
+        if d["jv"]["j_fwd"][index] is not None:
+            jsc_ref, voc_ref = self.characterization.calc_jsc_voc(d["jv"]["v"][index], d["jv"]["j_fwd"][index])
+
+        # Jsc scales with irradiance, so correct the JV Jsc by the intensity change since the JV scan
+        # Readings <= 0 (no photodiode, dark) leave it uncorrected
+        intensity_ratio = None
+        env = self.get_env_snapshot(id, t)
+        intensity_ref = d["jv"]["intensity"][index]
+        if env is not None and intensity_ref is not None and env[3] > 0 and intensity_ref > 0:
+            intensity_ratio = env[3] / intensity_ref
+            if jsc_ref is not None:
+                jsc_ref *= intensity_ratio
+
+        changes = [
+            abs(value - ref) / abs(ref)
+            for value, ref in [(jsc, jsc_ref), (voc, voc_ref)]
+            if ref
+        ]
+        deviation = max(changes) if changes else None
+
+        return {
+            "string": id,
+            "time": t,
+            "voc": voc,
+            "isc": isc,
+            "jsc": jsc,
+            "voc_ref": voc_ref,
+            "jsc_ref": jsc_ref,
+            "intensity_ratio": intensity_ratio,
+            "deviation": deviation,
+            "deviates": deviation is not None and deviation > self.probe_tolerance,
+            "settle": settle,
+        }
+
+    def save_probe(self, id: int, d: dict, results: dict) -> None:
+        """Appends the probe of a string to its probe file in the test folder
+
+        Args:
+            id (int): string number
+            d (dict): string dictionary
+            results (dict): results[module] (see check_probe)
+        """
+
+        fpath = os.path.join(
+            self.filestructure.get_test_folder(d["start_date"], d["name"]),
+            self.filestructure.get_probe_file_name(d["start_date"], d["name"], id),
+        )
+
+        # If it doesnt exist, make it with the header
+        new = not os.path.exists(fpath)
+        with open(fpath, "a", newline="") as f:
+            writer = csv.writer(f, delimiter=",")
+            if new:
+                writer.writerow(["String ID:", id])
+                writer.writerow(["Area (cm2):", d["area"]])
+                writer.writerow(
+                    [
+                        "Time (epoch)",
+                        "Module ID",
+                        "JV Scan",
+                        "Voc (V)",
+                        "Isc (mA)",
+                        "Jsc (mA/cm2)",
+                        "JV Voc (V)",
+                        "JV Jsc (mA/cm2)",
+                        "Intensity Ratio",
+                        "Deviation",
+                        "Settle (s)",
+                    ]
+                )
+            for module, r in sorted(results.items()):
+                writer.writerow(
+                    [
+                        r["time"],
+                        module,
+                        d["jv"]["scan_count"],
+                        r["voc"],
+                        -r["isc"] * 1000,
+                        r["jsc"],
+                        "" if r["voc_ref"] is None else r["voc_ref"],
+                        "" if r["jsc_ref"] is None else r["jsc_ref"],
+                        "" if r["intensity_ratio"] is None else r["intensity_ratio"],
+                        "" if r["deviation"] is None else r["deviation"],
+                        r["settle"],
+                    ]
+                )
+
+        self.logger.debug(f"Writing probe file for {id} at {fpath}")
+
+
     def track_mpp(self, id: int) -> None:
         """Conduct an MPP scan using Chroma class
 
@@ -972,6 +1776,11 @@ class Controller:
                 self.logger.info(f"Last MPP scan of string {id} aborted")
                 return
 
+            # If string went idle while queued return
+            if self.is_idle(id):
+                self.logger.debug(f"MPP scan of string {id} skipped, string idle")
+                return
+
             # Get last MPP, will be none if JV not filled
             last_vmpp = self.characterization.calc_last_vmp(d)
 
@@ -984,20 +1793,8 @@ class Controller:
             
             # Scan mpp (pass last MPP to it)
             self.logger.debug(f"Tracking MPP for {id}")
-            t, v, vm, i = self.characterization.track_mpp(d, self.load, ch, last_vmpp)
-            self.logger.debug(f"Tracked MPP for {id}")
-
-            # Convert current to mA and calc j and p
-            i *= 1000
-            j = i / (d["area"] * len(d["module_channels"]))
-            p = v * j
-            pm = vm*j
-
-            # shift index to index + 1 and add new reading at 0
-            d["mpp"]["last_voltages"] = [(v+vm)/2] + d["mpp"]["last_voltages"][:-1]
-            d["mpp"]["last_currents"] = [i] + d["mpp"]["last_currents"][:-1]
-            d["mpp"]["last_powers"]= [(p+pm)/2] + d["mpp"]["last_powers"][:-1]
-            d["mpp"]["vmpp"] = v            
+            points = self.characterization.track_mpp(d, self.load, ch, last_vmpp)
+            self.logger.debug(f"Tracked MPP for {id} ({len(points)} points)")
 
             # Get MPP file path, if it doesnt exist, create it, iterate for each JV curve taken
             fpath = self.make_mpp_file(id)
@@ -1013,15 +1810,38 @@ class Controller:
             #     self.savedMPP = fpath
             #     self.backup_savedMPP = backup_fpath
 
-            # Open file, append values to columns
+            # Write every point the tracker took, the load is left at the last one
             with open(fpath, "a", newline="") as f:
                 writer = csv.writer(f, delimiter=",")
-                writer.writerow([t, v, vm, i, j, pm])
+
+                for t, v, vm, i in points:
+
+                    # Convert current to mA and calc j and p
+                    i *= 1000
+                    j = i / (d["area"] * len(d["module_channels"]))
+                    p = v * j
+                    pm = vm*j
+
+                    # shift index to index + 1 and add new reading at 0
+                    d["mpp"]["last_voltages"] = [(v+vm)/2] + d["mpp"]["last_voltages"][:-1]
+                    d["mpp"]["last_currents"] = [i] + d["mpp"]["last_currents"][:-1]
+                    d["mpp"]["last_powers"]= [(p+pm)/2] + d["mpp"]["last_powers"][:-1]
+                    d["mpp"]["vmpp"] = v
+
+                    # Attach the latest environmental reading of the station to the point, blank if not monitoring
+                    env = self.get_env_snapshot(id, t)
+                    if env is None:
+                        env = ["", "", "", "", ""]
+
+                    writer.writerow([t, v, vm, i, j, pm] + list(env))
             # shutil.copy(fpath, backup_fpath) # ZJD 01/29/2024
 
             self.logger.debug(f"Writing MPP file for {id} at {fpath}")
             # self.logger.debug(f"Backup'ed MPP file for {id} at {backup_fpath}")# ZJD 01/29/2024
 
+            # Checkpoint tracking state
+            self.journal.checkpoint(id, d)
+
             self.logger.info(f"Tracked {id}")
             
 
@@ -1035,6 +1855,9 @@ class Controller:
         
         self.logger.debug(f"Monitoring environment")
 
+        # Refresh all stations at once so the loop below reads from cache
+        if self.monitor:
+            self.environment.poll()
         
         #cycle through monitor stations active
         for monitor_station in self.monitor_list:
@@ -1046,32 +1869,203 @@ class Controller:
             if self.monitor:
                 t, temp_dark, temp_light, rh, intensity = self.environment.monitor_environment(monitor_station)
 
-            # Save monitor information for each channel
-            for id in self.station_to_id[monitor_station]:
-                # Make env file if needed and append to file
-                fpath = self.make_env_file(id)
-                # backup_fpath = self.make_env_file(id, backup_env=True) #ZJD 01/29/2024
-
-                # # If savedEnv and backup_savedEnv are not initialized: ZJD 01/29/2024
-                # if self.savedEnv is None:
-                #     self.savedEnv = fpath
-                # if self.backup_savedEnv is None:
-                #     self.backup_savedEnv = backup_fpath
+                # Keep the latest reading so JV/MPP records can carry it
+                self.env_readings[monitor_station] = (t, temp_dark, temp_light, rh, intensity)
+
+            # Update idle status of the station using the intensity reading
+            self.update_idle(monitor_station, intensity)
+
+            # Save monitor information once for the station, tests on the station reference it
+            fpath = self.make_env_file(monitor_station)
+            # backup_fpath = self.make_env_file(id, backup_env=True) #ZJD 01/29/2024
+
+            # # If savedEnv and backup_savedEnv are not initialized: ZJD 01/29/2024
+            # if self.savedEnv is None:
+            #     self.savedEnv = fpath
+            # if self.backup_savedEnv is None:
+            #     self.backup_savedEnv = backup_fpath
+            
+            # # Check if the file has been updated, ZJD 01/29/2024
+            # if self.savedEnv != fpath:
+            #     shutil(self.savedEnv, self.backup_savedEnv)
+            #     self.savedEnv = fpath
+            #     self.backup_fpath = backup_fpath
                 
-                # # Check if the file has been updated, ZJD 01/29/2024
-                # if self.savedEnv != fpath:
-                #     shutil(self.savedEnv, self.backup_savedEnv)
-                #     self.savedEnv = fpath
-                #     self.backup_fpath = backup_fpath
-                    
-                with open(fpath, "a", newline="") as f:
-                    writer = csv.writer(f, delimiter=",")
-                    writer.writerow([t, temp_dark, temp_light, rh, intensity])
-                self.logger.debug(f"Writing Monitoring file at {fpath}")
+            with open(fpath, "a", newline="") as f:
+                writer = csv.writer(f, delimiter=",")
+                writer.writerow([t, temp_dark, temp_light, rh, intensity])
+            self.logger.debug(f"Writing Monitoring file at {fpath}")
 
 
         self.logger.debug(f"Monitored environment")
 
+    def get_env_snapshot(self, id: int, t: float = None) -> tuple:
+        """Gets the latest environmental reading of the monitoring station of a string
+
+        Args:
+            id (int): string number
+            t (float, optional): epoch time of the measurement the reading is attached to, now if None
+
+        Returns:
+            tuple: (temp_dark (C), temp_light (C), rh (%), intensity (# suns), age (s)), None if there is no reading
+        """
+
+        if not self.monitor:
+            return None
+
+        reading = self.env_readings.get(self.monitor_stations.get(id))
+        if reading is None:
+            return None
+
+        if t is None:
+            t = time.time()
+        t_env, temp_dark, temp_light, rh, intensity = reading
+        return temp_dark, temp_light, rh, intensity, t - t_env
+
+    # Idle (night) mode
+
+    def is_idle(self, id: int) -> bool:
+        """Checks if the monitoring station for a string is idle (too dark to measure)
+
+        Args:
+            id (int): string number
+
+        Returns:
+            bool: True if string is idle
+        """
+
+        if not self.idle_mode:
+            return False
+        return self.idle_stations.get(self.monitor_stations.get(id), False)
+
+    def update_idle(self, monitor_station: int, intensity: float) -> None:
+        """Updates idle status of a monitoring station using hysteresis on the intensity
+
+        Stations enter idle when intensity drops below idle_enter_intensity and leave idle when it rises
+        above idle_exit_intensity. Readings < 0 (no photodiode) never change the status.
+
+        Args:
+            monitor_station (int): monitoring station
+            intensity (float): light intensity (# suns)
+        """
+
+        if not self.idle_mode or intensity is None or intensity < 0:
+            return
+
+        was_idle = self.idle_stations.get(monitor_station, False)
+        if not was_idle and intensity < self.idle_enter_intensity:
+            self.idle_stations[monitor_station] = True
+        elif was_idle and intensity > self.idle_exit_intensity:
+            self.idle_stations[monitor_station] = False
+        else:
+            return
+
+        # Act on the strings of the station in the threadpool so monitoring is not held up by string locks
+        for id in self.station_to_id.get(monitor_station, []):
+            if self.idle_stations[monitor_station]:
+                self.logger.info(f"String {id} entering idle, intensity {intensity:.3f} suns")
+                self.threadpool.submit(self.enter_idle, id)
+            else:
+                self.logger.info(f"String {id} leaving idle, intensity {intensity:.3f} suns")
+                self.threadpool.submit(self.exit_idle, id)
+
+    def enter_idle(self, id: int) -> None:
+        """Puts a string in low duty mode: load output off, no JV/MPP until light returns
+
+        Args:
+            id (int): string number
+        """
+
+        d = self.strings.get(id, None)
+        if d is None:
+            return
+
+        with d["lock"]:
+            if self.load and self.active_strings[id]:
+                ch = self.load_channels[id]
+                self.load.load_off(ch)
+                self.logger.debug(f"Turned off load output for idle string {id}")
+
+    def exit_idle(self, id: int) -> None:
+        """Takes a string out of low duty mode: load back on at last Vmpp and queue a JV scan
+
+        Args:
+            id (int): string number
+        """
+
+        d = self.strings.get(id, None)
+        if d is None:
+            return
+
+        with d["lock"]:
+            if not self.active_strings[id]:
+                return
+            if self.load:
+                vmp = self.characterization.calc_last_vmp(d)
+                if vmp is not None:
+                    ch = self.load_channels[id]
+                    self.load.load_on(ch, vmp)
+                    self.logger.debug(f"Turned on load output for string {id}")
+
+        # Take a fresh JV right away so MPP tracking starts from current conditions
+        if d["jv"]["interval"]:
+            self.loop.call_soon_threadsafe(self.jv_queue.put_nowait, id)
+
+    def wait_for_relay_settle(self, name: str, channel: int = None, scanner = None) -> float:
+        """Waits for a relay transition to settle, falls back on measurement_delay
+
+        Polls voc on the scanner, or on the load channel if one is given, until consecutive readings agree.
+
+        Args:
+            name (str): label for the transition in the settle history
+            channel (int, optional): load channel to poll instead of the scanner. Defaults to None.
+            scanner (Yokogawa, optional): scanner the relays switched onto. Defaults to the first scanner.
+
+        Returns:
+            float: time waited (s)
+        """
+
+        if self.settle_detect and channel is not None and self.load:
+            elapsed = self.load.wait_for_settle(channel, self.settle, name)
+        elif self.settle_detect and channel is None and (scanner or self.scanner):
+            elapsed = (scanner or self.scanner).wait_for_settle(self.settle, name)
+        else:
+            time.sleep(self.measurement_delay)
+            elapsed = self.measurement_delay
+
+        self.logger.debug(f"Settled {name} in {elapsed:.3f} s")
+        return elapsed
+
+    def bus_stats(self) -> dict:
+        """Reports GPIB bus occupancy, shows whether the bus or the instruments limit throughput
+
+        Returns:
+            dict: stats[board] = {elapsed, busy, occupancy, transactions, waiting, instruments} (see BusArbiter.stats)
+        """
+
+        return gpib.bus_stats()
+
+    def scanner_stats(self) -> dict:
+        """Reports how the JV sweeps were spread over the scanners
+
+        Returns:
+            dict: stats[name] = {scans, busy (s), occupancy} (see ScannerPool.stats)
+        """
+
+        if not self.scanner_pool:
+            return {}
+        return self.scanner_pool.stats()
+
+    def switching_stats(self) -> dict:
+        """Reports relay frames, transitions and time the ordered module visits saved over all JV cycles
+
+        Returns:
+            dict: cycles, frames, saved_frames, transitions, saved_transitions, time (s), saved_time (s)
+        """
+
+        with self.switching_lock:
+            return dict(self.switching)
+
     def check_orientation(self, modules: list) -> None:
         """Checks the orientation of the list of modules by verifying that Jsc > 0 using the scanner
 
@@ -1086,28 +2080,30 @@ class Controller:
         correct_orientation = [None] * len(modules)
         check_module_string = ""
 
-        # Cycle through each module, calc orientation
+        # Cycle through each module, calc orientation. Hold the module's scanner group so JV sweeps are not disturbed
         for idx, module in enumerate(modules):
+            group = self.scanner_pool.group_of(module)
+            with group.lock:
 
-            # Turn on relay
-            self.logger.debug(f"Turning on relay for module {module}")
-            self.relay.on(module)
-            self.logger.debug(f"Turned on relay for module {module}")
+                # Turn on relay
+                self.logger.debug(f"Turning on relay for module {module}")
+                self.relay.only(module, group.boards)
+                self.logger.debug(f"Turned on relay for module {module}")
 
-            # Wait for everything to settle
-            time.sleep(self.measurement_delay)
+                # Wait for everything to settle
+                self.wait_for_relay_settle("orientation_relay_on", scanner=group.scanner)
 
-            # Pass scanner to characterization module, returns true if Isc < 0, false otherwise
-            self.logger.debug(f"Checking orientation for module {module}")
-            correct_orientation[idx] = self.characterization.check_orientation(
-                self.scanner
-            )
-            self.logger.debug(f"Checked orientation for module {module}")
+                # Pass scanner to characterization module, returns true if Isc < 0, false otherwise
+                self.logger.debug(f"Checking orientation for module {module}")
+                correct_orientation[idx] = self.characterization.check_orientation(
+                    group.scanner
+                )
+                self.logger.debug(f"Checked orientation for module {module}")
 
-            # Turn off relay
-            self.logger.debug(f"Turning off all relays")
-            self.relay.all_off()
-            self.logger.debug(f"Turned off all relays")
+                # Turn off relay
+                self.logger.debug(f"Turning off relays on {group.name}")
+                self.relay.all_off(group.boards)
+                self.logger.debug(f"Turned off relays on {group.name}")
 
         
         # Return true if orientation is correct, False otherwise
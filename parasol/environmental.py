@@ -1,14 +1,17 @@
 import time
 
+from parasol.hardware.aio import InstrumentIO
+
 from parasol.hardware.labjack import LabJack
 
-from parasol.hardware.omega import Omega
+from parasol.hardware.omega import Omega, OmegaPoller
 # from parasol.hardware.light import Light()
 # from parasol.hardware.ambient import Ambient()
 
 from parasol.configuration.configuration import Configuration
 config = Configuration()
 constants = config.get_config()['environmental']
+hotplate_constants = config.get_config()['hotplate']
 
 class Environmental():
     """Class for controllinig environmental stressors"""
@@ -33,6 +36,10 @@ class Environmental():
         self.rh_m = {}
         self.int_c = {}
         self.int_m = {}
+        self.omega_poller = None
+
+        # LabJack/hotplate reads for the async API
+        self.io = InstrumentIO("environmental")
 
         # setup monitoring for monitor stations = 0 --> note here we have no env control and just use labjack
         # if 0 in monitor_stations:
@@ -53,9 +60,34 @@ class Environmental():
                 # self.rh_m = {}
                 # self.int_c = {}
                 # self.int_m = {}
+
+            # poll hotplates together, ports in parallel
+            if len(self.temp_m)>0:
+                self.omega_poller = OmegaPoller(self.temp_m, hotplate_constants["poll_max_age"])
                 
 
     
+    def disconnect(self) -> None:
+        """Disconnects every monitoring and control instrument"""
+
+        if self.omega_poller is not None:
+            self.omega_poller.executor.shutdown(wait=True)
+
+        # One instrument can serve several roles (labjack, hotplates), disconnect each once
+        instruments = {}
+        for stations in [self.temp_m, self.temp_c, self.rh_m, self.rh_c, self.int_m, self.int_c]:
+            for instrument in stations.values():
+                instruments[id(instrument)] = instrument
+        for instrument in instruments.values():
+            instrument.disconnect()
+
+    def poll(self) -> None:
+        """Refreshes cached readings of every monitoring station at once (only used for hotplates)"""
+
+        if self.omega_poller is not None:
+            self.omega_poller.poll()
+
+
     def monitor_environment(self,  monitor_station: int) -> float:
         """Monitors the environment
         Args:
@@ -71,7 +103,10 @@ class Environmental():
         t, temp_dark, temp_light, rh, intensity = [time.time(), -1, -1, -1, -1]
         
         # handles labjack
-        if self.mode == 'outdoor':
+        if self.mode == 'outdoor' and self.temp_m.get(monitor_station) is not None and self.temp_m[monitor_station] is self.rh_m.get(monitor_station) is self.int_m.get(monitor_station):
+            # same labjack handles everything, read all channels together
+            temp_dark, temp_light, rh, intensity = self.temp_m[monitor_station].monitor_env()
+        elif self.mode == 'outdoor':
             if len(self.temp_m)>0:
                 temp_dark = self.temp_m[monitor_station].get_temp_rtd(1)
                 temp_light = self.temp_m[monitor_station].get_temp_rtd(2)
@@ -88,7 +123,9 @@ class Environmental():
         
         # handles standard 
         if self.mode == 'indoor':
-            if len(self.temp_m)>0:
+            if self.omega_poller is not None:
+                temp_light = self.omega_poller.get_temperature(monitor_station)
+            elif len(self.temp_m)>0:
                 temp_light = self.temp_m[monitor_station].get_temperature()
             if len(self.rh_m)>0:
                 rh = self.rh_m[monitor_station].get_rh(temp_light)
@@ -98,6 +135,27 @@ class Environmental():
         return t,  temp_dark, temp_light, rh, intensity
 
 
+    async def poll_async(self) -> None:
+        """Refreshes cached readings of every monitoring station at once, from a coroutine"""
+
+        await self.io.call(self.poll)
+
+
+    async def monitor_environment_async(self, monitor_station: int) -> float:
+        """Monitors the environment from a coroutine, the reads run on the environmental I/O thread
+
+        Args:
+            monitor_station (int): index of station to utilize (allows multiple monitoring stations)
+        Returns:
+            float: time (epoch)
+            float: temperature (C)
+            float: humidity (%)
+            flaot: intensity (# suns)
+        """
+
+        return await self.io.call(self.monitor_environment, monitor_station)
+
+
     def set_temperature(self, id: int, setpoint: float):
         """ Set temperature
 
@@ -1,4 +1,5 @@
 import os
+import csv
 import datetime
 
 from parasol.configuration.configuration import Configuration
@@ -18,7 +19,6 @@ class FileStructure:
         else:
             self.root_folder = constants["root_dir"]
         self.analysis_folder = constants["analysis_dir"]
-        self.NUM_MODULES = constants["num_modules"]
 
         if not os.path.exists(self.root_folder):
             os.mkdir(self.root_folder)
@@ -29,6 +29,9 @@ class FileStructure:
         )
         self.log_folder = os.path.join(self.root_folder, "Logs")
 
+        # Environmental data is kept once per monitoring station, tests reference a station and time range
+        self.environment_folder = os.path.join(self.root_folder, "Environment")
+
         # # Added by ZJD 01/29/2024
         # # Create paths to backup folder, which stores backup cell chara. and logging folder
         # if not os.path.exists(self.backup_folder):
@@ -77,6 +80,33 @@ class FileStructure:
 
         return self.log_folder
 
+    def get_analysis_queue_path(self) -> str:
+        """Returns the path to the file holding queued post test analysis jobs
+
+        Returns:
+            str: path to analysis job file
+        """
+
+        return os.path.join(self.root_folder, "Analysis_Jobs.json")
+
+    def get_journal_path(self) -> str:
+        """Returns the path to the controller state journal
+
+        Returns:
+            str: path to journal file
+        """
+
+        return os.path.join(self.root_folder, "Controller_Journal.jsonl")
+
+    def get_recording_path(self) -> str:
+        """Returns the default path to the instrument I/O recording
+
+        Returns:
+            str: path to recording file
+        """
+
+        return os.path.join(self.root_folder, "Instrument_Recording.jsonl")
+
     def get_analysis_dir(self) -> str:
         """Returns the path to the analysis directory
 
@@ -191,6 +221,96 @@ class FileStructure:
         return env_folder
 
 
+    # Station level environment store
+    # ROOT:Environment:Station_#:xYYYYMMDD_epoch.csv
+
+    def get_station_environment_folder(self, station: int) -> str:
+        """Returns the path to the environment folder of a monitoring station
+
+        Args:
+            station (int): monitoring station
+
+        Returns:
+            str: path to station environment folder
+        """
+
+        return os.path.join(self.environment_folder, f"Station_{station}")
+
+    def make_station_environment_folder(self, station: int) -> str:
+        """Makes the environment folder of a monitoring station if needed
+
+        Args:
+            station (int): monitoring station
+
+        Returns:
+            str: path to station environment folder
+        """
+
+        station_folder = self.get_station_environment_folder(station)
+        os.makedirs(station_folder, exist_ok=True)
+
+        return station_folder
+
+    def get_environment_reference_path(self, stringpath: str) -> str:
+        """Returns the path to the file referencing a test's monitoring station
+
+        Args:
+            stringpath (str): path to test folder
+
+        Returns:
+            str: path to reference file
+        """
+
+        return os.path.join(stringpath, "Environment_Station.csv")
+
+    def write_environment_reference(self, stringpath: str, station: int, start: float, end: float = None) -> None:
+        """Writes which monitoring station and time range hold a test's environmental data
+
+        Args:
+            stringpath (str): path to test folder
+            station (int): monitoring station
+            start (float): start of test (epoch)
+            end (float, optional): end of test (epoch), None while running. Defaults to None.
+        """
+
+        with open(self.get_environment_reference_path(stringpath), "w", newline="") as f:
+            writer = csv.writer(f, delimiter=",")
+            writer.writerow(["Station", "Start (Epoch)", "End (Epoch)"])
+            writer.writerow([station, start, "" if end is None else end])
+
+    def read_environment_reference(self, stringpath: str):
+        """Reads which monitoring station and time range hold a test's environmental data
+
+        Args:
+            stringpath (str): path to test folder
+
+        Returns:
+            tuple: (station, start (epoch), end (epoch) or None), None if the test has no reference (older tests)
+        """
+
+        fpath = self.get_environment_reference_path(stringpath)
+        if not os.path.exists(fpath):
+            return None
+
+        with open(fpath) as f:
+            csvreader = csv.reader(f, delimiter=",")
+            next(csvreader)  # skip header
+            station, start, end = next(csvreader)
+
+        return int(station), float(start), (float(end) if end else None)
+
+    def environment_file_epoch(self, file_path: str) -> int:
+        """Returns the epoch time of the start of the day from an environment file name
+
+        Args:
+            file_path (str): path to environment file xYYYYMMDD_epochtime.csv
+
+        Returns:
+            int: epoch time (s)
+        """
+
+        return int(os.path.basename(file_path).split("_")[-1].split(".")[0])
+
     # Make MPP, JV, and Analyed folders given inputs
 
     def make_module_subdir(
@@ -280,6 +400,23 @@ class FileStructure:
 
         return mpp_file_name
 
+    def get_probe_file_name(self, startdate: str, name: str, id: int) -> str:
+        """Returns the health probe file name, the file sits in the test folder
+
+        Args:
+            startdate (str): startdate in xYYYYMMDD format
+            name (str): name of test
+            id (int): test id
+
+        Returns:
+            str: name of probe file
+        """
+
+        # Build filename
+        probe_file_name = f"{startdate}_{name}_{id}_all_Probe.csv"
+
+        return probe_file_name
+
     def get_analyzed_file_name(
         self, startdate: str, name: str, id: int, module_channel: int
     ) -> str:
@@ -454,12 +591,13 @@ class FileStructure:
         # Get path to MPP folder
         mpp_folder = [os.path.join(stringpath, "MPP")]
 
-        # Get path to JV folders
-        jv_folders = []
-        for i in range(1, self.NUM_MODULES + 1):
-            jv_folder = os.path.join(stringpath, "JV_" + str(int(i)))
-            if os.path.exists(jv_folder):
-                jv_folders.append(jv_folder)
+        # Get path to JV folders in module order, one directory listing whatever the size of the rack
+        modules = []
+        if os.path.exists(stringpath):
+            for entry in os.listdir(stringpath):
+                if entry.startswith("JV_") and entry[3:].isdigit():
+                    modules.append(int(entry[3:]))
+        jv_folders = [os.path.join(stringpath, "JV_" + str(module)) for module in sorted(modules)]
 
         # Get path to analyzed folder
         analyzed_folder = [os.path.join(stringpath, "Analyzed")]
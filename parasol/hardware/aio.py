@@ -0,0 +1,102 @@
+import asyncio
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock
+
+
+class InstrumentIO:
+    """Runs the bus transactions of one instrument on its own thread so coroutines can await them
+
+    pyvisa, u6 and pyserial only offer blocking calls, so each instrument gets a single I/O thread. Calls on
+    it run in submission order, which keeps an instrument's commands in sequence, while everything between
+    transactions (settle waits, source delays, looping over sweep points) runs on the event loop.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initializes the I/O thread
+
+        Args:
+            name (str): instrument name, used to name the thread
+        """
+
+        self.name = name
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}_io")
+
+    async def call(self, f, *args):
+        """Runs a blocking instrument call on the I/O thread
+
+        Args:
+            f (function): blocking call, e.g. a pyvisa write/query
+            *args: arguments for f
+
+        Returns:
+            the return of f
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(self.executor, f, *args)
+
+    def shutdown(self) -> None:
+        """Stops the I/O thread once queued calls finish"""
+
+        self.executor.shutdown(wait=False)
+
+
+@asynccontextmanager
+async def hold(lock: Lock, poll_interval: float = 0.005):
+    """Holds an instrument lock from a coroutine, shared with the blocking API of the instrument
+
+    The lock is polled rather than waited on so the event loop is never blocked and a cancelled coroutine
+    stops waiting straight away.
+
+    Args:
+        lock (Lock): instrument lock
+        poll_interval (float): time between attempts (s)
+    """
+
+    while not lock.acquire(blocking=False):
+        await asyncio.sleep(poll_interval)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+async def _run_until_cancelled(coro, cancel: Event, poll_interval: float):
+    """Runs a coroutine, cancelling it once cancel is set"""
+
+    task = asyncio.ensure_future(coro)
+    while not task.done():
+        if cancel.is_set():
+            task.cancel()
+            break
+        await asyncio.wait({task}, timeout=poll_interval)
+    return await task
+
+
+def run_sync(coro, cancel: Event = None, poll_interval: float = 0.01):
+    """Runs a driver coroutine to completion from blocking code, used by the blocking driver API
+
+    Args:
+        coro (coroutine): coroutine to run
+        cancel (Event, optional): set from another thread to cancel the coroutine at its next await
+        poll_interval (float): time between checks of cancel (s)
+
+    Raises:
+        RuntimeError: called from a thread with a running event loop, await the async variant instead
+        asyncio.CancelledError: cancel was set before the coroutine finished
+
+    Returns:
+        the return of the coroutine
+    """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError("Blocking instrument call made on the event loop, await the async variant instead")
+
+    if cancel is None:
+        return asyncio.run(coro)
+    return asyncio.run(_run_until_cancelled(coro, cancel, poll_interval))
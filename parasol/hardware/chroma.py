@@ -1,8 +1,12 @@
-import pyvisa
 import time
+import asyncio
 import numpy as np
 from threading import Lock
 
+from parasol.hardware.settle import SettleDetector
+from parasol.hardware.aio import InstrumentIO, hold, run_sync
+from parasol.hardware.gpib import open_resource
+
 from parasol.configuration.configuration import Configuration
 config = Configuration()
 constants = config.get_config()['chroma']
@@ -22,6 +26,15 @@ class Chroma:
         self.sense_delay = constants["sense_delay"]
         self.ca_avg_num = constants["avg_num"] # number of measurments to average
 
+        # settle detection, source_delay is used as the maximum wait
+        self.settle_detect = constants["settle_detect"]
+        self.settle = SettleDetector(
+            tolerance=constants["settle_tolerance"],
+            samples=constants["settle_samples"],
+            max_time=self.source_delay,
+            min_time=constants["settle_min_time"],
+        )
+
         self.v_mode = constants["voltage_range"] # voltage range to use
         self.ca_i_max = constants["current_range"] # current range to use
         
@@ -32,6 +45,9 @@ class Chroma:
         # create lock        
         self.lock = Lock()
 
+        # bus transactions run on their own thread for the async API
+        self.io = InstrumentIO("chroma")
+
         # connect 
         self.connect()
 
@@ -40,22 +56,24 @@ class Chroma:
 
         # set all channels to source voltage and measure current when initialized (1st is dummy index)
         self._sourcing_current = [False, False, False, False, False, False, False, False, False]
-        self.srcV_measI(1)
-        self.srcV_measI(2)
-        self.srcV_measI(3)
-        self.srcV_measI(4)
-        self.srcV_measI(7)
-        self.srcV_measI(8)
+        with self.ca.batch():
+            self.srcV_measI(1)
+            self.srcV_measI(2)
+            self.srcV_measI(3)
+            self.srcV_measI(4)
+            self.srcV_measI(7)
+            self.srcV_measI(8)
         
 
     def connect(self) -> None:
         """Connects to the chroma"""
         
-        rm = pyvisa.ResourceManager()
-        self.ca = rm.open_resource(self.ca_address)
+        # share the GPIB bus with the other instruments on the board
+        self.ca = open_resource(self.ca_address, "chroma", constants["bus_priority"])
         self.ca.timeout = constants["time_out"]
-        self.ca.write('*CLS')
-        self.ca.write('*RST')
+        with self.ca.batch():
+            self.ca.write('*CLS')
+            self.ca.write('*RST')
 
 
     def disconnect(self):
@@ -115,9 +133,10 @@ class Chroma:
             channel (int or string): chroma channel to alter
         """
         
-        self.channel_check(channel) # set channel
-        self.ca.write("CHAN:ACT ON") # turn on measurement
-        self.ca.write("LOAD ON") # turn on load
+        with self.ca.batch():
+            self.channel_check(channel) # set channel
+            self.ca.write("CHAN:ACT ON") # turn on measurement
+            self.ca.write("LOAD ON") # turn on load
 
 
     def load_on(self, channel: int, voltage: float) -> None:
@@ -150,9 +169,29 @@ class Chroma:
             channel (int or string): chroma channel to alter
         """
         
-        self.channel_check(channel) # sets channel
-        self.ca.write("CHAN:ACT OFF") # turn off measurement
-        self.ca.write("LOAD OFF") # turn off load
+        with self.ca.batch():
+            self.channel_check(channel) # sets channel
+            self.ca.write("CHAN:ACT OFF") # turn off measurement
+            self.ca.write("LOAD OFF") # turn off load
+
+
+    def _apply_voltage(self, channel: int, voltage: float) -> None:
+        """Sets voltage without waiting for the system to settle
+
+        Args:
+            channel (int or string): chroma channel to alter
+            voltage (float): desired voltage (V)
+        """
+
+        with self.ca.batch():
+            # If we are in wrong mode, switch
+            if self._sourcing_current[channel] == True:
+                self.srcV_measI(channel)
+                self.output_on(channel)
+                self._sourcing_current[channel] = False
+            
+            self.channel_check(channel) # set channel
+            self.ca.write("VOLT:L1 " + str(voltage)) # set load voltage
 
 
     def set_voltage(self, channel: int, voltage: float) -> None:
@@ -163,15 +202,26 @@ class Chroma:
             voltage (float): desired voltage (V)
         """
         
-        # If we are in wrong mode, switch
-        if self._sourcing_current[channel] == True:
-            self.srcV_measI(channel)
-            self.output_on(channel)
-            self._sourcing_current[channel] = False
-        
-        self.channel_check(channel) # set channel
-        self.ca.write("VOLT:L1 " + str(voltage)) # set load voltage
-        time.sleep(self.source_delay) # delay for system to settle
+        self._apply_voltage(channel, voltage)
+        if self.settle_detect:
+            self.settle.wait(lambda: self.measure_voltage(channel), "set_voltage", voltage) # wait for voltage to reach setpoint
+        else:
+            time.sleep(self.source_delay) # delay for system to settle
+
+
+    async def set_voltage_async(self, channel: int, voltage: float) -> None:
+        """Sets voltage from a coroutine, the settle wait sleeps on the event loop instead of a thread
+
+        Args:
+            channel (int or string): chroma channel to alter
+            voltage (float): desired voltage (V)
+        """
+
+        await self.io.call(self._apply_voltage, channel, voltage)
+        if self.settle_detect:
+            await self.settle.wait_async(lambda: self.io.call(self.measure_voltage, channel), "set_voltage", voltage)
+        else:
+            await asyncio.sleep(self.source_delay) # delay for system to settle
 
 
     def set_current(self, channel: int, current: float) -> None:
@@ -190,7 +240,10 @@ class Chroma:
 
         self.channel_check(channel) # set channel
         self.ca.write("CURR:STATIC:L1 " + str(current)) # set load current
-        time.sleep(self.source_delay) # delay for system to settle
+        if self.settle_detect:
+            self.settle.wait(lambda: self.measure_voltage(channel), "set_current") # wait for voltage to settle
+        else:
+            time.sleep(self.source_delay) # delay for system to settle
 
 
     def measure_voltage(self, channel: int) -> float:
@@ -204,12 +257,29 @@ class Chroma:
         """
 
         
-        self.channel_check(channel) # set channel
-        volt = float(self.ca.query("MEAS:VOLT?")) # measure voltage
+        with self.ca.batch():
+            self.channel_check(channel) # set channel
+            volt = float(self.ca.query("MEAS:VOLT?")) # measure voltage
 
         return volt
 
 
+    def wait_for_settle(self, channel: int, detector: SettleDetector, name: str = "relay") -> float:
+        """Waits for the voltage at a channel to settle, e.g. after relays reconnect a string
+
+        Args:
+            channel (int or string): chroma channel to read
+            detector (SettleDetector): detector with tolerance and maximum wait
+            name (str): label for the transition in the detector history
+
+        Returns:
+            float: time waited (s)
+        """
+
+        with self.lock:
+            return detector.wait(lambda: self.measure_voltage(channel), name)
+
+
     def measure_current(self, channel: int) -> float:
         """Measures the current reading at the given channel
 
@@ -220,12 +290,65 @@ class Chroma:
             float: current (A) reading
         """
 
-        self.channel_check(channel) # sets channel
-        curr = float(self.ca.query("MEAS:CURR?")) # measure current
+        with self.ca.batch():
+            self.channel_check(channel) # sets channel
+            curr = float(self.ca.query("MEAS:CURR?")) # measure current
 
         return curr
 
 
+    def _measure_V_I(self, channel: int) -> float:
+        """Measures current and voltage
+
+        Args:
+            channel (int or string): chroma channel to alter
+
+        Returns:
+            float: voltage (V) reading
+            float: current (A) reading
+        """
+
+        with self.ca.batch():
+            curr = self.measure_current(channel)
+            volt = self.measure_voltage(channel)
+        return volt, curr
+
+
+    def _set_V_measure_I(self, channel: int, voltage: float) -> float:
+        """Sets voltage and measures current without locking, one I/O thread call per sweep point
+
+        Args:
+            channel (int or string): chroma channel to alter
+            voltage (float): voltage (V)
+
+        Returns:
+            float: voltage (V) reading
+            float: current (A) reading
+        """
+
+        self.set_voltage(channel, voltage)
+        return self._measure_V_I(channel)
+
+
+    async def set_V_measure_I_async(self, channel: int, voltage: float, lock = True) -> float:
+        """Sets voltage and measures current from a coroutine
+
+        Args:
+            channel (int or string): chroma channel to alter
+            voltage (float): voltage (V)
+            lock (boolean = True): option to lock instrument while command is running
+
+        Returns:
+            float: voltage (V) reading
+            float: current (A) reading
+        """
+
+        if lock:
+            async with hold(self.lock):
+                return await self.io.call(self._set_V_measure_I, channel, voltage)
+        return await self.io.call(self._set_V_measure_I, channel, voltage)
+
+
     def set_V_measure_I(self, channel: int, voltage: float, lock = True) -> float:
         """Sets voltage and measures current
 
@@ -239,18 +362,11 @@ class Chroma:
             float: current (A) reading 
         """
 
+        # Single readings block directly, run_sync would build an event loop per reading
         if lock:
             with self.lock:
-                # set voltage, measure current and voltage
-                self.set_voltage(channel, voltage)
-                curr = self.measure_current(channel)
-                volt = self.measure_voltage(channel)
-        else:
-            # set voltage, measure current and voltage
-            self.set_voltage(channel, voltage)
-            curr = self.measure_current(channel)
-            volt = self.measure_voltage(channel)        
-        return volt, curr
+                return self._set_V_measure_I(channel, voltage)
+        return self._set_V_measure_I(channel, voltage)
     
 
     def set_I_measure_V(self, channel: int, current: float, lock = True) -> float:
@@ -312,8 +428,20 @@ class Chroma:
         return i
 
 
-    def iv_sweep(self, channel: int, vstart: float, vend: float, steps: int) -> np.ndarray:
-        """Runs a single IV sweep and returns the data
+
+
+    async def _output_off_async(self, channel: int) -> None:
+        """Turns output off from a coroutine, still runs if the coroutine is cancelled meanwhile
+
+        Args:
+            channel (int or string): chroma channel to alter
+        """
+
+        await asyncio.shield(self.io.call(self.output_off, channel))
+
+
+    async def iv_sweep_async(self, channel: int, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs a single IV sweep and returns the data, cancelling stops the sweep after the current point
 
         Args:
             channel (int): channel
@@ -326,7 +454,7 @@ class Chroma:
             np.ndarray: current (A) array
         """
 
-        with self.lock:
+        async with hold(self.lock):
 
             # make empty numpy arrays for data
             v = np.linspace(vstart, vend, steps)
@@ -334,10 +462,12 @@ class Chroma:
             i = np.zeros(v.shape)
 
             # turn on output, set voltage, measure current, turn off output
-            self.output_on(channel)
-            for idx, v_point in enumerate(v):
-                vm[idx],i[idx] = self.set_V_measure_I(channel,v_point, lock = False)
-            self.output_off(channel)
+            await self.io.call(self.output_on, channel)
+            try:
+                for idx, v_point in enumerate(v):
+                    vm[idx],i[idx] = await self.io.call(self._set_V_measure_I, channel, v_point)
+            finally:
+                await self._output_off_async(channel)
 
             # flip reverse scan order so that it aligns with voltage
             if abs(vstart) > abs(vend):
@@ -345,10 +475,28 @@ class Chroma:
                 vm = vm[::-1]
 
         return v, vm, i
+
+
+    def iv_sweep(self, channel: int, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs a single IV sweep and returns the data
+
+        Args:
+            channel (int): channel
+            vstart (float): FWD sweep start voltage (V)
+            vend (float): FWD sweep end voltage (V)
+            steps (float): number of voltage steps in the sweep
+
+        Returns:
+            np.ndarray: voltage (V) array
+            np.ndarray: current (A) array
+        """
+
+        return run_sync(self.iv_sweep_async(channel, vstart, vend, steps))
     
 
-    def iv_sweep_quadrant_fwd_rev(self, channel: int, vstart: float, vend: float, steps: int) -> np.ndarray:
-        """Runs FWD and then REV IV sweep in the power producing quadrant and returns the data
+    async def iv_sweep_quadrant_fwd_rev_async(self, channel: int, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs FWD and then REV IV sweep in the power producing quadrant and returns the data, cancelling
+        stops the sweep after the current point
 
         Args:
             chanel(int): chroma channel number
@@ -364,7 +512,7 @@ class Chroma:
             np.ndarray: REV current measured (A) array
         """
 
-        with self.lock:
+        async with hold(self.lock):
 
             # make empty numpy arrays for data
             v = np.linspace(vstart, vend, steps)
@@ -376,37 +524,60 @@ class Chroma:
             i_rev[:] = np.nan
 
             # turn on output
-            self.output_on(channel)
-
-            # find point before 1st point in quadrant
-            index = 0
-            for v_point in v:
-                if v_point >= 0:
-                    break
-                index += 1
-            index -= 1
-            start_index = index
+            await self.io.call(self.output_on, channel)
+
+            try:
+                # find point before 1st point in quadrant
+                index = 0
+                for v_point in v:
+                    if v_point >= 0:
+                        break
+                    index += 1
+                index -= 1
+                start_index = index
 
-            # cycle from there until we get out of the quadrant
-            while index <= len(v):
-                vm_fwd[index], i_fwd[index] = self.set_V_measure_I(channel,v[index], lock = False)
-                if i_fwd[index] > 0:
-                    break
-                index += 1
+                # cycle from there until we get out of the quadrant
+                while index <= len(v):
+                    vm_fwd[index], i_fwd[index] = await self.io.call(self._set_V_measure_I, channel, v[index])
+                    if i_fwd[index] > 0:
+                        break
+                    index += 1
 
-            # scan backwards until we get back to starting point
-            while index >= start_index:
-                vm_rev[index], i_rev[index] = self.set_V_measure_I(channel,v[index], lock = False)
-                index -= 1
+                # scan backwards until we get back to starting point
+                while index >= start_index:
+                    vm_rev[index], i_rev[index] = await self.io.call(self._set_V_measure_I, channel, v[index])
+                    index -= 1
 
-            # turn output off
-            self.output_off(channel)
+            finally:
+                # turn output off
+                await self._output_off_async(channel)
 
         return v, vm_fwd, i_fwd, vm_rev, i_rev
 
 
-    def iv_sweep_quadrant_rev_fwd(self, channel: int, vstart: float, vend: float, steps: int) -> np.ndarray:
-        """Runs REV and then FWD IV sweep in the power producing quadrant and returns the data
+    def iv_sweep_quadrant_fwd_rev(self, channel: int, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs FWD and then REV IV sweep in the power producing quadrant and returns the data
+
+        Args:
+            chanel(int): chroma channel number
+            vstart (float): FWD sweep start voltage (V)
+            vend (float): FWD sweep end voltage (V)
+            steps (float): number of voltage steps in the sweep
+
+        Returns:
+            np.ndarray: voltage applied (V) array
+            np.ndarray: FWD voltage measured (V) array
+            np.ndarray: FWD current measured (A) array
+            np.ndarray: REV voltage measured (V) array
+            np.ndarray: REV current measured (A) array
+        """
+
+        return run_sync(self.iv_sweep_quadrant_fwd_rev_async(channel, vstart, vend, steps))
+
+
+    async def iv_sweep_quadrant_rev_fwd_async(self, channel: int, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs REV and then FWD IV sweep in the power producing quadrant and returns the data, cancelling
+        stops the sweep after the current point
 
         Args:
             channel (int): chroma channel number
@@ -422,7 +593,7 @@ class Chroma:
             np.ndarray: REV current measured (A) array
         """
 
-        with self.lock:
+        async with hold(self.lock):
 
             # make empty numpy arrays for data
             v = np.linspace(vstart, vend, steps)
@@ -434,7 +605,7 @@ class Chroma:
             i_rev[:] = np.nan
 
             # find point after voc
-            voc = self.voc(0)
+            voc = await self.io.call(self.voc, 0)
             end_index = np.where(np.diff(np.signbit(v - voc)))[0]
             if (v[end_index] - voc) < 0:
                 end_index += 1
@@ -449,21 +620,43 @@ class Chroma:
             start_index = index
 
             # turn on output
-            self.output_on(channel)
+            await self.io.call(self.output_on, channel)
 
-            # scan rev until we get back to starting point
-            index = end_index
-            while index >= start_index:
-                vm_rev[index], i_rev[index] = self.set_V_measure_I(channel,v[index], lock = False)
-                index -= 1
+            try:
+                # scan rev until we get back to starting point
+                index = end_index
+                while index >= start_index:
+                    vm_rev[index], i_rev[index] = await self.io.call(self._set_V_measure_I, channel, v[index])
+                    index -= 1
 
-            # cycle from there until we get out of the quadrant
-            index = start_index
-            while index <= end_index:
-                vm_fwd[index], i_fwd[index] = self.set_V_measure_I(channel,v[index], lock = False)
-                index += 1
+                # cycle from there until we get out of the quadrant
+                index = start_index
+                while index <= end_index:
+                    vm_fwd[index], i_fwd[index] = await self.io.call(self._set_V_measure_I, channel, v[index])
+                    index += 1
 
-            # turn output off
-            self.output_off(channel)
+            finally:
+                # turn output off
+                await self._output_off_async(channel)
 
         return v, vm_fwd, i_fwd, vm_rev, i_rev
+
+
+    def iv_sweep_quadrant_rev_fwd(self, channel: int, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs REV and then FWD IV sweep in the power producing quadrant and returns the data
+
+        Args:
+            channel (int): chroma channel number
+            vstart (float): FWD sweep start voltage (V)
+            vend (float): FWD sweep end voltage (V)
+            steps (float): number of voltage steps in the sweep
+
+        Returns:
+            np.ndarray: voltage applied (V) array
+            np.ndarray: FWD voltage measured (V) array
+            np.ndarray: FWD current measured (A) array
+            np.ndarray: REV voltage measured (V) array
+            np.ndarray: REV current measured (A) array
+        """
+
+        return run_sync(self.iv_sweep_quadrant_rev_fwd_async(channel, vstart, vend, steps))
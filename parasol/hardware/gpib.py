@@ -0,0 +1,272 @@
+import time
+from threading import Lock, Condition, get_ident
+from contextlib import contextmanager
+
+from parasol.hardware import replay
+
+from parasol.configuration.configuration import Configuration
+config = Configuration()
+constants = config.get_config()['gpib']
+
+# One VISA resource manager for the process, and one arbiter per GPIB board
+_resource_manager = None
+_arbiters = {}
+_lock = Lock()
+
+
+def get_resource_manager():
+    """Returns the process wide pyvisa ResourceManager, created on first use"""
+
+    global _resource_manager
+
+    with _lock:
+        if _resource_manager is None:
+            import pyvisa
+
+            _resource_manager = pyvisa.ResourceManager()
+        return _resource_manager
+
+
+def board_name(address: str) -> str:
+    """Gets the board an instrument sits on from its VISA address
+
+    Args:
+        address (str): VISA address, e.g. 'GPIB1::15::INSTR'
+
+    Returns:
+        str: board name, e.g. 'GPIB1'
+    """
+
+    return address.split("::")[0].upper()
+
+
+def get_arbiter(address: str):
+    """Returns the arbiter of the board an instrument sits on, shared by every instrument on that board
+
+    Args:
+        address (str): VISA address of the instrument
+
+    Returns:
+        BusArbiter: arbiter for the board
+    """
+
+    board = board_name(address)
+    with _lock:
+        if board not in _arbiters:
+            _arbiters[board] = BusArbiter(board, constants["max_wait"])
+        return _arbiters[board]
+
+
+def open_resource(address: str, name: str, priority: int = 1):
+    """Opens an instrument through the shared resource manager with its bus transactions arbitrated
+
+    Args:
+        address (str): VISA address of the instrument
+        name (str): instrument name used in the bus statistics
+        priority (int): bus priority, lower goes first
+
+    Returns:
+        BusResource: the instrument resource
+    """
+
+    resource = replay.wrap("visa", address, lambda: get_resource_manager().open_resource(address))
+    return BusResource(resource, get_arbiter(address), name, priority)
+
+
+def bus_stats() -> dict:
+    """Reports occupancy of every board
+
+    Returns:
+        dict: stats[board] = BusArbiter.stats()
+    """
+
+    with _lock:
+        arbiters = list(_arbiters.values())
+    return {arbiter.board: arbiter.stats() for arbiter in arbiters}
+
+
+class BusArbiter:
+    """Orders bus transactions of the instruments on one GPIB board
+
+    One transaction holds the bus at a time. Waiting transactions go by priority (lower first) and then
+    arrival, except that any transaction waiting longer than max_wait goes first, so low priority
+    instruments are slowed down but never starved. A thread already holding the bus can nest transactions,
+    which is how a driver batches several writes/queries into one turn on the bus.
+    """
+
+    def __init__(self, board: str, max_wait: float = 0.5) -> None:
+        """Initializes the arbiter
+
+        Args:
+            board (str): board name
+            max_wait (float): wait (s) after which a transaction goes ahead of higher priorities
+        """
+
+        self.board = board
+        self.max_wait = max_wait
+        self.condition = Condition()
+
+        # thread holding the bus, nesting depth, time the bus was granted
+        self.owner = None
+        self.depth = 0
+        self.granted = None
+
+        # waiting transactions as [priority, arrival number, time requested]
+        self.waiters = []
+        self.arrivals = 0
+
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Restarts the occupancy statistics"""
+
+        with self.condition:
+            self.start = time.perf_counter()
+            self.busy = 0.0
+            self.transactions = 0
+            self.instruments = {}
+
+    def _instrument(self, name: str) -> dict:
+        """Gets the statistics of an instrument, call with the condition held"""
+
+        return self.instruments.setdefault(name, {"transactions": 0, "busy": 0.0, "wait": 0.0, "max_wait": 0.0})
+
+    def _next(self) -> list:
+        """Picks the waiting transaction to go next, call with the condition held"""
+
+        now = time.perf_counter()
+        overdue = [waiter for waiter in self.waiters if now - waiter[2] >= self.max_wait]
+        if overdue:
+            return min(overdue, key=lambda waiter: waiter[1])
+        return min(self.waiters, key=lambda waiter: (waiter[0], waiter[1]))
+
+    @contextmanager
+    def transaction(self, name: str, priority: int = 1):
+        """Holds the bus for one transaction or a batch of them
+
+        Args:
+            name (str): instrument name for the statistics
+            priority (int): lower goes first
+        """
+
+        ident = get_ident()
+        with self.condition:
+
+            # Nested in a batch already holding the bus
+            if self.owner == ident:
+                self.depth += 1
+                nested = True
+            else:
+                nested = False
+                waiter = [priority, self.arrivals, time.perf_counter()]
+                self.arrivals += 1
+                self.waiters.append(waiter)
+                try:
+                    # Wake up at max_wait so an overdue transaction is picked even without a release
+                    while self.owner is not None or self._next() is not waiter:
+                        self.condition.wait(max(self.max_wait, 0.01))
+                finally:
+                    self.waiters.remove(waiter)
+
+                self.owner = ident
+                self.depth = 1
+                self.granted = time.perf_counter()
+                s = self._instrument(name)
+                waited = self.granted - waiter[2]
+                s["transactions"] += 1
+                s["wait"] += waited
+                s["max_wait"] = max(s["max_wait"], waited)
+                self.transactions += 1
+
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.depth -= 1
+                if not nested:
+                    held = time.perf_counter() - self.granted
+                    self.busy += held
+                    self._instrument(name)["busy"] += held
+                    self.owner = None
+                    self.granted = None
+                    self.condition.notify_all()
+
+    def stats(self) -> dict:
+        """Reports bus occupancy, an occupancy near 1 means the bus rather than the instruments limits throughput
+
+        Returns:
+            dict: elapsed (s), busy (s), occupancy (fraction of elapsed the bus was held), transactions,
+                waiting (number of transactions waiting now), instruments[name] = {transactions, busy (s),
+                occupancy, mean_wait (s), max_wait (s)}
+        """
+
+        with self.condition:
+            now = time.perf_counter()
+            elapsed = now - self.start
+            busy = self.busy + (now - self.granted if self.granted is not None else 0.0)
+            instruments = {}
+            for name, s in self.instruments.items():
+                instruments[name] = {
+                    "transactions": s["transactions"],
+                    "busy": s["busy"],
+                    "occupancy": s["busy"] / elapsed if elapsed > 0 else 0.0,
+                    "mean_wait": s["wait"] / s["transactions"] if s["transactions"] else 0.0,
+                    "max_wait": s["max_wait"],
+                }
+            return {
+                "elapsed": elapsed,
+                "busy": busy,
+                "occupancy": busy / elapsed if elapsed > 0 else 0.0,
+                "transactions": self.transactions,
+                "waiting": len(self.waiters),
+                "instruments": instruments,
+            }
+
+
+class BusResource:
+    """pyvisa resource whose writes and queries take turns on the bus through the board arbiter"""
+
+    def __init__(self, resource, arbiter: BusArbiter, name: str, priority: int = 1) -> None:
+        """Wraps an open resource
+
+        Args:
+            resource (pyvisa.Resource): open instrument resource
+            arbiter (BusArbiter): arbiter of the instrument's board
+            name (str): instrument name for the statistics
+            priority (int): lower goes first
+        """
+
+        self.resource = resource
+        self.arbiter = arbiter
+        self.name = name
+        self.priority = priority
+
+    @property
+    def timeout(self):
+        return self.resource.timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self.resource.timeout = value
+
+    def batch(self):
+        """Holds the bus across several writes/queries so they go out back to back"""
+
+        return self.arbiter.transaction(self.name, self.priority)
+
+    def write(self, command: str):
+        """Writes a command in its own bus transaction"""
+
+        with self.batch():
+            return self.resource.write(command)
+
+    def query(self, command: str) -> str:
+        """Writes a command and reads the response in one bus transaction"""
+
+        with self.batch():
+            return self.resource.query(command)
+
+    def close(self) -> None:
+        """Closes the resource"""
+
+        self.resource.close()
@@ -3,6 +3,8 @@ import time
 import math
 import numpy as np
 
+from parasol.hardware import replay
+
 from parasol.configuration.configuration import Configuration
 config = Configuration()
 constants = config.get_config()['labjack']
@@ -23,7 +25,7 @@ class LabJack:
         """Initialize the labjack package for monitoring"""
 
         # Setup u6 amd calibration data
-        self.d = u6.U6() #
+        self.d = replay.wrap("u6", "labjack", u6.U6) #
         self.d.getCalibrationData() #
 
         # AIN ports for measurements
@@ -45,6 +47,20 @@ class LabJack:
         self.avgnum = constants["average_num"]
         self.delay = constants["delay_time"]
 
+        # Read every channel in one feedback packet per scan ('batch') or one getAIN per reading ('single')
+        self.acquisition_mode = constants["acquisition_mode"]
+
+        # Channels read in a batch scan: (name, AIN port, gain index)
+        self.batch_channels = [
+            ("tc1", self.thermocouple1_port, 0),
+            ("tc2", self.thermocouple2_port, 0),
+            ("gnd", self.ground_port, 0),
+            ("hg", self.hygrometer_port, 0),
+            ("vin", self.voltage_port, 0),
+            ("pd", self.photodiode_port, 1),
+            ("gnd_x10", self.ground_port, 1),
+        ]
+
         # Setup nested functions for analysis
         self.tc = self.Thermocouple()
         self.rtd = self.RTD()
@@ -72,6 +88,41 @@ class LabJack:
 
         return self.d.getAIN(idx, resolutionindex, gainindex)
 
+    def read_AIN_batch(self, channels: list, num_scans: int, resolutionindex: int = 13) -> np.ndarray:
+        """Reads a set of analog input channels together, one feedback packet per scan
+
+        Stream mode on the U6 tops out at resolution index 8, so high resolution reads use a feedback
+        packet holding one AIN24 command per channel.
+
+        Args:
+            channels (list[tuple]): (AIN port, gain index) for each channel
+            num_scans (int): number of times to read every channel
+            resolutionindex (int): resolution index for labjack
+
+        Returns:
+            np.ndarray: voltages (V) with shape (num_scans, number of channels)
+        """
+
+        commands = [
+            u6.AIN24(PositiveChannel=port, ResolutionIndex=resolutionindex, GainIndex=gain, SettlingFactor=0)
+            for port, gain in channels
+        ]
+
+        volts = np.zeros((num_scans, len(channels)))
+        for scan in range(num_scans):
+            bits = self.d.getFeedback(*commands)
+            for idx, (port, gain) in enumerate(channels):
+                volts[scan, idx] = self.d.binaryToCalibratedAnalogVoltage(gain, bits[idx], is16Bits=False, resolutionIndex=resolutionindex)
+            if self.delay and scan < num_scans - 1:
+                time.sleep(self.delay)
+
+        return volts
+
+    def disconnect(self) -> None:
+        """Closes the connection to the LabJack"""
+
+        self.d.close()
+
     def read_CJT(self) -> float:
         """Reads the cold junction temperature (internal temperature sensor)
 
@@ -100,6 +151,9 @@ class LabJack:
     def monitor_env(self) -> float:
         """Monitors the environment and returns the temperature, relative humidity, and intensity"""
 
+        if self.acquisition_mode == "batch":
+            return self.monitor_env_batch()
+
         # change
         temp_dark = self.get_temp_rtd(1)
         temp_light = self.get_temp_rtd(2)
@@ -114,6 +168,59 @@ class LabJack:
         # return temp, rh, intensity
 
 
+    def monitor_env_batch(self) -> float:
+        """Reads every environmental channel together and derives all quantities from the shared samples
+
+        Returns:
+            float: temperature of dark RTD in degrees C
+            float: temperature of light RTD in degrees C
+            float: RH in %
+            float: intensity of the photodiode in # suns
+        """
+
+        # Read all channels avgnum times and convert the whole block
+        volts = self.read_AIN_batch([(port, gain) for _, port, gain in self.batch_channels], self.avgnum)
+        env = self.convert_env_block(volts)
+
+        return float(env["temp_dark"]), float(env["temp_light"]), float(env["rh"]), float(env["intensity"])
+
+    def convert_env_block(self, volts: np.ndarray) -> dict:
+        """Converts a block of raw voltages from read_AIN_batch to environmental quantities
+
+        Also useful to re-convert saved raw voltages offline.
+
+        Args:
+            volts (np.ndarray): voltages (V) with shape (num_scans, len(self.batch_channels))
+
+        Returns:
+            dict: averaged "temp_dark" (C), "temp_light" (C), "rh" (%), "intensity" (# suns), and per scan arrays
+                  of each under "<name>_samples"
+        """
+
+        # Get calibrated current output in amps
+        RTD_A = 2e-4
+
+        volts = np.atleast_2d(volts)
+        v = {name: volts[:, idx] for idx, (name, _, _) in enumerate(self.batch_channels)}
+
+        # RTDs: voltage across each RTD to resistance to temperature
+        temp_dark = self.rtd.ohmToTempC((v["tc1"] - v["tc2"]) / RTD_A)
+        temp_light = self.rtd.ohmToTempC((v["tc2"] - v["gnd"]) / RTD_A)
+
+        # Hygrometer: applied voltage, sensor RH, temperature corrected RH
+        HM_RHs = self.hm.VoltsToRHs(v["hg"] - v["gnd"], np.mean(v["vin"]))
+        rh = self.hm.RHsToRHr(HM_RHs, np.mean(temp_dark))
+
+        # Photodiode: mV across resistor to mA to # suns
+        PDmAmps = self.pd.mVoltsTomAmps((v["pd"] - v["gnd_x10"]) * 1000)
+        intensity = self.pd.mAmpsToSuns(PDmAmps, np.mean(temp_light))
+
+        env = {}
+        for name, samples in [("temp_dark", temp_dark), ("temp_light", temp_light), ("rh", rh), ("intensity", intensity)]:
+            env[name] = np.mean(samples)
+            env[name + "_samples"] = samples
+        return env
+
     def get_temp_rtd(self, port)-> float:
         """Measures the temperature using the labjack and PT1000 RTD
 
@@ -285,30 +392,30 @@ class LabJack:
             """Converts the voltage reading to RH sensor using the coefficients
 
             Args:
-                v_meas (float): voltage reading in mV
-                v_app (float): voltage applied in mV
+                v_meas (float or np.ndarray): voltage reading in mV
+                v_app (float or np.ndarray): voltage applied in mV
 
             Returns:
-                float: relative humidity in RH
+                float or np.ndarray: relative humidity in RH
             """
 
             # Voltage to RH equation given for each calibrated sensor
-            return (v_meas - self.voffset) / self.vmult
+            return (np.asarray(v_meas) - self.voffset) / self.vmult
 
         def RHsToRHr(self, RH_meas: float, temp: float) -> float:
             """Concerts RH sensor reading to real RH reading (temp correction)
 
             Args:
-                RH_meas (float): RH sensor reading in %
-                temp (float): temperature in degrees C
+                RH_meas (float or np.ndarray): RH sensor reading in %
+                temp (float or np.ndarray): temperature in degrees C
 
             Returns:
-                float: real relative humidity in %
+                float or np.ndarray: real relative humidity in %
             """
 
             # Temp correction given in Installation Instructions manual
             # https://sps.honeywell.com/us/en/products/advanced-sensing-technologies/healthcare-sensing/humidity-with-temperature-sensors/hih-4000-series
-            return (RH_meas) / (self.rhoffset - self.rhmult * temp)
+            return np.asarray(RH_meas) / (self.rhoffset - self.rhmult * np.asarray(temp))
 
     class Photodiode:
         """
@@ -333,33 +440,33 @@ class LabJack:
             """Converts the voltage reading to mA using Ohms Law
 
             Args:
-                volts (float): voltage reading in mV
+                volts (float or np.ndarray): voltage reading in mV
 
             Returns:
-                float: illumination intensity in mA
+                float or np.ndarray: illumination intensity in mA
             """
             # V = I*R --> I = V/R
-            return volts / self.resistor
+            return np.asarray(volts) / self.resistor
 
         def mAmpsToSuns(self, amps: float, temp: float) -> float:
             """Converts mA reading to # suns using the photodiode's Isc and temp coef
 
             Args:
-                amps (float): sun count
-                temp (float): temperature in degrees C
+                amps (float or np.ndarray): sun count
+                temp (float or np.ndarray): temperature in degrees C
 
             Returns:
-                float: illumination intensity in # suns
+                float or np.ndarray: illumination intensity in # suns
             """
 
             # adjust 1 sun for temperature
             temp_adj = (
-                self.onesun_isc * (temp - self.tempoffset) * (self.tempmult / 100)
+                self.onesun_isc * (np.asarray(temp) - self.tempoffset) * (self.tempmult / 100)
             )
             adj_1sun = self.onesun_isc + temp_adj
 
             # get # suns using : #suns = mA / (mA/sun)
-            numsuns = amps / adj_1sun
+            numsuns = np.asarray(amps) / adj_1sun
 
             return numsuns
 
@@ -512,49 +619,66 @@ class LabJack:
                 float: calculated y value for given x and coefficients
             """
 
-            # for each coefficient, add (x^i * ci) to the sum
-            tot = 0
-            y = 1
-            for a in coeffs:
-                tot += y * a
-                y *= x
-            return tot
+            # Horner's method over the whole array, coefficients are in increasing order
+            return np.polynomial.polynomial.polyval(x, coeffs)
 
         def tempCToMVolts(self, tempC: float) -> float:
             """Converts a temperature in C to voltage in mV
 
             Args:
-                tempC (float): temperature in C
+                tempC (float or np.ndarray): temperature in C
 
             Returns:
-                float: voltage in mV
+                float or np.ndarray: voltage in mV
             """
 
-            # get correct coefficients for temperature range
-            coeffs = self.tempToVoltsConstants(tempC)
-
-            # if from range 0 < tempC < 1372 C, calculate voltage regular + extended correction
-            if hasattr(coeffs, "extended"):
-                a0, a1, a2 = coeffs.extended
-                extendedCalc = a0 * math.exp(a1 * (tempC - a2) * (tempC - a2))
-                return self.evaluatePolynomial(coeffs, tempC) + extendedCalc
-            # else, calculate voltage regular
-            else:
-                return self.evaluatePolynomial(coeffs, tempC)
+            if np.ndim(tempC) == 0:
+                # get correct coefficients for temperature range
+                coeffs = self.tempToVoltsConstants(tempC)
+
+                # if from range 0 < tempC < 1372 C, calculate voltage regular + extended correction
+                if hasattr(coeffs, "extended"):
+                    a0, a1, a2 = coeffs.extended
+                    extendedCalc = a0 * math.exp(a1 * (tempC - a2) * (tempC - a2))
+                    return self.evaluatePolynomial(coeffs, tempC) + extendedCalc
+                # else, calculate voltage regular
+                else:
+                    return self.evaluatePolynomial(coeffs, tempC)
+
+            # arrays: check range once, evaluate both branches and pick per element
+            tempC = np.asarray(tempC, dtype=float)
+            if np.any((tempC < -270) | (tempC > 1372)):
+                raise Exception("Invalid range")
+            a0, a1, a2 = self.tempToVolts2.extended
+            above = self.evaluatePolynomial(self.tempToVolts2, tempC) + a0 * np.exp(a1 * (tempC - a2) ** 2)
+            below = self.evaluatePolynomial(self.tempToVolts1, tempC)
+            return np.where(tempC < 0, below, above)
 
         def mVoltsToTempC(self, mVolts: float) -> float:
             """Converts a voltage in mV to temperature in C
 
             Args:
-                mVolts (float): voltage in mV
+                mVolts (float or np.ndarray): voltage in mV
 
             Returns:
-                float: temperature in C
+                float or np.ndarray: temperature in C
             """
-            # get correct coefficients for voltage range
-            coeffs = self.voltsToTempConstants(mVolts)
-            # calculate temp regular
-            return self.evaluatePolynomial(coeffs, mVolts)
+
+            if np.ndim(mVolts) == 0:
+                # get correct coefficients for voltage range
+                coeffs = self.voltsToTempConstants(mVolts)
+                # calculate temp regular
+                return self.evaluatePolynomial(coeffs, mVolts)
+
+            # arrays: check range once, evaluate each branch and pick per element
+            mVolts = np.asarray(mVolts, dtype=float)
+            if np.any((mVolts < -5.891) | (mVolts > 54.886)):
+                raise Exception("Invalid range")
+            return np.select(
+                [mVolts < 0, mVolts < 20.644],
+                [self.evaluatePolynomial(self.voltsToTemp1, mVolts), self.evaluatePolynomial(self.voltsToTemp2, mVolts)],
+                self.evaluatePolynomial(self.voltsToTemp3, mVolts),
+            )
         
     
     
@@ -574,12 +698,20 @@ class LabJack:
         def make_coefs(self):
             
             self.temps = np.linspace(-50,110,33)
-            self.ohms = [803.1, 822.9, 842.7, 862.5, 882.2, 901.9, 921.6, 941.2, 960.9, 980.4, 1000, 1019.5, 1039, 1058.5, 
+            self.ohms = np.array([803.1, 822.9, 842.7, 862.5, 882.2, 901.9, 921.6, 941.2, 960.9, 980.4, 1000, 1019.5, 1039, 1058.5, 
                 1077.9, 1097.3, 1116.7, 1136.1, 1155.4, 1174.7, 1194, 1213.2, 1232.4, 1251.6, 1270.7, 1289.8, 1308.9, 1328,
-                1347, 1366, 1385, 1403.9, 1422.9]
+                1347, 1366, 1385, 1403.9, 1422.9])
             
         
         def ohmToTempC(self,ohm) ->float:
+            """Converts RTD resistance to temperature by interpolating the table, works on arrays
+
+            Args:
+                ohm (float or np.ndarray): resistance in Ohm
+
+            Returns:
+                float or np.ndarray: temperature in C
+            """
             
             return np.interp(ohm, self.ohms, self.temps)
             
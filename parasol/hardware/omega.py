@@ -1,12 +1,82 @@
 import serial
+import time
+import logging
 # from matplotlib.pyplot import hot
 from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+
+from parasol.hardware import replay
 
 
 from parasol.configuration.configuration import Configuration
 config = Configuration()
 constants = config.get_config()['hotplate']
 
+logger = logging.getLogger("PARASOL")
+
+
+
+class OmegaBus:
+    """Serial port shared by every Omega on the same RS485 bus"""
+
+    # dict[port] = OmegaBus, so controllers on one port share one handle and lock
+    _buses = {}
+    _buses_lock = Lock()
+
+    @classmethod
+    def get(cls, port: str):
+        """Returns the bus for a port, opening it on first use
+
+        Args:
+            port (str): serial port
+
+        Returns:
+            OmegaBus: shared bus
+        """
+        with cls._buses_lock:
+            if port not in cls._buses:
+                cls._buses[port] = cls(port)
+            return cls._buses[port]
+
+    def __init__(self, port: str):
+        """Opens the serial port
+
+        Args:
+            port (str): serial port
+        """
+        self.port = port
+        self.lock = Lock()
+        self.users = 0
+
+        self.handle = replay.wrap("serial", f"omega:{port}", serial.Serial)
+        self.handle.port = port
+        self.handle.timeout = 2
+        self.handle.parity = "E"
+        self.handle.bytesize = 7
+        self.handle.baudrate = 9600
+        self.handle.open()
+
+    def query(self, payload):
+        """Writes a payload and reads the response line while holding the bus
+
+        Args:
+            payload (byte): package to write
+
+        Returns:
+            str: response
+        """
+        with self.lock:
+            self.handle.write(payload)
+            response = self.handle.readline()
+        return response
+
+    def release(self) -> None:
+        """Closes the port once the last controller using it disconnects"""
+        with OmegaBus._buses_lock:
+            self.users -= 1
+            if self.users <= 0:
+                self.handle.close()
+                OmegaBus._buses.pop(self.port, None)
 
 
 class Omega:
@@ -18,16 +88,18 @@ class Omega:
         self.id = id
         self.hpconstants = constants[f'hp{id}']
         
-        # get constants from hardwareconstants
-        self.port = constants['port'] #get_port(constants["device_identifiers"])
-        self.address = constants['address']  # this is 1 despite the hotplate ID!
-        
-        # create lock
-        self.lock = Lock()
+        # get constants from hardwareconstants for this hotplate
+        self.port = self.hpconstants['port'] #get_port(constants["device_identifiers"])
+        self.address = self.hpconstants['address']
         
         # connect
         self.connect()
 
+    @property
+    def lock(self):
+        """Lock of the bus this controller is on"""
+        return self.__bus.lock
+
     # some properties below --> these may not be needed
 
     @property
@@ -76,10 +148,7 @@ class Omega:
         Returns:
             str: response
         """
-        with self.lock:
-            self.__handle.write(payload)
-            response = self.__handle.readline()
-        return response
+        return self.__bus.query(payload)
 
 
     def connect(self) -> bool:
@@ -88,13 +157,8 @@ class Omega:
         Returns:
             bool: True if connected
         """
-        self.__handle = serial.Serial()
-        self.__handle.port = self.port
-        self.__handle.timeout = 2
-        self.__handle.parity = "E"
-        self.__handle.bytesize = 7
-        self.__handle.baudrate = 9600
-        self.__handle.open()
+        self.__bus = OmegaBus.get(self.port)
+        self.__bus.users += 1
 
         # configure communication bits
         self.__end = b"\r\n"  # end bit <etx>
@@ -113,7 +177,7 @@ class Omega:
             bool: True if connected
         """
         
-        self.__handle.close()
+        self.__bus.release()
         return True
 
 
@@ -136,6 +200,28 @@ class Omega:
         return round(data, 2)
 
 
+    def get_temperature_setpoint(self) -> float:
+        """Gets current hotplate temperature and setpoint in one transaction (registers 1000 and 1001)
+
+        Returns:
+            float: temperature in C
+            float: setpoint in C
+        """
+
+        numWords = 2
+
+        payload = self.__build_payload(
+            address=self.address, command=3, dataAddress=1000, content=numWords
+        )
+        response = self.query(payload)
+
+        # response given in 0.1 C, 4 hex characters per word
+        temperature = int(response[7:11], 16) * 0.1
+        setpoint = int(response[11:15], 16) * 0.1
+
+        return round(temperature, 2), setpoint
+
+
     def get_setpoint(self) -> float:
         """Gets current hotplate setpoint
 
@@ -276,6 +362,98 @@ class Omega:
     #         return False
 
 
+
+class OmegaPoller:
+    """Polls a group of Omega controllers, one thread per serial port, and caches the readings
+
+    Controllers on separate ports are read concurrently, controllers sharing a port are read one after
+    another with temperature and setpoint in one transaction. Readings younger than max_age are served
+    from the cache so monitoring ticks do not grow with the number of stations.
+    """
+
+    def __init__(self, omegas: dict, max_age: float = 5) -> None:
+        """Initializes the poller
+
+        Args:
+            omegas (dict): omegas[id] = Omega
+            max_age (float): maximum age of a cached reading (s)
+        """
+
+        self.omegas = omegas
+        self.max_age = max_age
+
+        # group controllers by port, sorted by address so polling order is fixed
+        self.ports = {}
+        for id, omega in omegas.items():
+            self.ports.setdefault(omega.port, []).append(id)
+        for ids in self.ports.values():
+            ids.sort(key=lambda id: self.omegas[id].address)
+
+        # readings[id] = (time (epoch), temperature (C), setpoint (C))
+        self.lock = Lock()
+        self.readings = {}
+        self.executor = ThreadPoolExecutor(max_workers=max(len(self.ports), 1))
+
+    def _poll_port(self, port: str) -> None:
+        """Reads every controller on a port"""
+
+        for id in self.ports[port]:
+            try:
+                temperature, setpoint = self.omegas[id].get_temperature_setpoint()
+            except Exception as e:
+                logger.warning(f"Could not read hotplate {id} on {port}: {e}")
+                continue
+            with self.lock:
+                self.readings[id] = (time.time(), temperature, setpoint)
+
+    def poll(self) -> None:
+        """Reads every controller, ports in parallel, blocks until done"""
+
+        for future in [self.executor.submit(self._poll_port, port) for port in self.ports]:
+            future.result()
+
+    def get(self, id: int, max_age: float = None) -> tuple:
+        """Returns the latest reading for a controller, polling its port if the cache is stale
+
+        Args:
+            id (int): hotplate id
+            max_age (float, optional): maximum age of cached reading (s). Defaults to self.max_age.
+
+        Returns:
+            tuple: (time (epoch), temperature (C), setpoint (C)), or None if no reading younger than max_age
+                could be read
+        """
+
+        if max_age is None:
+            max_age = self.max_age
+
+        with self.lock:
+            reading = self.readings.get(id)
+        if reading is None or time.time() - reading[0] > max_age:
+            self._poll_port(self.omegas[id].port)
+            with self.lock:
+                reading = self.readings.get(id)
+
+            # Refresh failed, do not pass an old reading off as current
+            if reading is None or time.time() - reading[0] > max_age:
+                logger.warning(f"No reading of hotplate {id} younger than {max_age} s")
+                return None
+        return reading
+
+    def get_temperature(self, id: int, max_age: float = None) -> float:
+        """Returns the latest temperature for a controller, -1 if no reading younger than max_age could be read
+
+        Args:
+            id (int): hotplate id
+            max_age (float, optional): maximum age of cached reading (s). Defaults to self.max_age.
+
+        Returns:
+            float: temperature in C
+        """
+
+        reading = self.get(id, max_age)
+        return -1 if reading is None else reading[1]
+
 # class HotPlate(Workspace):
 #     def __init__(
 #         self,
@@ -1,5 +1,7 @@
 import serial.tools.list_ports as lp
 
+from parasol.hardware import replay
+
 
 def get_port(device_identifiers):
     """Finds port address for given device identifiers
@@ -8,6 +10,10 @@ def get_port(device_identifiers):
         str: port address
     """
 
+    # Replayed devices have no port
+    if replay.replaying():
+        return "replay"
+
     # Get port on windows
     port = _get_port_windows(device_identifiers)
 
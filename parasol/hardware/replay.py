@@ -0,0 +1,415 @@
+import json
+import time
+import argparse
+import importlib
+from threading import Lock
+
+from parasol.configuration.configuration import Configuration
+config = Configuration()
+constants = config.get_config()['replay']
+
+# Modes
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+
+# Calls recorded for each kind of handle, everything else (attributes, open/close) passes through
+OPERATIONS = {
+    "visa": ["write", "query", "read"],
+    "serial": ["write", "read", "readline", "flush", "reset_input_buffer"],
+    "u6": [
+        "getCalibrationData",
+        "getAIN",
+        "getFeedback",
+        "binaryToCalibratedAnalogVoltage",
+        "getTemperature",
+        "writeRegister",
+    ],
+}
+
+# Calls that only change the state of the handle, kept local when replaying
+LOCAL_OPERATIONS = {"open": True, "close": False}
+
+# Session state, set by configure() or from the config on first use
+_mode = None
+_recorder = None
+_player = None
+_lock = Lock()
+
+
+class ReplayError(Exception):
+    """Raised when a replayed call does not match the recording"""
+
+
+def _encode(value):
+    """Converts call arguments/results to JSON values, bytes and objects are tagged so they can be restored"""
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": bytes(value).hex()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if hasattr(value, "tolist"):
+        return _encode(value.tolist())
+    if hasattr(value, "__dict__"):
+        fields = {k: _encode(v) for k, v in vars(value).items() if not k.startswith("_")}
+        return {"__object__": type(value).__name__, **fields}
+    return repr(value)
+
+
+def _decode(value):
+    """Restores values written by _encode, objects come back as dicts"""
+
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        if "__bytes__" in value:
+            return bytes.fromhex(value["__bytes__"])
+        return {k: _decode(v) for k, v in value.items()}
+    return value
+
+
+def _raise(record: dict):
+    """Raises the exception of a recorded call, as its original type when it can be rebuilt"""
+
+    module, _, name = record["error_type"].rpartition(".")
+    try:
+        error = getattr(importlib.import_module(module), name)(record["error"])
+    except Exception:
+        error = ReplayError(f"{record['error_type']}: {record['error']}")
+    raise error
+
+
+class Recorder:
+    """Writes every instrument call with its timing to a JSON lines file
+
+    Each line is {"seq", "device", "op", "args", "t" (s since recording started), "dur" (s)} plus "result" or
+    "error"/"error_type".
+    """
+
+    def __init__(self, path: str) -> None:
+        """Starts a recording, replacing any file at path
+
+        Args:
+            path (str): path to the recording
+        """
+
+        self.path = path
+        self.lock = Lock()
+        self.seq = 0
+        self.start = time.perf_counter()
+        self.file = open(path, "w")
+        self.file.write(json.dumps({"type": "header", "version": 1, "created": time.time()}) + "\n")
+        self.file.flush()
+
+    def log(self, device: str, op: str, args: tuple, start: float, result=None, error: Exception = None) -> None:
+        """Writes one call
+
+        Args:
+            device (str): device name
+            op (str): method called
+            args (tuple): arguments of the call
+            start (float): perf_counter time the call started
+            result: return of the call
+            error (Exception): exception raised by the call, None if it returned
+        """
+
+        end = time.perf_counter()
+        record = {"device": device, "op": op, "args": _encode(args), "t": start - self.start, "dur": end - start}
+        if error is None:
+            record["result"] = _encode(result)
+        else:
+            record["error"] = str(error)
+            record["error_type"] = f"{type(error).__module__}.{type(error).__qualname__}"
+
+        with self.lock:
+            record["seq"] = self.seq
+            self.seq += 1
+            self.file.write(json.dumps(record) + "\n")
+            self.file.flush()
+
+    def close(self) -> None:
+        """Finishes the recording"""
+
+        with self.lock:
+            self.file.close()
+
+
+class Player:
+    """Serves calls from a recording in the order each device saw them
+
+    Calls are matched per device, so threads interleaving differently from the recorded run still get the
+    responses their device gave. Each call takes its recorded duration divided by speed.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, strict: bool = True, lookahead: int = 50) -> None:
+        """Loads a recording
+
+        Args:
+            path (str): path to the recording
+            speed (float): 1 replays at recorded timing, 10 ten times faster, 0 without waiting
+            strict (bool): raise ReplayError when a call differs from the recording. When False, recorded calls
+                are skipped to find a match (up to lookahead), then the first recorded response to the same call
+                is used, so changed drivers can still be benchmarked
+            lookahead (int): number of recorded calls to search for a match when not strict
+        """
+
+        self.path = path
+        self.speed = speed
+        self.strict = strict
+        self.lookahead = lookahead
+        self.lock = Lock()
+
+        # queues[device] = records in call order, responses[(device, op, args)] = first record of that call
+        self.queues = {}
+        self.positions = {}
+        self.responses = {}
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("type") == "header":
+                    continue
+                self.queues.setdefault(record["device"], []).append(record)
+                self.responses.setdefault(self._key(record["device"], record["op"], record["args"]), record)
+        self.positions = {device: 0 for device in self.queues}
+
+    @staticmethod
+    def _key(device: str, op: str, args) -> tuple:
+        return device, op, json.dumps(args)
+
+    def _match(self, device: str, op: str, args) -> dict:
+        """Finds the recorded call for a call, call with the lock held"""
+
+        queue = self.queues.get(device, [])
+        position = self.positions.get(device, 0)
+
+        # Next call of the device
+        if position < len(queue):
+            record = queue[position]
+            if record["op"] == op and record["args"] == args:
+                self.positions[device] = position + 1
+                return record
+
+        if self.strict:
+            expected = queue[position] if position < len(queue) else None
+            expected = "end of recording" if expected is None else f"{expected['op']}{tuple(expected['args'])}"
+            raise ReplayError(f"{device}: {op}{tuple(args)} does not match the recording, expected {expected}")
+
+        # Skip ahead to the call
+        for index in range(position + 1, min(position + 1 + self.lookahead, len(queue))):
+            record = queue[index]
+            if record["op"] == op and record["args"] == args:
+                self.positions[device] = index + 1
+                return record
+
+        # Reuse a response to the same call
+        record = self.responses.get(self._key(device, op, args))
+        if record is None:
+            raise ReplayError(f"{device}: {op}{tuple(args)} was never recorded")
+        return record
+
+    def call(self, device: str, op: str, args: tuple):
+        """Replays one call
+
+        Args:
+            device (str): device name
+            op (str): method called
+            args (tuple): arguments of the call
+
+        Returns:
+            the recorded return of the call
+        """
+
+        args = _encode(args)
+        with self.lock:
+            record = self._match(device, op, args)
+
+        if self.speed:
+            time.sleep(record["dur"] / self.speed)
+        if "error" in record:
+            _raise(record)
+        return _decode(record["result"])
+
+    def remaining(self) -> dict:
+        """Counts recorded calls not replayed yet
+
+        Returns:
+            dict: remaining[device] = number of calls
+        """
+
+        with self.lock:
+            return {device: len(queue) - self.positions[device] for device, queue in self.queues.items()}
+
+
+class RecordingProxy:
+    """Passes calls through to a real handle, recording the ones listed in OPERATIONS"""
+
+    def __init__(self, handle, device: str, kind: str, recorder: Recorder) -> None:
+        object.__setattr__(self, "_handle", handle)
+        object.__setattr__(self, "_device", device)
+        object.__setattr__(self, "_operations", OPERATIONS[kind])
+        object.__setattr__(self, "_recorder", recorder)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._handle, name)
+        if name not in self._operations:
+            return attribute
+
+        def recorded(*args):
+            start = time.perf_counter()
+            try:
+                result = attribute(*args)
+            except Exception as e:
+                self._recorder.log(self._device, name, args, start, error=e)
+                raise
+            self._recorder.log(self._device, name, args, start, result=result)
+            return result
+
+        return recorded
+
+    def __setattr__(self, name, value):
+        setattr(self._handle, name, value)
+
+
+class ReplayProxy:
+    """Stands in for a handle, serving the calls listed in OPERATIONS from a recording"""
+
+    def __init__(self, device: str, kind: str, player: Player) -> None:
+        object.__setattr__(self, "_device", device)
+        object.__setattr__(self, "_operations", OPERATIONS[kind])
+        object.__setattr__(self, "_player", player)
+        object.__setattr__(self, "_attributes", {"is_open": False})
+
+    def __getattr__(self, name):
+        if name in self._operations:
+            return lambda *args: self._player.call(self._device, name, args)
+        if name in LOCAL_OPERATIONS:
+            return lambda: self._attributes.update(is_open=LOCAL_OPERATIONS[name])
+        try:
+            return self._attributes[name]
+        except KeyError:
+            raise AttributeError(f"Replayed {self._device} has no attribute '{name}'") from None
+
+    def __setattr__(self, name, value):
+        self._attributes[name] = value
+
+
+def configure(mode: str = None, path: str = None, speed: float = None, strict: bool = None) -> None:
+    """Sets up recording or replay for handles opened from now on, defaults come from the config
+
+    Args:
+        mode (str): 'off', 'record' or 'replay'
+        path (str): path to the recording, FileStructure.get_recording_path() if empty
+        speed (float): replay speed, 1 is recorded timing, 0 is as fast as possible
+        strict (bool): raise ReplayError when a replayed call differs from the recording
+    """
+
+    global _mode, _recorder, _player
+
+    mode = constants["mode"] if mode is None else mode
+    path = constants["path"] if path is None else path
+    speed = constants["speed"] if speed is None else speed
+    strict = constants["strict"] if strict is None else strict
+    if mode not in [OFF, RECORD, REPLAY]:
+        raise ValueError(f"Unknown replay mode '{mode}'")
+
+    if not path and mode != OFF:
+        from parasol.filestructure import FileStructure
+
+        path = FileStructure().get_recording_path()
+
+    with _lock:
+        if _recorder is not None:
+            _recorder.close()
+        _recorder = Recorder(path) if mode == RECORD else None
+        _player = Player(path, speed, strict) if mode == REPLAY else None
+        _mode = mode
+
+
+def get_mode() -> str:
+    """Returns the session mode, configuring from the config on first use"""
+
+    if _mode is None:
+        configure()
+    return _mode
+
+
+def replaying() -> bool:
+    """Checks if instrument handles are served from a recording"""
+
+    return get_mode() == REPLAY
+
+
+def get_player() -> Player:
+    """Returns the player of a replay session, None otherwise"""
+
+    get_mode()
+    return _player
+
+
+def wrap(kind: str, device: str, open_handle):
+    """Opens an instrument handle through the recorder or player
+
+    Args:
+        kind (str): 'visa', 'serial' or 'u6', picks the calls to record
+        device (str): device name, must be the same when recording and replaying
+        open_handle (function): opens the real handle, not called when replaying
+
+    Returns:
+        object: the real handle, a recording proxy for it, or a replay proxy
+    """
+
+    mode = get_mode()
+    if mode == REPLAY:
+        return ReplayProxy(device, kind, _player)
+    handle = open_handle()
+    if mode == RECORD:
+        return RecordingProxy(handle, device, kind, _recorder)
+    return handle
+
+
+def summarize(path: str) -> dict:
+    """Summarizes a recording
+
+    Args:
+        path (str): path to the recording
+
+    Returns:
+        dict: duration (s) of the recording, devices[device] = {calls, busy (s), errors, ops[op] = calls}
+    """
+
+    devices = {}
+    duration = 0.0
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("type") == "header":
+                continue
+            s = devices.setdefault(record["device"], {"calls": 0, "busy": 0.0, "errors": 0, "ops": {}})
+            s["calls"] += 1
+            s["busy"] += record["dur"]
+            s["errors"] += "error" in record
+            s["ops"][record["op"]] = s["ops"].get(record["op"], 0) + 1
+            duration = max(duration, record["t"] + record["dur"])
+    return {"duration": duration, "devices": devices}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize an instrument recording")
+    parser.add_argument("path", help="path to the recording")
+    args = parser.parse_args()
+
+    summary = summarize(args.path)
+    print(f"{args.path}: {summary['duration']:.1f} s recorded")
+    for device, s in sorted(summary["devices"].items()):
+        ops = ", ".join(f"{op} {count}" for op, count in sorted(s["ops"].items()))
+        print(f"    {device:<24}{s['calls']:>8} calls {s['busy']:>9.2f} s busy {s['errors']:>5} errors  ({ops})")
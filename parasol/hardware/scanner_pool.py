@@ -0,0 +1,159 @@
+import time
+from threading import Lock
+
+from parasol.configuration.configuration import Configuration
+config = Configuration()
+constants = config.get_config()['yokogawa']
+
+
+def pool_config() -> list:
+    """Gets the scanners to connect from the config
+
+    Returns:
+        list[dict]: {"name", "address", "modules"} per scanner, one scanner on the configured address sweeping
+            every module (modules None) when no pool is configured
+    """
+
+    if not constants["pool"]:
+        return [{"name": "yokogawa", "address": constants["address"], "modules": None}]
+    return [
+        {"name": f"yokogawa{index+1}", "address": entry["address"], "modules": list(entry["modules"])}
+        for index, entry in enumerate(constants["pool"])
+    ]
+
+
+class ScannerGroup:
+    """One SMU and the relay boards wired to its sense lines
+
+    Only one module of a group can be switched onto the SMU at a time, so the group lock is held from
+    switching a module's relays on until they are off again. JV and probe passes hold it for all the
+    modules a string has on the group.
+    """
+
+    def __init__(self, name: str, scanner, modules: list = None, boards: set = None) -> None:
+        """Initializes the group
+
+        Args:
+            name (str): group name, the scanner's instrument name
+            scanner (Yokogawa): SMU of the group
+            modules (list[int], optional): modules wired to the group, None for every module
+            boards (set[int], optional): relay boards of the group, None for every board
+        """
+
+        self.name = name
+        self.scanner = scanner
+        self.modules = modules
+        self.boards = boards
+        self.lock = Lock()
+
+        # modules swept and time the group was held, for throughput
+        self.scans = 0
+        self.busy = 0.0
+
+
+class ScannerPool:
+    """Spreads module JV sweeps over several SMUs, each tied to its own relay boards
+
+    Modules on different groups are swept in parallel. Groups must not share relay boards, so one group
+    switching never disturbs a sweep running on another.
+    """
+
+    def __init__(self, scanners: list, modules: list, relay) -> None:
+        """Builds the groups
+
+        Args:
+            scanners (list[Yokogawa]): SMUs
+            modules (list): modules[i] = list of modules wired to scanners[i], None for every module
+            relay (Relay): relay boards, used to find the boards of each group
+
+        Raises:
+            ValueError: a module is wired to two scanners, or two scanners share a relay board
+        """
+
+        self.groups = []
+        self.module_groups = {}
+        for scanner, group_modules in zip(scanners, modules):
+            boards = None
+            if group_modules is not None:
+                relays = [r for module in group_modules for r in relay.relay_library[module]]
+                boards = relay.boards_for(relays)
+            group = ScannerGroup(scanner.name, scanner, group_modules, boards)
+
+            for other in self.groups:
+                if other.boards is None or boards is None or other.boards & boards:
+                    raise ValueError(f"Scanners {other.name} and {group.name} share relay boards")
+            for module in group_modules or []:
+                if module in self.module_groups:
+                    raise ValueError(f"Module {module} is wired to {self.module_groups[module].name} and {group.name}")
+                self.module_groups[module] = group
+            self.groups.append(group)
+
+        self.start = time.perf_counter()
+
+    @property
+    def scanners(self) -> list:
+        """SMUs of the pool"""
+        return [group.scanner for group in self.groups]
+
+    def group_of(self, module: int) -> ScannerGroup:
+        """Gets the group a module is wired to
+
+        Args:
+            module (int): module channel
+
+        Raises:
+            ValueError: module is not wired to any scanner
+
+        Returns:
+            ScannerGroup: the group
+        """
+
+        group = self.module_groups.get(module)
+        if group is not None:
+            return group
+        if len(self.groups) == 1 and self.groups[0].modules is None:
+            return self.groups[0]
+        raise ValueError(f"Module {module} is not wired to a scanner")
+
+    def assign(self, modules: list) -> dict:
+        """Splits the modules of a string over the groups, keeping their order
+
+        Args:
+            modules (list[int]): module channels
+
+        Returns:
+            dict: assignments[group] = [(index in modules, module)]
+        """
+
+        assignments = {}
+        for index, module in enumerate(modules):
+            assignments.setdefault(self.group_of(module), []).append((index, module))
+        return assignments
+
+    def record(self, group: ScannerGroup, elapsed: float) -> None:
+        """Counts one module sweep on a group, call with the group lock held
+
+        Args:
+            group (ScannerGroup): group that swept
+            elapsed (float): time the group was held (s)
+        """
+
+        group.scans += 1
+        group.busy += elapsed
+
+    def stats(self) -> dict:
+        """Reports how busy each scanner was, occupancies well below 1 mean sweeps are not spread evenly
+
+        Returns:
+            dict: stats[name] = {scans, busy (s), occupancy}
+        """
+
+        elapsed = time.perf_counter() - self.start
+        return {
+            group.name: {
+                "scans": group.scans,
+                "busy": group.busy,
+                "occupancy": group.busy / elapsed if elapsed > 0 else 0.0,
+            }
+            for group in self.groups
+        }
@@ -0,0 +1,183 @@
+import time
+import asyncio
+from collections import deque
+from threading import Lock
+
+
+class SettleDetector:
+    """Waits for a reading to settle instead of sleeping a fixed time
+
+    A reading has settled once `samples` consecutive readings agree within the tolerance, and with the
+    setpoint when one is given. Polling starts after a minimum dwell so readings taken before the
+    instrument reacted to a write are not counted. The maximum time is kept as a safety cap, so the
+    worst case is the same as the old fixed sleep.
+    """
+
+    def __init__(
+        self,
+        tolerance: float,
+        samples: int = 2,
+        max_time: float = 1.0,
+        relative: bool = False,
+        poll_interval: float = 0.0,
+        history: int = 1000,
+        min_time: float = 0.0,
+    ) -> None:
+        """Initializes the settle detector
+
+        Args:
+            tolerance (float): allowed difference between consecutive readings (abs units, or fraction if relative)
+            samples (int): number of consecutive readings that must agree
+            max_time (float): maximum time to wait (s)
+            relative (bool): compare readings relative to their magnitude
+            poll_interval (float): time between readings (s), 0 reads back to back
+            history (int): number of settle times to keep
+            min_time (float): minimum dwell before the first reading (s)
+        """
+
+        self.tolerance = tolerance
+        self.samples = max(int(samples), 2)
+        self.max_time = max_time
+        self.relative = relative
+        self.poll_interval = poll_interval
+        self.min_time = min(min_time, max_time)
+
+        # History of (name, settle time (s), settled) so we can see what the transitions actually take
+        self.lock = Lock()
+        self.history = deque(maxlen=history)
+
+    def _agree(self, a: float, b: float) -> bool:
+        """Checks if two readings agree within tolerance"""
+
+        if self.relative:
+            return abs(a - b) <= self.tolerance * max(abs(a), abs(b), 1e-12)
+        return abs(a - b) <= self.tolerance
+
+    def _on_target(self, reading: float, target: float) -> bool:
+        """Checks if a reading is at the setpoint, always True without a setpoint"""
+
+        return target is None or self._agree(reading, target)
+
+    def _step(self, reading: float, last: float, agreeing: int, target: float) -> tuple:
+        """Counts a new reading towards the settle
+
+        Args:
+            reading (float): new reading
+            last (float): previous reading, None for the first
+            agreeing (int): number of consecutive agreeing readings before this one
+            target (float): setpoint the readings must be within tolerance of, None for no setpoint
+
+        Returns:
+            int: number of consecutive agreeing readings
+            bool: True if the reading has settled
+        """
+
+        if not self._on_target(reading, target):
+            agreeing = 0
+        elif last is not None and self._agree(reading, last):
+            agreeing += 1
+        else:
+            agreeing = 1
+        return agreeing, agreeing >= self.samples
+
+    def _timed_out(self, start: float) -> bool:
+        """Checks if max_time has passed since start"""
+
+        return time.perf_counter() - start >= self.max_time
+
+    def _remaining(self, start: float, settled: bool) -> float:
+        """Gets the time left to wait so a reading that never settled waits at least the full cap (s)"""
+
+        if settled:
+            return 0.0
+        return max(self.max_time - (time.perf_counter() - start), 0.0)
+
+    def _finish(self, start: float, settled: bool, name: str) -> float:
+        """Records a settle in the history
+
+        Returns:
+            float: time waited (s)
+        """
+
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.history.append((name, elapsed, settled))
+        return elapsed
+
+    def wait(self, read, name: str = "settle", target: float = None) -> float:
+        """Polls read() until consecutive readings agree or max_time passes
+
+        Args:
+            read (function): returns a float reading, should be fast
+            name (str): label for the transition in the history
+            target (float, optional): setpoint the readings must be within tolerance of. Defaults to None.
+
+        Returns:
+            float: time waited (s)
+        """
+
+        start = time.perf_counter()
+        if self.min_time:
+            time.sleep(self.min_time)
+
+        last, agreeing, settled = None, 0, False
+        while True:
+            reading = read()
+            agreeing, settled = self._step(reading, last, agreeing, target)
+            last = reading
+            if settled or self._timed_out(start):
+                break
+            if self.poll_interval:
+                time.sleep(self.poll_interval)
+
+        time.sleep(self._remaining(start, settled))
+        return self._finish(start, settled, name)
+
+    async def wait_async(self, read, name: str = "settle", target: float = None) -> float:
+        """Awaits read() until consecutive readings agree or max_time passes, sleeping on the event loop
+
+        Args:
+            read (function): coroutine function returning a float reading, should be fast
+            name (str): label for the transition in the history
+            target (float, optional): setpoint the readings must be within tolerance of. Defaults to None.
+
+        Returns:
+            float: time waited (s)
+        """
+
+        start = time.perf_counter()
+        if self.min_time:
+            await asyncio.sleep(self.min_time)
+
+        last, agreeing, settled = None, 0, False
+        while True:
+            reading = await read()
+            agreeing, settled = self._step(reading, last, agreeing, target)
+            last = reading
+            if settled or self._timed_out(start):
+                break
+            if self.poll_interval:
+                await asyncio.sleep(self.poll_interval)
+
+        await asyncio.sleep(self._remaining(start, settled))
+        return self._finish(start, settled, name)
+
+    def stats(self) -> dict:
+        """Summarizes observed settle times
+
+        Returns:
+            dict: stats[name] = {"count", "mean", "max", "timeouts"} with times in seconds
+        """
+
+        stats = {}
+        with self.lock:
+            history = list(self.history)
+        for name, elapsed, settled in history:
+            s = stats.setdefault(name, {"count": 0, "mean": 0.0, "max": 0.0, "timeouts": 0})
+            s["count"] += 1
+            s["mean"] += elapsed
+            s["max"] = max(s["max"], elapsed)
+            s["timeouts"] += 0 if settled else 1
+        for s in stats.values():
+            s["mean"] /= s["count"]
+        return stats
@@ -1,21 +1,31 @@
-import pyvisa
+import asyncio
 import numpy as np
-import matplotlib as mpl
 from threading import Lock
 
+from parasol.hardware.settle import SettleDetector
+from parasol.hardware.aio import InstrumentIO, hold, run_sync
+from parasol.hardware.gpib import open_resource
+
 from parasol.configuration.configuration import Configuration
 config = Configuration()
 constants = config.get_config()['yokogawa']
 
-mpl.rcParams.update(mpl.rcParamsDefault)
-
 class Yokogawa:
     """Yokowaga package for PARASOL"""
 
-    def __init__(self) -> None:
-        """Initliazes the class for Yokogawa GS610"""
+    def __init__(self, address: str = None, name: str = "yokogawa") -> None:
+        """Initliazes the class for Yokogawa GS610
+
+        Args:
+            address (str, optional): GPIB address, the configured address if None. Pooled scanners each have their own
+            name (str, optional): instrument name for the I/O thread and bus statistics
+        """
 
         self.lock = Lock()
+        self.name = name
+
+        # Bus transactions run on their own thread for the async API
+        self.io = InstrumentIO(name)
 
         # Load constants
         self.source_delay = constants["source_delay"]
@@ -23,26 +33,27 @@ class Yokogawa:
         self.int_time = constants["integration_time"]
         self.max_voltage = constants["max_voltage"]
         self.max_current = constants["max_current"]
-        self.yoko_address = constants["address"]
+        self.yoko_address = constants["address"] if address is None else address
 
         # Connect
         self.connect()
 
         # Set up to source V and measure I
         self._sourcing_current = False
-        self.srcV_measI()
+        with self.yoko.batch():
+            self.srcV_measI()
 
     def connect(self) -> None:
         """Connects to the yokogawa"""
 
-        # Connect to the yokogawa using pyvisa (GPIB)
-        rm = pyvisa.ResourceManager()
-        self.yoko = rm.open_resource(self.yoko_address)
+        # Connect to the yokogawa using pyvisa (GPIB), sharing the bus with the other instruments on the board
+        self.yoko = open_resource(self.yoko_address, self.name, constants["bus_priority"])
         self.yoko.timeout = constants["timeout"]
-        self.yoko.write("*RST")  # Reset factory
-        self.yoko.write("*CLS")  # Clear errors 
-        self.yoko.write(":SENS:RSEN 1") # Set 4 terminal
-        self.yoko.write(":TRIG:SOUR EXT")  # Trigger source external trigger
+        with self.yoko.batch():
+            self.yoko.write("*RST")  # Reset factory
+            self.yoko.write("*CLS")  # Clear errors 
+            self.yoko.write(":SENS:RSEN 1") # Set 4 terminal
+            self.yoko.write(":TRIG:SOUR EXT")  # Trigger source external trigger
 
     def disconnect(self):
         """Disconnects from the yokogawa"""
@@ -109,14 +120,16 @@ class Yokogawa:
     def output_on(self) -> None:
         """Turn output on"""
 
-        self.yoko.write(":OUTP:STAT ON")
-        self.yoko.write(":SENS:STAT ON")
+        with self.yoko.batch():
+            self.yoko.write(":OUTP:STAT ON")
+            self.yoko.write(":SENS:STAT ON")
 
     def output_off(self) -> None:
         """Turn output off"""
 
-        self.yoko.write(":OUTP:STAT OFF")
-        self.yoko.write(":SENS:STAT OFF")
+        with self.yoko.batch():
+            self.yoko.write(":OUTP:STAT OFF")
+            self.yoko.write(":SENS:STAT OFF")
 
     def _trig_read(self) -> str:
         """Reads the last output
@@ -168,8 +181,9 @@ class Yokogawa:
         Returns:
             float: voltage (V) reading
         """
-        self.yoko.write(":SENS:FUNC VOLT")
-        return (float(self._trig_read()))
+        with self.yoko.batch():
+            self.yoko.write(":SENS:FUNC VOLT")
+            return (float(self._trig_read()))
 
     def measure_current(self) -> float:
         """Measures the current (A) reading
@@ -177,8 +191,47 @@ class Yokogawa:
         Returns:
             float: current (A) reading
         """
-        self.yoko.write(":SENS:FUNC CURR")
-        return (float(self._trig_read()))
+        with self.yoko.batch():
+            self.yoko.write(":SENS:FUNC CURR")
+            return (float(self._trig_read()))
+
+
+    def _set_V_measure_I(self, voltage: float) -> float:
+        """Sets voltage and measures current without locking, one I/O thread call per sweep point
+
+        Args:
+            voltage (float): voltage (V)
+
+        Returns:
+            float: voltage (V) reading
+            float: current (A) reading
+        """
+
+        # set voltage, measure current and voltage in one turn on the bus
+        with self.yoko.batch():
+            self.set_voltage(voltage)
+            curr = self.measure_current()
+            volt = self.measure_voltage()
+
+        return volt, curr
+
+
+    async def set_V_measure_I_async(self, voltage: float, lock = True) -> float:
+        """Sets voltage and measures current from a coroutine
+
+        Args:
+            voltage (float): voltage (V)
+            lock (boolean = True): option to lock instrument while command is running
+
+        Returns:
+            float: voltage (V) reading
+            float: current (A) reading
+        """
+
+        if lock:
+            async with hold(self.lock):
+                return await self.io.call(self._set_V_measure_I, voltage)
+        return await self.io.call(self._set_V_measure_I, voltage)
 
 
     def set_V_measure_I(self, voltage: float, lock = True) -> float:
@@ -192,19 +245,12 @@ class Yokogawa:
             float: voltage (V) reading
             float: current (A) reading 
         """
+
+        # Single readings block directly, run_sync would build an event loop per reading
         if lock:
             with self.lock:
-                # set voltage, measure current and voltage
-                self.set_voltage(voltage)
-                curr = self.measure_current()
-                volt = self.measure_voltage()
-        else:
-            # set voltage, measure current and voltage
-            self.set_voltage(voltage)
-            curr = self.measure_current()
-            volt = self.measure_voltage()
-
-        return volt, curr
+                return self._set_V_measure_I(voltage)
+        return self._set_V_measure_I(voltage)
 
 
     def set_I_measure_V(self, current: float, lock = True) -> float:
@@ -260,6 +306,57 @@ class Yokogawa:
         return i
     
 
+    def wait_for_settle(self, detector: SettleDetector, name: str = "relay") -> float:
+        """Turns scanner on, polls voc until it settles (e.g. after switching relays), turns scanner off
+
+        Args:
+            detector (SettleDetector): detector with tolerance and maximum wait
+            name (str): label for the transition in the detector history
+
+        Returns:
+            float: time waited (s)
+        """
+
+        with self.lock:
+            self.output_on()
+            elapsed = detector.wait(lambda: self.voc(lock = False), name)
+            self.output_off()
+
+        return elapsed
+
+
+    def spot_check(self, detector: SettleDetector = None, name: str = "probe") -> tuple:
+        """Turns scanner on, waits for voc to settle, measures voc and isc, turns scanner off
+
+        One output cycle for the whole check, the last settle reading is used as voc.
+
+        Args:
+            detector (SettleDetector, optional): detector with tolerance and maximum wait, no wait if None
+            name (str): label for the transition in the detector history
+
+        Returns:
+            float: open circuit voltage (V)
+            float: short circuit current (A)
+            float: time waited for the settle (s)
+        """
+
+        readings = []
+        def read():
+            readings.append(self.voc(lock = False))
+            return readings[-1]
+
+        with self.lock:
+            self.output_on()
+            try:
+                elapsed = detector.wait(read, name) if detector is not None else 0.0
+                voc = readings[-1] if readings else self.voc(lock = False)
+                isc = self.isc(lock = False)
+            finally:
+                self.output_off()
+
+        return voc, isc, elapsed
+
+
     def check_orientation(self) -> float:
         """
         Turns scanner on, checks isc, turns scanner off
@@ -273,8 +370,14 @@ class Yokogawa:
         return isc
     
 
-    def iv_sweep(self, vstart: float, vend: float, steps: int) -> np.ndarray:
-        """Runs a single IV sweep and returns the data
+    async def _output_off_async(self) -> None:
+        """Turns output off from a coroutine, still runs if the coroutine is cancelled meanwhile"""
+
+        await asyncio.shield(self.io.call(self.output_off))
+
+
+    async def iv_sweep_async(self, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs a single IV sweep and returns the data, cancelling stops the sweep after the current point
 
         Args:
             vstart (float): FWD sweep start voltage (V)
@@ -286,7 +389,7 @@ class Yokogawa:
             np.ndarray: voltage measured (V) array
             np.ndarray: current (A) array
         """
-        with self.lock:
+        async with hold(self.lock):
             
             # Make empty numpy arrays for data
             v = np.linspace(vstart, vend, steps)
@@ -294,10 +397,12 @@ class Yokogawa:
             vm = np.zeros(v.shape)
 
             # Turn on output, set voltage, measure current, turn off output
-            self.output_on()
-            for idx, v_point in enumerate(v):
-                vm[idx],i[idx] = self.set_V_measure_I(v_point, lock = False)
-            self.output_off()
+            await self.io.call(self.output_on)
+            try:
+                for idx, v_point in enumerate(v):
+                    vm[idx],i[idx] = await self.io.call(self._set_V_measure_I, v_point)
+            finally:
+                await self._output_off_async()
 
             # Flip reverse scan order so that it aligns with voltage
             if abs(vstart) > abs(vend):
@@ -307,8 +412,26 @@ class Yokogawa:
         return v, vm, i
 
 
-    def iv_sweep_quadrant_fwd_rev(self, vstart: float, vend: float, steps: int) -> np.ndarray:
-        """Runs FWD and then REV IV sweep in the power producing quadrant and returns the data
+    def iv_sweep(self, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs a single IV sweep and returns the data
+
+        Args:
+            vstart (float): FWD sweep start voltage (V)
+            vend (float): FWD sweep end voltage (V)
+            steps (float): number of voltage steps in the sweep
+
+        Returns:
+            np.ndarray: voltage applied (V) array
+            np.ndarray: voltage measured (V) array
+            np.ndarray: current (A) array
+        """
+
+        return run_sync(self.iv_sweep_async(vstart, vend, steps))
+
+
+    async def iv_sweep_quadrant_fwd_rev_async(self, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs FWD and then REV IV sweep in the power producing quadrant and returns the data, cancelling
+        stops the sweep after the current point
 
         Args:
             vstart (float): FWD sweep start voltage (V)
@@ -323,7 +446,7 @@ class Yokogawa:
             np.ndarray: REV current measured (A) array
         """
 
-        with self.lock:
+        async with hold(self.lock):
             # Make empty numpy arrays for data
             v = np.linspace(vstart, vend, steps)
             vm_fwd = np.zeros(v.shape)
@@ -336,36 +459,59 @@ class Yokogawa:
             i_rev[:] = np.nan
 
             # Turn on output
-            self.output_on()
+            await self.io.call(self.output_on)
+
+            try:
+                # Find point before 1st point in quadrant
+                index = 0
+                for v_point in v:
+                    if v_point >= 0:
+                        break
+                    index += 1
+                index -= 1
+                start_index = index
 
-            # Find point before 1st point in quadrant
-            index = 0
-            for v_point in v:
-                if v_point >= 0:
-                    break
-                index += 1
-            index -= 1
-            start_index = index
+                # Cycle from there until we get out of the quadrant
+                while index <= len(v):
+                    vm_fwd[index], i_fwd[index] = await self.io.call(self._set_V_measure_I, v[index])
+                    if i_fwd[index] > 0:
+                        break
+                    index += 1
 
-            # Cycle from there until we get out of the quadrant
-            while index <= len(v):
-                vm_fwd[index], i_fwd[index] = self.set_V_measure_I(v[index], lock = False)
-                if i_fwd[index] > 0:
-                    break
-                index += 1
+                # Scan backwards until we get back to starting point
+                while index >= start_index:
+                    vm_rev[index], i_rev[index] = await self.io.call(self._set_V_measure_I, v[index])
+                    index -= 1
 
-            # Scan backwards until we get back to starting point
-            while index >= start_index:
-                vm_rev[index], i_rev[index] = self.set_V_measure_I(v[index], lock = False)
-                index -= 1
-
-            # Turn output off
-            self.output_off()
+            finally:
+                # Turn output off
+                await self._output_off_async()
 
         return v, vm_fwd, i_fwd, vm_rev, i_rev
 
-    def iv_sweep_quadrant_rev_fwd(self, vstart: float, vend: float, steps: int) -> np.ndarray:
-        """Runs REV and then FWD IV sweep in the power producing quadrant and returns the data
+
+    def iv_sweep_quadrant_fwd_rev(self, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs FWD and then REV IV sweep in the power producing quadrant and returns the data
+
+        Args:
+            vstart (float): FWD sweep start voltage (V)
+            vend (float): FWD sweep end voltage (V)
+            steps (float): number of voltage steps in the sweep
+
+        Returns:
+            np.ndarray: voltage applied (V) array
+            np.ndarray: FWD voltage measured (V) array
+            np.ndarray: FWD current measured (A) array
+            np.ndarray: REV voltage measured (V) array
+            np.ndarray: REV current measured (A) array
+        """
+
+        return run_sync(self.iv_sweep_quadrant_fwd_rev_async(vstart, vend, steps))
+
+
+    async def iv_sweep_quadrant_rev_fwd_async(self, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs REV and then FWD IV sweep in the power producing quadrant and returns the data, cancelling
+        stops the sweep after the current point
 
         Args:
             vstart (float): FWD sweep start voltage (V)
@@ -380,7 +526,7 @@ class Yokogawa:
             np.ndarray: REV current measured (A) array
         """
         
-        with self.lock:
+        async with hold(self.lock):
         
             # Make empty numpy arrays for data
             v = np.linspace(vstart, vend, steps)
@@ -394,7 +540,7 @@ class Yokogawa:
             i_rev[:] = np.nan
 
             # Find point after voc
-            voc = self.voc(lock = False)
+            voc = await self.io.call(self.voc, False)
             end_index = np.where(np.diff(np.signbit(v - voc)))[0]
             if (v[end_index] - voc) < 0:
                 end_index += 1
@@ -409,21 +555,42 @@ class Yokogawa:
             start_index = index
 
             # Turn on output
-            self.output_on()
+            await self.io.call(self.output_on)
 
-            # Scan rev until we get back to starting point
-            index = end_index
-            while index >= start_index:
-                vm_rev[index], i_rev[index] = self.set_V_measure_I(v[index], lock = False)
-                index -= 1
+            try:
+                # Scan rev until we get back to starting point
+                index = end_index
+                while index >= start_index:
+                    vm_rev[index], i_rev[index] = await self.io.call(self._set_V_measure_I, v[index])
+                    index -= 1
 
-            # Cycle from there until we get out of the quadrant
-            index = start_index
-            while index <= end_index:
-                vm_fwd[index], i_fwd[index] = self.set_V_measure_I(v[index], lock = False)
-                index += 1
+                # Cycle from there until we get out of the quadrant
+                index = start_index
+                while index <= end_index:
+                    vm_fwd[index], i_fwd[index] = await self.io.call(self._set_V_measure_I, v[index])
+                    index += 1
 
-            # Turn output off
-            self.output_off()
+            finally:
+                # Turn output off
+                await self._output_off_async()
 
         return v, vm_fwd, i_fwd, vm_rev, i_rev
+
+
+    def iv_sweep_quadrant_rev_fwd(self, vstart: float, vend: float, steps: int) -> np.ndarray:
+        """Runs REV and then FWD IV sweep in the power producing quadrant and returns the data
+
+        Args:
+            vstart (float): FWD sweep start voltage (V)
+            vend (float): FWD sweep end voltage (V)
+            steps (float): number of voltage steps in the sweep
+
+        Returns:
+            np.ndarray: voltage applied (V) array
+            np.ndarray: FWD voltage measured (V) array
+            np.ndarray: FWD current measured (A) array
+            np.ndarray: REV voltage measured (V) array
+            np.ndarray: REV current measured (A) array
+        """
+
+        return run_sync(self.iv_sweep_quadrant_rev_fwd_async(vstart, vend, steps))
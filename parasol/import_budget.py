@@ -0,0 +1,113 @@
+import argparse
+import subprocess
+import sys
+
+# Startup budget for each entry point: IMPORT_BUDGETS[module] = max import time (s)
+# Budgets leave room for slower lab PCs, an entry point over budget usually means a heavy import crept back in
+IMPORT_BUDGETS = {
+    "parasol.controller": 1.0,
+    "parasol.ui.LAUNCH_UI": 1.5,
+    "parasol.ui.RUN_UI": 2.5,
+}
+
+# Modules that should only be loaded at first use, importing them at startup fails the check
+LAZY_MODULES = ["pandas", "matplotlib", "pyvisa", "u6", "parasol.analysis.analysis", "parasol.hardware.yokogawa"]
+
+
+def profile_import(module: str) -> dict:
+    """Imports a module in a fresh interpreter with -X importtime and parses the report
+
+    Args:
+        module (str): module to import
+
+    Returns:
+        dict: total (s), entries (list of (cumulative (s), self (s), module) sorted slowest first),
+            loaded (list of LAZY_MODULES that were imported), error (str, None if import succeeded)
+    """
+
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+
+    # Lines look like "import time:  self [us] | cumulative | imported package", nesting is shown by indentation
+    entries = []
+    total = 0.0
+    error_lines = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            error_lines.append(line)
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        self_time = int(fields[0]) / 1e6
+        cumulative = int(fields[1]) / 1e6
+        name = fields[2].rstrip()
+        entries.append((cumulative, self_time, name.strip()))
+
+        # Top level imports are not indented past the separator space
+        if not name[1:].startswith(" "):
+            total += cumulative
+
+    entries.sort(reverse=True)
+    loaded = [m for m in result.stdout.strip().split(",") if m] if result.returncode == 0 else []
+    error = "\n".join(error_lines).strip() if result.returncode != 0 else None
+
+    return {"total": total, "entries": entries, "loaded": loaded, "error": error}
+
+
+def check_budgets(budgets: dict = None, top: int = 10, verbose: bool = True) -> bool:
+    """Profiles every entry point and compares against its budget
+
+    Args:
+        budgets (dict): budgets[module] = max import time (s), defaults to IMPORT_BUDGETS
+        top (int): number of slowest imports to print per entry point
+        verbose (bool): print the report
+
+    Returns:
+        bool: True if all entry points imported within budget without loading lazy modules
+    """
+
+    if budgets is None:
+        budgets = IMPORT_BUDGETS
+
+    ok = True
+    for module, budget in budgets.items():
+        result = profile_import(module)
+
+        if result["error"] is not None:
+            status = "ERROR"
+        elif result["loaded"] or result["total"] > budget:
+            status = "FAIL"
+        else:
+            status = "OK"
+        ok = ok and status == "OK"
+
+        if not verbose:
+            continue
+        print(f"{module:<28}{result['total']:>8.3f} s  (budget {budget:.2f} s)  {status}")
+        if result["error"] is not None:
+            print(f"    {result['error'].splitlines()[-1]}")
+            continue
+        if result["loaded"]:
+            print(f"    loaded at startup: {', '.join(result['loaded'])}")
+        for cumulative, self_time, name in result["entries"][:top]:
+            print(f"    {cumulative:>8.3f} s cumulative {self_time:>8.3f} s self  {name}")
+
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report import times of PARASOL entry points and check startup budgets")
+    parser.add_argument("modules", nargs="*", default=None, help="entry points to check (default all budgeted)")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to show")
+    parser.add_argument("--budget", type=float, default=None, help="budget (s) for modules given on the command line")
+    args = parser.parse_args()
+
+    budgets = IMPORT_BUDGETS
+    if args.modules:
+        budgets = {m: args.budget if args.budget is not None else IMPORT_BUDGETS.get(m, 1.0) for m in args.modules}
+
+    sys.exit(0 if check_budgets(budgets, args.top) else 1)
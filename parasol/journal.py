@@ -0,0 +1,156 @@
+import os
+import json
+import time
+from threading import Lock
+
+
+class Journal:
+    """Append only journal of string configuration and tracker state
+
+    Each line is one JSON record:
+        {"type": "load", "id", "t", "config", "savedir", "name"} when a string is loaded
+        {"type": "state", "id", "t", "scan_count", "vmpp", ...} after every JV/MPP step
+        {"type": "unload", "id", "t"} when a string is unloaded
+    Only the latest load/state record of each string matters, so once the file grows past max_records it is
+    rewritten with just those. A torn last line (crash mid write) is ignored when reading.
+    """
+
+    def __init__(self, path: str, max_records: int = 10000, sync: bool = True) -> None:
+        """Opens the journal
+
+        Args:
+            path (str): path to journal file
+            max_records (int): number of records before the journal is compacted
+            sync (bool): fsync after every record so it survives a power cut
+        """
+
+        self.path = path
+        self.max_records = max_records
+        self.sync = sync
+        self.lock = Lock()
+
+        # latest[id] = {"load": record, "state": record} for loaded strings
+        self.latest = self._read()
+        self.num_records = 0
+
+        # Start from a compact journal
+        if os.path.exists(self.path):
+            with self.lock:
+                self._compact()
+
+    def _read(self) -> dict:
+        """Reads the journal, keeping the latest records of strings that were not unloaded
+
+        Returns:
+            dict: latest[id] = {"load": record, "state": record}
+        """
+
+        latest = {}
+        if not os.path.exists(self.path):
+            return latest
+
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                id = record["id"]
+                if record["type"] == "load":
+                    latest[id] = {"load": record}
+                elif record["type"] == "state" and id in latest:
+                    latest[id]["state"] = record
+                elif record["type"] == "unload":
+                    latest.pop(id, None)
+
+        return latest
+
+    def _append(self, record: dict) -> None:
+        """Appends a record, compacting the journal when it gets long. Call with the lock held"""
+
+        if self.num_records >= self.max_records:
+            self._compact()
+
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record, default=float) + "\n")
+            f.flush()
+            if self.sync:
+                os.fsync(f.fileno())
+        self.num_records += 1
+
+    def _compact(self) -> None:
+        """Rewrites the journal with only the latest records, replacing it in one step"""
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for records in self.latest.values():
+                for key in ["load", "state"]:
+                    if key in records:
+                        f.write(json.dumps(records[key], default=float) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.num_records = sum(len(records) for records in self.latest.values())
+
+    def load(self, id: int, config: dict, savedir: str, name: str) -> None:
+        """Records a loaded string
+
+        Args:
+            id (int): string number
+            config (dict): arguments of Controller.load_string
+            savedir (str): path to test folder
+            name (str): test name
+        """
+
+        record = {"type": "load", "id": id, "t": time.time(), "config": config, "savedir": savedir, "name": name}
+        with self.lock:
+            self.latest[id] = {"load": record}
+            self._append(record)
+
+    def checkpoint(self, id: int, d: dict) -> None:
+        """Records the scan count and MPP tracking state of a string
+
+        Args:
+            id (int): string number
+            d (dict): string dictionary (defined in controller.py)
+        """
+
+        tracker = d["mpp"].get("_tracker")
+        record = {
+            "type": "state",
+            "id": id,
+            "t": time.time(),
+            "scan_count": d["jv"]["scan_count"],
+            "vmpp": d["mpp"]["vmpp"],
+            "last_voltages": d["mpp"]["last_voltages"],
+            "last_currents": d["mpp"]["last_currents"],
+            "last_powers": d["mpp"]["last_powers"],
+            "tracker": None if tracker is None else tracker.name,
+            "tracker_state": None if tracker is None else tracker.get_state(),
+            "tracker_seed": d["mpp"].get("_tracker_seed"),
+        }
+        with self.lock:
+            if id in self.latest:
+                self.latest[id]["state"] = record
+            self._append(record)
+
+    def unload(self, id: int) -> None:
+        """Records an unloaded string
+
+        Args:
+            id (int): string number
+        """
+
+        with self.lock:
+            self.latest.pop(id, None)
+            self._append({"type": "unload", "id": id, "t": time.time()})
+
+    def get_strings(self) -> dict:
+        """Returns the strings that were loaded when the journal was last written
+
+        Returns:
+            dict: strings[id] = (load record, state record or None)
+        """
+
+        with self.lock:
+            return {id: (records["load"], records.get("state")) for id, records in self.latest.items()}
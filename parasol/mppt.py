@@ -0,0 +1,421 @@
+import abc
+import time
+import numpy as np
+
+from parasol.configuration.configuration import Configuration
+config = Configuration()
+constants = config.get_config()['characterization']
+
+
+# Registry of available trackers: dict[name] = tracker class
+TRACKERS = {}
+
+
+def register_tracker(name: str):
+    """Registers a tracker class under a given name so it can be built by make_tracker
+
+    Args:
+        name (str): name to register the tracker under
+    """
+
+    def inner(cls):
+        cls.name = name
+        TRACKERS[name] = cls
+        return cls
+
+    return inner
+
+
+def make_tracker(name: str, **kwargs) -> object:
+    """Creates a tracker from the registry
+
+    Args:
+        name (str): registered name of the tracker
+        **kwargs: options passed to the tracker
+
+    Raises:
+        ValueError: tracker name not registered
+
+    Returns:
+        object: tracker instance
+    """
+
+    if name not in TRACKERS:
+        raise ValueError(f"{name} is not a registered tracker! Options are {list(TRACKERS.keys())}")
+    return TRACKERS[name](**kwargs)
+
+
+class Tracker(abc.ABC):
+    """Base class for MPP trackers
+
+    A tracker is handed a measure(v) function that applies a voltage and returns (voltage measured, current).
+    On each wakeup it may take up to max_substeps measurements, returning every point it took so that
+    the caller can hold the load at the last point until the next wakeup.
+    """
+
+    name = None
+
+    def __init__(
+        self,
+        voltage_step: float = None,
+        min_voltage_step: float = None,
+        max_voltage_step: float = None,
+        max_substeps: int = None,
+    ) -> None:
+        """Initializes the tracker
+
+        Args:
+            voltage_step (float): nominal voltage step (V)
+            min_voltage_step (float): minimum voltage step (V)
+            max_voltage_step (float): maximum voltage step (V)
+            max_substeps (int): maximum number of measurements per wakeup
+        """
+
+        # Fall back on hardwareconstants when options are not given
+        self.voltage_step = constants["mppt_voltage_step"] if voltage_step is None else voltage_step
+        self.min_voltage_step = constants["mppt_min_voltage_step"] if min_voltage_step is None else min_voltage_step
+        self.max_voltage_step = constants["mppt_max_voltage_step"] if max_voltage_step is None else max_voltage_step
+        self.max_substeps = constants["mppt_max_substeps"] if max_substeps is None else max_substeps
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears tracker history"""
+
+        self.last_v = None
+        self.last_p = None
+        self.last_i = None
+        self.vmpp_seed = None
+        self.voc_seed = None
+
+    def seed(self, vmpp: float, voc: float) -> None:
+        """Seeds the tracker from a JV curve
+
+        Args:
+            vmpp (float): maximum power point voltage from JV (V)
+            voc (float): open circuit voltage from JV (V)
+        """
+
+        self.vmpp_seed = vmpp
+        self.voc_seed = voc
+
+    def get_state(self) -> dict:
+        """Returns the tracker history and seeds so the tracker can be restored after a restart
+
+        Returns:
+            dict: state[attribute] = value, settings (steps, substeps) are left out as they come from config
+        """
+
+        settings = ["voltage_step", "min_voltage_step", "max_voltage_step", "max_substeps"]
+        return {
+            k: (float(v) if isinstance(v, float) else v)
+            for k, v in vars(self).items()
+            if k not in settings and isinstance(v, (int, float, bool, type(None)))
+        }
+
+    def set_state(self, state: dict) -> None:
+        """Restores tracker history and seeds saved with get_state
+
+        Args:
+            state (dict): state[attribute] = value
+        """
+
+        for k, v in state.items():
+            setattr(self, k, v)
+
+    @abc.abstractmethod
+    def track(self, measure, v_start: float, vmin: float, vmax: float) -> list:
+        """Runs one wakeup of the tracker
+
+        Args:
+            measure (function): measure(v) applies voltage v and returns (voltage measured, current)
+            v_start (float): voltage to start from (V)
+            vmin (float): minimum allowed voltage (V)
+            vmax (float): maximum allowed voltage (V)
+
+        Returns:
+            list[tuple]: (time (epoch), voltage applied (V), voltage measured (V), current (A)) for each point taken
+        """
+
+    # Helpers shared by trackers
+
+    def _clip(self, v: float, vmin: float, vmax: float) -> float:
+        """Clips voltage to the allowed window (never below 0 V)"""
+
+        return float(min(max(v, max(vmin, 0)), vmax))
+
+    def _scaled_step(self, slope: float) -> float:
+        """Scales the voltage step by the normalized power slope (dP/dV * V/P), 0 at the MPP and ~1 near Jsc
+
+        Args:
+            slope (float): normalized power slope
+
+        Returns:
+            float: voltage step (V) between min_voltage_step and max_voltage_step
+        """
+
+        step = self.max_voltage_step * min(abs(slope), 1)
+        return float(max(step, self.min_voltage_step))
+
+    def _measure(self, measure, v: float, points: list) -> tuple:
+        """Measures at v, stores result in points and history
+
+        Returns:
+            float: voltage measured (V)
+            float: current (A)
+            float: power (W)
+        """
+
+        t = time.time()
+        vm, i = measure(v)
+        p = ((v + vm) / 2) * i
+        points.append((t, v, vm, i))
+        return vm, i, p
+
+
+@register_tracker("perturb_observe")
+class PerturbObserve(Tracker):
+    """Constant step perturb and observe, one step per wakeup (baseline)"""
+
+    def reset(self) -> None:
+        super().reset()
+        self.direction = 1
+
+    def track(self, measure, v_start, vmin, vmax):
+        points = []
+        v = v_start if self.last_v is None else self.last_v + self.direction * self.voltage_step
+
+        # If we leave the window, turn around
+        if v <= max(vmin, 0) or v >= vmax:
+            self.direction *= -1
+            v = self._clip(v, vmin + self.voltage_step, vmax - self.voltage_step)
+
+        _, i, p = self._measure(measure, v, points)
+
+        # If power did not increase (or we are producing nothing), invert the direction
+        if self.last_p is not None and (p <= self.last_p or i <= 0):
+            self.direction *= -1
+
+        self.last_v, self.last_p, self.last_i = v, p, i
+        return points
+
+
+@register_tracker("fractional_voc")
+class FractionalVoc(Tracker):
+    """Bias at a fixed fraction of Voc taken from the last JV curve (baseline)"""
+
+    fraction = 0.75
+
+    def track(self, measure, v_start, vmin, vmax):
+        points = []
+        voc = self.voc_seed if self.voc_seed is not None else v_start / self.fraction
+        v = self._clip(self.fraction * voc, vmin, vmax)
+        _, i, p = self._measure(measure, v, points)
+        self.last_v, self.last_p, self.last_i = v, p, i
+        return points
+
+
+@register_tracker("adaptive_perturb_observe")
+class AdaptivePerturbObserve(Tracker):
+    """Perturb and observe with a step size scaled by |dP/dV|
+
+    Large steps are taken far from the MPP (e.g. after a cloud edge) and the step shrinks towards
+    min_voltage_step as the slope flattens. Sub-steps continue within a wakeup until the normalized slope
+    (V/P dP/dV) is within what the step and the current noise can resolve, or max_substeps is used.
+    """
+
+    slope_tolerance = 0.15 # normalized power slope counted as at the MPP
+    current_noise = 0.001 # relative current noise of the load (1 sigma)
+
+    def reset(self) -> None:
+        super().reset()
+        self.direction = 1
+        self.step = None
+
+    def track(self, measure, v_start, vmin, vmax):
+        points = []
+        if self.step is None:
+            self.step = self.voltage_step
+
+        # Re-measure the operating point so a change in light is not mistaken for a change from our step
+        v_prev = v_start if self.last_v is None else self.last_v
+        _, i_prev, p_prev = self._measure(measure, v_prev, points)
+
+        # Reference and final re-measure count towards max_substeps
+        for _ in range(max(self.max_substeps - 2, 0)):
+
+            # Take a step in the current direction, turning around at the edges of the window
+            v = self._clip(v_prev + self.direction * self.step, vmin, vmax)
+            if v == v_prev:
+                self.direction *= -1
+                v = self._clip(v_prev + self.direction * self.step, vmin, vmax)
+            _, i, p = self._measure(measure, v, points)
+
+            # Scale the next step by the slope of the power curve
+            dv = v - v_prev
+            slope = ((p - p_prev) / dv) * (v / p) if (dv != 0 and p != 0) else 1
+            self.direction = 1 if slope > 0 else -1
+            if i <= 0:
+                self.direction = -1
+            self.step = self._scaled_step(slope)
+
+            # Noise on two currents shows up in the slope scaled by V/dV
+            threshold = self.slope_tolerance + 2 * self.current_noise * abs(v / dv) if dv != 0 else 0
+            converged = i > 0 and abs(slope) <= threshold
+
+            # Keep the better point as our operating point, both points resolve the MPP once converged
+            # so stay at the last one and save a re-measure
+            if p < p_prev and not converged:
+                v, i, p = v_prev, i_prev, p_prev
+            v_prev, i_prev, p_prev = v, i, p
+
+            if converged:
+                break
+
+        # Leave the load at the best point found
+        if points[-1][1] != v_prev:
+            _, i_prev, p_prev = self._measure(measure, v_prev, points)
+
+        self.last_v, self.last_p, self.last_i = v_prev, p_prev, i_prev
+        return points
+
+
+@register_tracker("incremental_conductance")
+class IncrementalConductance(Tracker):
+    """Incremental conductance: at the MPP dI/dV = -I/V
+
+    The step size scales with the conductance error |dI/dV + I/V| so that the tracker moves quickly
+    when far from the MPP. The wakeup ends once the normalized error (V/I dI/dV + 1) is within what the
+    step and the current noise can resolve.
+    """
+
+    conductance_tolerance = 0.15 # normalized conductance error counted as at the MPP
+    current_noise = 0.001 # relative current noise of the load (1 sigma)
+
+    def reset(self) -> None:
+        super().reset()
+        self.direction = 1
+
+    def track(self, measure, v_start, vmin, vmax):
+        points = []
+
+        # Reference point at the current operating voltage
+        v_prev = v_start if self.last_v is None else self.last_v
+        _, i_prev, p_prev = self._measure(measure, v_prev, points)
+        step = self.voltage_step
+
+        # Reference and final re-measure count towards max_substeps
+        for _ in range(max(self.max_substeps - 2, 0)):
+
+            # Perturb in the current direction
+            v = self._clip(v_prev + self.direction * step, vmin, vmax)
+            if v == v_prev:
+                self.direction *= -1
+                v = self._clip(v_prev + self.direction * step, vmin, vmax)
+            _, i, p = self._measure(measure, v, points)
+
+            # Compare incremental conductance to instantaneous conductance, normalized by I/V
+            dv = v - v_prev
+            di = i - i_prev
+            error = (di / dv) * (v / i) + 1 if (dv != 0 and i != 0) else 1
+            self.direction = 1 if error > 0 else -1
+            if i <= 0:
+                self.direction = -1
+            step = self._scaled_step(error)
+
+            # Noise on two currents shows up in the error scaled by V/dV
+            threshold = self.conductance_tolerance + 2 * self.current_noise * abs(v / dv) if dv != 0 else 0
+            converged = i > 0 and abs(error) <= threshold
+
+            # Keep the better point as our operating point, both points resolve the MPP once converged
+            # so stay at the last one and save a re-measure
+            if p < p_prev and not converged:
+                v, i, p = v_prev, i_prev, p_prev
+            v_prev, i_prev, p_prev = v, i, p
+
+            if converged:
+                break
+
+        if points[-1][1] != v_prev:
+            _, i_prev, p_prev = self._measure(measure, v_prev, points)
+
+        self.last_v, self.last_p, self.last_i = v_prev, p_prev, i_prev
+        return points
+
+
+@register_tracker("golden_section")
+class GoldenSection(Tracker):
+    """Golden section search within a bracket seeded from the last JV curve
+
+    The bracket is centered on the JV Vmpp on the first wakeup and on the last tracked voltage afterwards.
+    It starts at a fraction of Voc, halves each wakeup the best point lands inside it and doubles again when
+    the best point lands near an edge (the MPP moved). The search stops once the power is flat across the
+    two interior points or the bracket is below min_voltage_step.
+    """
+
+    bracket_fraction = 0.15
+    flat_tolerance = 1e-3 # relative power difference counted as flat
+    ratio = (np.sqrt(5) - 1) / 2
+
+    def reset(self) -> None:
+        super().reset()
+        self.width = None
+        self.center = None
+
+    def seed(self, vmpp: float, voc: float) -> None:
+        super().seed(vmpp, voc)
+        self.width = None
+
+    def track(self, measure, v_start, vmin, vmax):
+        points = []
+
+        # Build bracket around the best estimate of Vmpp
+        center = self.center if self.center is not None else self.last_v
+        if center is None:
+            center = self.vmpp_seed if self.vmpp_seed is not None else v_start
+        voc = self.voc_seed if self.voc_seed is not None else vmax
+        full_width = max(self.bracket_fraction * voc, 2 * self.voltage_step)
+        width = full_width if self.width is None else self.width
+        a0 = a = self._clip(center - width, vmin, vmax)
+        b0 = b = self._clip(center + width, vmin, vmax)
+
+        # Two interior points, each iteration reuses one of them
+        c = b - self.ratio * (b - a)
+        e = a + self.ratio * (b - a)
+        _, _, pc = self._measure(measure, c, points)
+        _, _, pe = self._measure(measure, e, points)
+
+        def flat():
+            return abs(pc - pe) <= self.flat_tolerance * max(abs(pc), abs(pe))
+
+        while len(points) < self.max_substeps - 1 and (b - a) > self.min_voltage_step and not flat():
+            if pc > pe:
+                b, e, pe = e, c, pc
+                c = b - self.ratio * (b - a)
+                _, _, pc = self._measure(measure, c, points)
+            else:
+                a, c, pc = c, e, pe
+                e = a + self.ratio * (b - a)
+                _, _, pe = self._measure(measure, e, points)
+
+        # Leave the load at the best point found, no need to re-measure if we are already there
+        # When the power is flat both interior points resolve the MPP, so stay at the last one, as we do
+        # when the re-measure would go over max_substeps
+        v = c if pc > pe else e
+        self.center = v
+        if flat() or len(points) >= self.max_substeps:
+            v = points[-1][1]
+        if points[-1][1] != v:
+            _, i, p = self._measure(measure, v, points)
+        else:
+            _, _, vm, i = points[-1]
+            p = ((v + vm) / 2) * i
+
+        # Narrow the next bracket while the MPP stays inside, widen it when the best point sits near an edge
+        if min(self.center - a0, b0 - self.center) < 0.25 * (b0 - a0):
+            self.width = min(2 * width, full_width)
+        else:
+            self.width = max(width / 2, self.voltage_step)
+
+        self.last_v, self.last_p, self.last_i = v, p, i
+        return points
@@ -54,14 +54,20 @@ CMD_TOGGLE = 0x03
 CMD_LATCH = 0x04
 CMD_MOMENTARY = 0x05
 CMD_DELAY = 0x06
+CMD_ALL_ON = 0x07
+CMD_ALL_OFF = 0x08
 
 # R421B16 supports MODBUS control command and read status only
 FUNCTION_CONTROL_COMMAND = 0x06
 FUNCTION_READ_STATUS = 0x03
 
+# Write multiple registers, one control command per relay in a single frame
+FUNCTION_WRITE_MULTIPLE = 0x10
+
 # Fixed receive frame length
 RX_LEN_CONTROL_COMMAND = 8
 RX_LEN_READ_STATUS = 7
+RX_LEN_WRITE_MULTIPLE = 8
 
 
 class ModbusException(Exception):
@@ -150,13 +156,13 @@ class R421B16(object):
     # ----------------------------------------------------------------------------------------------
     # Relay board private functions
     # ----------------------------------------------------------------------------------------------
-    def _send_relay_command(self, relay, cmd, delay=0):
+    def relay_command_frame(self, relay, cmd, delay=0):
         """
-            Send relay control
+            Build relay control frame without sending it
         :param relay: Relay number
         :param cmd: Command
         :param delay: Optional delay
-        :return: List response (int)
+        :return: Tuple (List tx data (int) without CRC, receive length)
         """
 
         assert type(relay) == int
@@ -167,9 +173,6 @@ class R421B16(object):
         assert cmd >= 0 and cmd <= 255
         assert delay >= 0 and delay <= 255
 
-        if not self._modbus.is_open():
-            raise ModbusException('Error: Serial port not open')
-
         # Create binary control command
         tx_data = [
             self._address,              # Slave address of the relay board 0..63
@@ -178,19 +181,78 @@ class R421B16(object):
             cmd,                        # Command 0x01..0x06
             delay                       # Delay 0x00..0xFF
         ]
+        return tx_data, RX_LEN_CONTROL_COMMAND
 
-        # Send command
-        self._modbus.send(tx_data)
+    def multi_command_frame(self, cmds, first_relay=1):
+        """
+            Build write multiple registers frame without sending it
+        :param cmds: List commands (int), cmds[0] is sent to first_relay
+        :param first_relay: Relay number of first command
+        :return: Tuple (List tx data (int) without CRC, receive length)
+        """
 
-        # Wait for response with timeout
-        rx_frame = self._modbus.receive(RX_LEN_CONTROL_COMMAND)
+        assert type(cmds) == list
+        assert 1 <= first_relay and first_relay + len(cmds) - 1 <= self._num_relays
+
+        # Each register is [command, delay]
+        tx_data = [
+            self._address,              # Slave address of the relay board 0..63
+            FUNCTION_WRITE_MULTIPLE,    # Write multiple registers
+            0x00, first_relay,          # First relay
+            0x00, len(cmds),            # Number of registers
+            len(cmds) * 2,              # Number of data bytes
+        ]
+        for cmd in cmds:
+            assert 0 <= cmd <= 255
+            tx_data += [cmd, 0x00]
+        return tx_data, RX_LEN_WRITE_MULTIPLE
+
+    def set_multi_frame(self, relays_on):
+        """
+            Build frame setting every relay on the board without sending it
+        :param relays_on: List relays (int) to turn on, all others are turned off
+        :return: Tuple (List tx data (int) without CRC, receive length)
+        """
+        cmds = [CMD_ON if relay in relays_on else CMD_OFF for relay in range(1, self._num_relays + 1)]
+        return self.multi_command_frame(cmds)
+
+    def _send_frame(self, tx_data, rx_length):
+        """
+            Send a frame built by one of the frame functions and check the response length
+        :return: True if the board acknowledged the frame
+        """
+
+        if not self._modbus.is_open():
+            raise ModbusException('Error: Serial port not open')
+
+        # Send command and wait for response with timeout
+        rx_frame = self._modbus.transfer(tx_data, rx_length=rx_length)
 
         # Check response from relay
-        if not rx_frame or len(rx_frame) != RX_LEN_CONTROL_COMMAND:
+        if not rx_frame or len(rx_frame) != rx_length:
             return False
 
         return True
 
+    def _send_relay_command(self, relay, cmd, delay=0):
+        """
+            Send relay control
+        :param relay: Relay number
+        :param cmd: Command
+        :param delay: Optional delay
+        :return: List response (int)
+        """
+        return self._send_frame(*self.relay_command_frame(relay, cmd, delay))
+
+    def _send_multi_command(self, cmds, first_relay=1):
+        """
+            Send one control command per relay in a single write multiple registers frame
+        :param cmds: List commands (int), cmds[0] is sent to first_relay
+        :param first_relay: Relay number of first command
+        :return: True if the board acknowledged the frame
+        """
+        return self._send_frame(*self.multi_command_frame(cmds, first_relay))
+
     def _read_relay_status(self, relay):
         """
             Read relay status
@@ -374,9 +436,29 @@ class R421B16(object):
                 return False
         return True
 
+    def set_multi(self, relays_on):
+        """
+            Set the state of every relay on the board in one frame
+        :param relays_on: List relays (int) to turn on, all others are turned off
+        :return: True if the board acknowledged the frame
+        """
+        return self._send_frame(*self.set_multi_frame(relays_on))
+
     # ----------------------------------------------------------------------------------------------
     # Public functions to read/write all relays
     # ----------------------------------------------------------------------------------------------
+    def on_all_fast(self):
+        """
+            Turn all relays on with a single frame
+        """
+        return self._send_relay_command(0, CMD_ALL_ON)
+
+    def off_all_fast(self):
+        """
+            Turn all relays off with a single frame
+        """
+        return self._send_relay_command(0, CMD_ALL_OFF)
+
     def get_status_all(self):
         return self.get_status_multi(range(1, self._num_relays + 1))
 
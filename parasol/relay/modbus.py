@@ -28,6 +28,10 @@
 import sys
 import threading
 import time
+from collections import deque
+from functools import lru_cache
+
+from parasol.hardware import replay
 
 try:
     import serial
@@ -60,6 +64,18 @@ FRAME_DELAY = 0.025
 # Frame receive timeout
 FRAME_RX_TIMEOUT = 0.050
 
+# Bits per character on the wire: start + 8 data + stop
+BITS_PER_CHAR = 10
+
+# Above 19200 baud the MODBUS specification fixes the inter-frame silence at 1.75 ms
+MIN_FRAME_SILENCE = 0.00175
+
+# USB - RS485 dongles deliver received Bytes in bursts, FTDI latency timer defaults to 16 ms
+ADAPTER_LATENCY = 0.016
+
+# Number of transactions kept for latency statistics
+LATENCY_HISTORY = 1000
+
 # MODBUS CRC tables
 CRC_HI = [
     0x00, 0xC1, 0x81, 0x40, 0x01, 0xC0, 0x80, 0x41, 0x01, 0xC0, 0x80, 0x41, 0x00, 0xC1, 0x81, 0x40,
@@ -99,6 +115,23 @@ CRC_LOW = [
     0x44, 0x84, 0x85, 0x45, 0x87, 0x47, 0x46, 0x86, 0x82, 0x42, 0x43, 0x83, 0x41, 0x81, 0x80, 0x40
 ]
 
+# Combined 16 bit table, CRC_TABLE[index] = (CRC_HI << 8) | CRC_LOW
+CRC_TABLE = [(hi << 8) | low for hi, low in zip(CRC_HI, CRC_LOW)]
+
+
+@lru_cache(maxsize=4096)
+def _crc_cached(data):
+    """
+        CRC of a frame given as a tuple, relay frames repeat so these are cached
+    :param data: Tuple data (int)
+    :return: Tuple CRC high Byte, CRC low Byte
+    """
+    crc = 0xFFFF
+    for byte in data:
+        entry = CRC_TABLE[(crc >> 8) ^ byte]
+        crc = (((crc & 0xFF) ^ (entry >> 8)) << 8) | (entry & 0xFF)
+    return crc >> 8, crc & 0xFF
+
 
 class SerialOpenException(Exception):
     pass
@@ -111,12 +144,16 @@ class TransferException(Exception):
 class Modbus(object):
     """ Modbus class """
 
-    def __init__(self, serial_port=None, baud_rate=DEFAULT_BAUDRATE, verbose=False):
+    def __init__(self, serial_port=None, baud_rate=DEFAULT_BAUDRATE, verbose=False, turnaround_delay=FRAME_DELAY,
+                 rx_timeout=0.1, adapter_latency=ADAPTER_LATENCY):
         """
             Modbus constructor
         :param serial_port: Serial port such as 'COM1' on Windows and '/dev/ttyUSB0' on Linux.
         :param baud_rate: Serial baudrate
         :param verbose: Print transmit and receive frames to console
+        :param turnaround_delay: Minimum bus silence between frames for the USB - RS485 dongle (s)
+        :param rx_timeout: Maximum time to wait for a response (s)
+        :param adapter_latency: Longest gap the USB - RS485 dongle leaves inside a frame (s)
         """
         # Make sure previous prints are flushed to the console
         if sys.stderr:
@@ -131,17 +168,28 @@ class Modbus(object):
         self._serial_port = serial_port
 
         # Create serial
-        self._ser = serial.Serial()
+        self._ser = replay.wrap('serial', 'modbus', serial.Serial)
         self._ser.baudrate = int(baud_rate)
         self._ser.bytesize = 8
         self._ser.stopbits = 1
         self._ser.parity = serial.PARITY_NONE
-        self._ser.timeout = 0.1
+        self._ser.timeout = rx_timeout
         self._verbose = verbose
         self._tx_data = []
         self._rx_data = []
         self._monitor_thread = None
 
+        # Bus timing derived from baudrate: 3.5 characters between frames, 1.5 characters between bytes
+        self._char_time = BITS_PER_CHAR / self._ser.baudrate
+        self._frame_silence = max(3.5 * self._char_time if self._ser.baudrate <= 19200 else MIN_FRAME_SILENCE,
+                                  turnaround_delay)
+        # Only used for reads of unknown length, fixed length reads wait for all Bytes up to rx_timeout
+        self._inter_byte_timeout = max(1.5 * self._char_time, adapter_latency)
+        self._bus_idle_at = 0
+
+        # Latency statistics: deque of (address, function, latency (s), success)
+        self._latency = deque(maxlen=LATENCY_HISTORY)
+
         # Create lock
         self._lock = threading.Lock()
 
@@ -186,6 +234,14 @@ class Modbus(object):
         """
         return self._ser.baudrate
 
+    @property
+    def frame_silence(self):
+        """
+            Get silence between frames derived from baudrate and turnaround delay
+        :return: Silence (s)
+        """
+        return self._frame_silence
+
     @property
     def last_tx_frame(self):
         """
@@ -234,15 +290,7 @@ class Modbus(object):
         """
         assert type(data) == list
 
-        crc_high = 0xFF
-        crc_low = 0xFF
-
-        for i in range(0, len(data)):
-            index = crc_high ^ data[i]
-            crc_high = crc_low ^ CRC_HI[index]
-            crc_low = CRC_LOW[index]
-
-        return [crc_high, crc_low]
+        return list(_crc_cached(tuple(data)))
 
     def send(self, tx_data, append_crc_to_frame=True):
         """
@@ -263,10 +311,14 @@ class Modbus(object):
         if self._verbose:
             print(get_frame_str('TX', self._tx_data))
 
+        # Wait out whatever is left of the silence since the last frame on the bus
+        silence = self._bus_idle_at - time.perf_counter()
+        if silence > 0:
+            time.sleep(silence)
+
         try:
             # Clear receive
-            while self._ser.read_all():
-                time.sleep(0.010)
+            self._ser.reset_input_buffer()
         except serial.SerialException:
             # Windows: Serial exception
             raise TransferException('RX error: Read failed')
@@ -276,14 +328,15 @@ class Modbus(object):
 
         # Write binary command to relay card over serial port
         try:
-            self._ser.write(tx_data)
+            self._ser.write(bytes(tx_data))
+            self._ser.flush()
         except serial.SerialTimeoutException:
             raise TransferException('TX error: Serial write timeout')
         except serial.SerialException:
             raise TransferException('TX error: Serial write failed')
 
-        # Wait between transmitting frames
-        time.sleep(FRAME_DELAY)
+        # Next frame may go out once the bus has been silent long enough
+        self._bus_idle_at = time.perf_counter() + self._frame_silence
 
     def receive(self, rx_length):
         """
@@ -298,14 +351,23 @@ class Modbus(object):
         # Read response with timeout
         try:
             if rx_length:
+                # Blocks until rx_length Bytes arrive or the timeout passes
                 rx_data = self._ser.read(rx_length)
             else:
-                # Wait for response without known receive length
-                time.sleep(FRAME_RX_TIMEOUT)
-                rx_data = self._ser.read_all()
+                # Wait for the first Byte, then read until the line goes quiet (1.5 characters or the dongle latency)
+                rx_data = self._ser.read(1)
+                if rx_data:
+                    self._ser.inter_byte_timeout = self._inter_byte_timeout
+                    try:
+                        rx_data += self._ser.read(255)
+                    finally:
+                        self._ser.inter_byte_timeout = None
         except serial.SerialException:
             raise TransferException('RX error: Serial read failed')
 
+        # Response ends a frame on the bus
+        self._bus_idle_at = time.perf_counter() + self._frame_silence
+
         # Check read timeout
         if not rx_data:
             raise TransferException('RX error: Receive timeout')
@@ -338,8 +400,53 @@ class Modbus(object):
         :param rx_length:
         :return:
         """
-        self.send(tx_data, append_crc_to_tx_frame)
-        return self.receive(rx_length)
+        start = time.perf_counter()
+        try:
+            self.send(tx_data, append_crc_to_tx_frame)
+            rx_data = self.receive(rx_length)
+        except TransferException:
+            self._latency.append((tx_data[0], tx_data[1], time.perf_counter() - start, False))
+            raise
+        self._latency.append((tx_data[0], tx_data[1], time.perf_counter() - start, True))
+        return rx_data
+
+    def transfer_many(self, transactions, append_crc_to_tx_frame=True):
+        """
+            Run several transactions back to back while holding the bus
+            Transactions go out in the given order, each waits for its response and the next frame follows
+            after the minimum frame silence with no idle gap in between.
+        :param transactions: List (tx_data, rx_length)
+        :param append_crc_to_tx_frame: Append CRC to TX frames
+        :return: List received data (int) per transaction in the given order, None if the transaction failed
+        """
+
+        results = [None] * len(transactions)
+        with self._lock:
+            for idx, (tx_data, rx_length) in enumerate(transactions):
+                try:
+                    results[idx] = self.transfer(list(tx_data), append_crc_to_tx_frame, rx_length)
+                except TransferException:
+                    results[idx] = None
+        return results
+
+    def latency_stats(self, reset=False):
+        """
+            Get per address transaction latency statistics
+        :param reset: Clear history after reading
+        :return: Dict[address] = dict(count, errors, mean, max) with latencies in seconds
+        """
+        stats = {}
+        for address, _, latency, success in list(self._latency):
+            s = stats.setdefault(address, {'count': 0, 'errors': 0, 'mean': 0.0, 'max': 0.0})
+            s['count'] += 1
+            s['errors'] += 0 if success else 1
+            s['mean'] += latency
+            s['max'] = max(s['max'], latency)
+        for s in stats.values():
+            s['mean'] /= s['count']
+        if reset:
+            self._latency.clear()
+        return stats
 
     def transfer_begin(self):
         self._lock.acquire()
@@ -1,7 +1,9 @@
-from .modbus import Modbus
-from .R421B16 import R421B16
+from .modbus import Modbus, TransferException
+from .R421B16 import R421B16, CMD_ON, CMD_OFF, CMD_LATCH, CMD_ALL_ON, CMD_ALL_OFF
 from threading import Lock
 from parasol.hardware.port_finder import get_port
+from parasol.hardware.aio import InstrumentIO
+from parasol.topology import get_topology
 
 from parasol.configuration.configuration import Configuration
 config = Configuration()
@@ -30,24 +32,40 @@ def relay_lock(f):
 
 class Relay():
     
-    def __init__(self):
+    def __init__(self, serial_port=None):
+        """Connects to the relay boards and turns every relay off
+
+        Args:
+            serial_port (str, optional): serial port of the RS-485 dongle, found from the device identifiers if None
+        """
         
         # 1 board runs 2 cells so 12 boards will handle 6 strings of 4 cells
         # general rule: (NUM_STRINGS * NUM_DEVS * NUM_WIRES <= NUM_BOARDS * NUM_RELAYS / 2)
         self.lock = Lock()
-        self.SERIAL_PORT = get_port(constants["device_identifiers"]) 
+        self.io = InstrumentIO("relay") # modbus transfers for the async API
+        self.SERIAL_PORT = get_port(constants["device_identifiers"]) if serial_port is None else serial_port
         
-        self.NUM_DEVS = 4 # number of devices per load string
+        topology = get_topology()
+        self.NUM_DEVS = topology.modules_per_string # number of devices per load string
         self.NUM_WIRES = 4 # number of wires used per device (4 or 2)
         self.NUM_RELAYS = 16 # number of relays per load board
         
-        self.NUM_STRINGS = constants["num_strings"] # number of load strings
-        self.NUM_BOARDS = self.NUM_STRINGS*2 # number of installed load boards
+        self.NUM_STRINGS = topology.num_strings # number of load strings
         
         self.relay_mode = constants["relay_mode"]
+        self.multi_relay_frames = constants["multi_relay_frames"] # set a whole board with one write multiple frame
+        self.break_before_make = constants["break_before_make"] # moving between cells, old cell off before new cell on
+        self.frame_count = 0 # number of board commands sent
 
         self.create_relay_tables() # create useful relay tables  
+
+        # number of installed load boards, enough for the highest relay used
+        last_relay = max(relay for relays in self.relay_library.values() for relay in relays)
+        self.NUM_BOARDS = (last_relay-1)//self.NUM_RELAYS + 1
+
         self.relay_open = [False] * (self.NUM_RELAYS*self.NUM_BOARDS+1)  # create list[relay #] = Open boolean
+        self.relays_on = set() # generic relay numbers that are on, so switching only looks at boards in use
+        self.unsynced_boards = set() # boards whose shadow state is unknown after a failed write, forced on next switch
 
         
         self.modbus = self.connect_modbus() # open modbus get object
@@ -157,7 +175,14 @@ class Relay():
         """
             Connect to the modbus, return object
         """
-        modbus = Modbus(serial_port=self.SERIAL_PORT, verbose=False)
+        modbus = Modbus(
+            serial_port=self.SERIAL_PORT,
+            baud_rate=constants["baud_rate"],
+            verbose=False,
+            turnaround_delay=constants["turnaround_delay"],
+            rx_timeout=constants["rx_timeout"],
+            adapter_latency=constants["adapter_latency"],
+        )
         modbus.open()
         
         return modbus
@@ -189,7 +214,319 @@ class Relay():
             relayboard_no -= 1
         board = self.relayboards[relayboard_no]
         return board, relay_no
-    
+
+    def get_relays_on(self, boards=None):
+        """Returns set of generic relay numbers that are on according to the shadow state (on boards if given)"""
+        if boards is None:
+            return set(self.relays_on)
+        return set(relay for relay in self.relays_on if (relay-1)//self.NUM_RELAYS + 1 in boards)
+
+    def plan_board(self, current, target):
+        """Picks the shortest list of board commands to move one board from current to target
+
+        Args:
+            current (set[int]): relay numbers (1-16) that are on
+            target (set[int]): relay numbers (1-16) that should be on
+
+        Returns:
+            list[tuple]: (command, argument) pairs, command in "multi", "all_off", "all_on", "latch", "on", "off"
+        """
+
+        if current == target:
+            return []
+
+        all_relays = set(range(1, self.NUM_RELAYS+1))
+        plans = []
+
+        # switch only the relays that differ
+        plans.append([("on", r) for r in sorted(target-current)] + [("off", r) for r in sorted(current-target)])
+
+        # all off in one frame, then turn on target
+        plans.append([("all_off", None)] + [("on", r) for r in sorted(target)])
+
+        # latch turns one relay on and every other relay off in one frame
+        if target:
+            first = min(target)
+            plans.append([("latch", first)] + [("on", r) for r in sorted(target-{first})])
+
+        # all on in one frame, then turn off the rest
+        plans.append([("all_on", None)] + [("off", r) for r in sorted(all_relays-target)])
+
+        # every relay in one frame
+        if self.multi_relay_frames:
+            plans.append([("multi", sorted(target))])
+
+        return min(plans, key=len)
+
+    def plan_frame(self, board, command, arg):
+        """Builds the Modbus frame for one command from plan_board
+
+        Returns:
+            tuple: (tx data, receive length)
+        """
+
+        if command == "multi":
+            return board.set_multi_frame(arg)
+        elif command == "all_off":
+            return board.relay_command_frame(0, CMD_ALL_OFF)
+        elif command == "all_on":
+            return board.relay_command_frame(0, CMD_ALL_ON)
+        elif command == "latch":
+            return board.relay_command_frame(arg, CMD_LATCH)
+        elif command == "on":
+            return board.relay_command_frame(arg, CMD_ON)
+        else:
+            return board.relay_command_frame(arg, CMD_OFF)
+
+    def boards_for(self, relays):
+        """Gets the relay boards a set of generic relay numbers sit on
+
+        Args:
+            relays (iterable[int]): generic relay numbers
+
+        Returns:
+            set[int]: relay board numbers
+        """
+        return set((relay-1)//self.NUM_RELAYS + 1 for relay in relays)
+
+    def split_boards(self, relays):
+        """Splits generic relay numbers by relay board
+
+        Args:
+            relays (iterable[int]): generic relay numbers
+
+        Returns:
+            dict: split[relayboard_no] = set of relay numbers (1-16) on the board
+        """
+        split = {}
+        for relay in relays:
+            split.setdefault((relay-1)//self.NUM_RELAYS + 1, set()).add((relay-1) % self.NUM_RELAYS + 1)
+        return split
+
+    def count_frames(self, current_relays, target_relays, boards=None):
+        """Counts the board commands switch_to would send to move from current_relays to target_relays
+
+        Args:
+            current_relays (set[int]): generic relay numbers that are on
+            target_relays (set[int]): generic relay numbers that should be on
+            boards (iterable[int], optional): only count these boards. Defaults to boards holding either set.
+
+        Returns:
+            int: number of frames
+        """
+        current = self.split_boards(current_relays)
+        target = self.split_boards(target_relays)
+        if boards is None:
+            boards = set(current) | set(target)
+        return sum(len(self.plan_board(current.get(b, set()), target.get(b, set()))) for b in boards)
+
+    def move_steps(self, current_relays, cell_no):
+        """Relay sets to pass through moving from current_relays to only the relays of cell_no
+
+        Relays the two share stay latched. With break_before_make the relays that go off are switched
+        before the new ones go on, so two cells are never on the sense lines together.
+
+        Args:
+            current_relays (set[int]): generic relay numbers that are on
+            cell_no (int): cell to switch to
+
+        Returns:
+            list[set]: relay sets to switch to in order
+        """
+        target = set(self.relay_library[cell_no])
+        shared = current_relays & target
+        if self.break_before_make and current_relays - shared and target - shared:
+            return [shared, target]
+        return [target]
+
+    def move_to(self, cell_no, boards=None):
+        """Switches to only cell_no, keeping relays shared with the cell that is on latched (on boards if given)"""
+        for step in self.move_steps(self.get_relays_on(boards), cell_no):
+            self.switch_to(step, boards=boards)
+
+    def plan_scan(self, cells, boards=None):
+        """Orders cell visits so consecutive cells toggle the fewest relays
+
+        Visits go greedily to the cell that costs the fewest frames from the cell before, then the fewest
+        relay transitions, then list order. Compared against visiting in list order and turning every
+        relay off after each cell.
+
+        Args:
+            cells (list[int]): cells to visit
+            boards (iterable[int], optional): boards the cells are switched on. Defaults to all.
+
+        Returns:
+            dict: order (list of cells), frames, naive_frames, transitions, naive_transitions
+        """
+        def cost(current, cell_no):
+            frames = 0
+            transitions = 0
+            for step in self.move_steps(current, cell_no):
+                frames += self.count_frames(current, step, boards)
+                transitions += len(current ^ step)
+                current = step
+            return frames, transitions
+
+        # list order, every relay off after each cell
+        start = self.get_relays_on(boards)
+        naive_frames = 0
+        naive_transitions = 0
+        for cell_no in cells:
+            target = set(self.relay_library[cell_no])
+            naive_frames += self.count_frames(start, target, boards) + self.count_frames(target, set(), boards)
+            naive_transitions += len(start ^ target) + len(target)
+            start = set()
+
+        # greedy order, shared relays stay latched, every relay off after the last cell
+        current = self.get_relays_on(boards)
+        remaining = list(cells)
+        order = []
+        frames = 0
+        transitions = 0
+        while remaining:
+            costs = [cost(current, cell_no) + (index,) for index, cell_no in enumerate(remaining)]
+            step_frames, step_transitions, index = min(costs)
+            cell_no = remaining.pop(index)
+            order.append(cell_no)
+            frames += step_frames
+            transitions += step_transitions
+            current = set(self.relay_library[cell_no])
+        frames += self.count_frames(current, set(), boards)
+        transitions += len(current)
+
+        return {
+            "order": order,
+            "frames": frames,
+            "naive_frames": naive_frames,
+            "transitions": transitions,
+            "naive_transitions": naive_transitions,
+        }
+
+    def switch_to(self, target_relays, force=False, boards=None):
+        """Switches relays so that exactly target_relays are on, using the fewest board commands
+
+        Frames for every board are handed to the Modbus in one batch so that they go out back to back
+        across board addresses.
+
+        Args:
+            target_relays (iterable[int]): generic relay numbers that should be on
+            force (bool, optional): ignore shadow state and command every board. Defaults to False.
+            boards (iterable[int], optional): only switch these boards, the rest keep their relays. Defaults to all.
+        """
+
+        with self.lock:
+            self._switch_to(set(target_relays), force, boards)
+
+    def switch_delta(self, add=(), remove=()):
+        """Turns relays on and off on top of the relays that are on now
+
+        The target is built from the shadow state while holding the lock, so concurrent callers do not undo
+        each other's relays.
+
+        Args:
+            add (iterable[int], optional): generic relay numbers to turn on
+            remove (iterable[int], optional): generic relay numbers to turn off
+        """
+
+        with self.lock:
+            self._switch_to((self.relays_on | set(add)) - set(remove))
+
+    def _switch_to(self, target_relays, force=False, boards=None):
+        """Workhorse for switch_to, the caller holds self.lock
+
+        Args:
+            target_relays (set[int]): generic relay numbers that should be on
+            force (bool, optional): ignore shadow state and command every board. Defaults to False.
+            boards (iterable[int], optional): only switch these boards. Defaults to all.
+
+        Raises:
+            TransferException: a single relay write failed, the shadow state keeps the relays that were set
+                and the board is forced on the next switch
+        """
+
+        all_relays = set(range(1, self.NUM_RELAYS+1))
+
+        # only boards with relays on now or in the target can change, unless forced
+        if boards is None:
+            boards = self.relayboards if force else self.boards_for(target_relays | self.relays_on) | self.unsynced_boards
+
+        # plan boards from the shadow state, relays 1 to 16
+        targets = {}
+        transactions = []
+        owners = []
+        for relayboard_no in sorted(boards):
+            board = self.relayboards.get(relayboard_no)
+            if board is None:
+                continue
+            offset = (relayboard_no-1)*self.NUM_RELAYS
+            current = set(r for r in all_relays if self.relay_open[offset+r])
+            target = set(r for r in all_relays if offset+r in target_relays)
+            if force or relayboard_no in self.unsynced_boards:
+                current = all_relays - target
+            targets[relayboard_no] = target
+
+            for command, arg in self.plan_board(current, target):
+                transactions.append(self.plan_frame(board, command, arg))
+                owners.append((relayboard_no, command))
+
+        # send all frames in one batch
+        results = self.modbus.transfer_many(transactions)
+        self.frame_count += len(transactions)
+
+        # boards that rejected a frame are set one relay at a time
+        failed = {}
+        for (relayboard_no, command), rx_data in zip(owners, results):
+            if rx_data is None:
+                failed.setdefault(relayboard_no, set()).add(command)
+
+        # relays known to be set per board
+        synced = {relayboard_no: all_relays for relayboard_no in targets if relayboard_no not in failed}
+        try:
+            for relayboard_no, commands in failed.items():
+                if self.multi_relay_frames and "multi" in commands:
+                    print(f"Relay board {relayboard_no} rejected multi relay frame, falling back to single relay frames")
+                    self.multi_relay_frames = False
+                board = self.relayboards[relayboard_no]
+                synced[relayboard_no] = set()
+                for r in all_relays:
+                    if r in targets[relayboard_no]:
+                        board.on(r)
+                    else:
+                        board.off(r)
+                    self.frame_count += 1
+                    synced[relayboard_no].add(r)
+
+        except TransferException:
+            print(f"Relay board {relayboard_no} failed single relay frame, resyncing on next switch")
+            raise
+
+        finally:
+            # update shadow state, boards that were not fully set are forced next time
+            for relayboard_no, target in targets.items():
+                offset = (relayboard_no-1)*self.NUM_RELAYS
+                for r in synced.get(relayboard_no, ()):
+                    self.relay_open[offset+r] = r in target
+                    if r in target:
+                        self.relays_on.add(offset+r)
+                    else:
+                        self.relays_on.discard(offset+r)
+                if synced.get(relayboard_no) == all_relays:
+                    self.unsynced_boards.discard(relayboard_no)
+                else:
+                    self.unsynced_boards.add(relayboard_no)
+
+    async def switch_to_async(self, target_relays, force=False):
+        """Switches relays so that exactly target_relays are on, from a coroutine
+
+        The Modbus frame timing stays on the relay I/O thread, the event loop is free while frames go out.
+
+        Args:
+            target_relays (iterable[int]): generic relay numbers that should be on
+            force (bool, optional): ignore shadow state and command every board. Defaults to False.
+        """
+
+        await self.io.call(self.switch_to, list(target_relays), force)
+
     @relay_lock
     def _open(self,relay):
         """Workhorse function to open relays based on internal id"""
@@ -197,6 +534,7 @@ class Relay():
             board, relay_no = self.relay_to_boardspecifics(relay) # grab board and relay number
             board.on(relay_no) # turn on 
             self.relay_open[relay] = True
+            self.relays_on.add(relay)
             # time.sleep(self.DELAY)
 
     @relay_lock
@@ -206,6 +544,7 @@ class Relay():
             board, relay_no = self.relay_to_boardspecifics(relay) # grab board and relay number
             board.off(relay_no) # turn off
             self.relay_open[relay] = False
+            self.relays_on.discard(relay)
             # time.sleep(self.DELAY)
     
     @relay_lock
@@ -214,54 +553,70 @@ class Relay():
         board, relay_no = self.relay_to_boardspecifics(relay) # grab board and relay number
         board.off(relay_no) # turn off
         self.relay_open[relay] = False
+        self.relays_on.discard(relay)
         # time.sleep(self.DELAY)
 
     
     def on(self,cell_no):
         """Open the neccisary ports to scan specified cell"""
-        for relay in self.relay_library[cell_no]:
-            self._open(relay)
+        self.switch_delta(add=self.relay_library[cell_no])
 
     def off(self,cell_no):
         """Close the neccisary ports to return the specified cell to its load"""
-        for relay in self.relay_library[cell_no]:
-            self._close(relay)
+        self.switch_delta(remove=self.relay_library[cell_no])
+
+    def only(self,cell_no,boards=None):
+        """Open the neccisary ports to scan specified cell, closing all others (on boards if given)"""
+        self.switch_to(self.relay_library[cell_no], boards=boards)
 
     def all_on(self):
         """Open all relays"""
-        for relay in range(1,len(self.relay_open)):
-            self._open(relay)
+        self.switch_to(range(1,len(self.relay_open)))
 
-    def all_off(self):
-        """Close all relays"""
-        for relay in range(1,len(self.relay_open)):
-            self._close(relay)
+    def all_off(self,boards=None):
+        """Close all relays (on boards if given)"""
+        self.switch_to([], boards=boards)
+
+    async def on_async(self,cell_no):
+        """Open the neccisary ports to scan specified cell, from a coroutine"""
+        await self.io.call(self.on, cell_no)
+
+    async def off_async(self,cell_no):
+        """Close the neccisary ports to return the specified cell to its load, from a coroutine"""
+        await self.io.call(self.off, cell_no)
+
+    async def all_off_async(self):
+        """Close all relays, from a coroutine"""
+        await self.io.call(self.all_off)
 
     def open_string(self,string_no):
         """Opens relays for given string"""
-        for relay in self.string_library[string_no]:
-            self._open(relay)
+        self.switch_delta(add=self.string_library[string_no])
 
     def close_string(self,string_no):
         """Closes relays for given string"""
-        for relay in self.string_library[string_no]:
-            self._close(relay)
+        self.switch_delta(remove=self.string_library[string_no])
 
     def open_cell(self,string_no):
         """Opens relays for given cell"""
-        for relay in self.dev_library[string_no]:
-            self._open(relay)
+        self.switch_delta(add=self.dev_library[string_no])
 
     def close_cell(self,string_no):
         """Closes relays for given cell"""
-        for relay in self.dev_library[string_no]:
-            self._close(relay)
+        self.switch_delta(remove=self.dev_library[string_no])
     
+    def disconnect(self):
+        """Closes the serial port of the relay boards"""
+        self.modbus.close()
+
     def reset_relays(self):
         """Closes all relays regarldess of status -- useful for reset"""
-        # i = 0
-        for relay in range(1,len(self.relay_open)):
-            try:
-                self._hard_close(relay)
-            except:
-                print(f'{relay} not working, relay board {relay/16 + 1} not working')
\ No newline at end of file
+        try:
+            self.switch_to([], force=True)
+        except:
+            # go relay by relay so we can see which board is not working
+            for relay in range(1,len(self.relay_open)):
+                try:
+                    self._hard_close(relay)
+                except:
+                    print(f'{relay} not working, relay board {(relay-1)//16 + 1} not working')
\ No newline at end of file
@@ -0,0 +1,122 @@
+import argparse
+import numpy as np
+
+from parasol.mppt import TRACKERS, make_tracker
+from parasol.simulation.pvmodel import SimulatedModule, SimulatedLoad, irradiance_traces
+
+
+def run_trace(tracker_name: str, t: np.ndarray, g: np.ndarray, mpp_interval: float, **tracker_kwargs) -> dict:
+    """Replays an irradiance trace through the simulated module using one tracker
+
+    While a tracker runs, the load sits at each measured voltage for that point's instrument time, and
+    between wakeups it is held at the last voltage set by the tracker. The energy harvested depends on
+    how close the tracker gets, how quickly it gets there and how long it spends off the MPP doing so.
+
+    Args:
+        tracker_name (str): registered name of tracker
+        t (np.ndarray): trace time (s)
+        g (np.ndarray): trace intensity (# suns)
+        mpp_interval (float): time between tracker wakeups (s)
+        **tracker_kwargs: options passed to the tracker
+
+    Returns:
+        dict: efficiency (%), energy harvested (J), energy available (J), instrument time (s), measurements
+    """
+
+    module = SimulatedModule()
+    load = SimulatedLoad(module)
+    tracker = make_tracker(tracker_name, **tracker_kwargs)
+
+    # Seed from a JV curve at the start of the trace, as the controller does after a JV scan
+    module.intensity = g[0]
+    vmpp, _ = module.mpp()
+    v_jv, i_jv = module.jv(0, module.voc * 1.1, 100)
+    tracker.seed(vmpp, v_jv[np.argmin(np.abs(i_jv))])
+
+    dt = t[1] - t[0]
+    v_hold = vmpp
+    next_wakeup = t[0]
+    harvested = 0.0
+    available = 0.0
+    pending = [] # (voltage, time left (s)) of the points of the last wakeup
+
+    for time_s, intensity in zip(t, g):
+        module.intensity = intensity
+
+        # Wake the tracker up
+        if time_s >= next_wakeup:
+            start = load.instrument_time
+            points = tracker.track(
+                lambda v: load.set_V_measure_I(0, v), v_hold, 0, module.voc * 1.1
+            )
+            v_hold = points[-1][1]
+            next_wakeup += mpp_interval
+
+            # The load sits at each point for its share of the instrument time
+            point_time = (load.instrument_time - start) / len(points)
+            pending = [[v, point_time] for _, v, _, _ in points]
+
+        # Credit the points still running at their own voltage, then hold the last voltage for the rest of the step
+        hold = dt
+        while pending and hold > 0:
+            used = min(pending[0][1], hold)
+            harvested += max(pending[0][0] * float(module.current(pending[0][0])), 0) * used
+            hold -= used
+            pending[0][1] -= used
+            if pending[0][1] <= 0:
+                pending.pop(0)
+        harvested += max(v_hold * float(module.current(v_hold)), 0) * hold
+        available += module.mpp()[1] * dt
+
+    return {
+        "efficiency": 100 * harvested / available,
+        "harvested": harvested,
+        "available": available,
+        "instrument_time": load.instrument_time,
+        "measurements": load.num_measurements,
+    }
+
+
+def benchmark(duration: float = 1800, mpp_interval: float = 20, trackers: list = None, **tracker_kwargs) -> dict:
+    """Runs every tracker against every irradiance trace
+
+    Args:
+        duration (float): length of each trace (s)
+        mpp_interval (float): time between tracker wakeups (s)
+        trackers (list[str]): trackers to run, defaults to all registered trackers
+        **tracker_kwargs: options passed to the trackers
+
+    Returns:
+        dict: results[trace][tracker] = dict from run_trace
+    """
+
+    if trackers is None:
+        trackers = list(TRACKERS.keys())
+
+    results = {}
+    for trace_name, (t, g) in irradiance_traces(duration).items():
+        results[trace_name] = {}
+        for tracker_name in trackers:
+            results[trace_name][tracker_name] = run_trace(tracker_name, t, g, mpp_interval, **tracker_kwargs)
+    return results
+
+
+def print_results(results: dict) -> None:
+    """Prints benchmark results as a table"""
+
+    print(f"{'trace':<15}{'tracker':<28}{'efficiency (%)':>16}{'instrument (s)':>16}{'points':>8}")
+    for trace_name, trace_results in results.items():
+        for tracker_name, r in trace_results.items():
+            print(
+                f"{trace_name:<15}{tracker_name:<28}{r['efficiency']:>16.2f}{r['instrument_time']:>16.1f}{r['measurements']:>8d}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MPP trackers on simulated irradiance traces")
+    parser.add_argument("--duration", type=float, default=1800, help="length of each trace (s)")
+    parser.add_argument("--interval", type=float, default=20, help="time between tracker wakeups (s)")
+    parser.add_argument("--trackers", nargs="*", default=None, help="trackers to run (default all)")
+    args = parser.parse_args()
+
+    print_results(benchmark(args.duration, args.interval, args.trackers))
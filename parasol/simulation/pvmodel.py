@@ -0,0 +1,160 @@
+import numpy as np
+
+
+class SimulatedModule:
+    """Single diode model of a string of modules, used to exercise trackers without hardware"""
+
+    def __init__(
+        self,
+        isc: float = 1.0,
+        voc: float = 20.0,
+        n_cells: int = 36,
+        ideality: float = 1.3,
+        rsh: float = 300.0,
+        temp: float = 25.0,
+    ) -> None:
+        """Initializes the simulated module at 1 sun
+
+        Args:
+            isc (float): short circuit current at 1 sun (A)
+            voc (float): open circuit voltage at 1 sun (V)
+            n_cells (int): number of cells in series
+            ideality (float): diode ideality factor
+            rsh (float): shunt resistance (Ohm)
+            temp (float): cell temperature (C)
+        """
+
+        self.isc = isc
+        self.voc = voc
+        self.rsh = rsh
+
+        # Thermal voltage of the string, dark saturation current chosen so that I(voc) = 0 at 1 sun
+        self.nvt = n_cells * ideality * 8.617e-5 * (temp + 273.15)
+        self.i0 = (isc - voc / rsh) / (np.exp(voc / self.nvt) - 1)
+
+        self.intensity = 1.0
+
+    def current(self, v: float, intensity: float = None) -> float:
+        """Returns the current produced at voltage v
+
+        Args:
+            v (float): voltage (V)
+            intensity (float): light intensity (# suns), defaults to current intensity
+
+        Returns:
+            float: current (A), positive when producing power
+        """
+
+        if intensity is None:
+            intensity = self.intensity
+        return intensity * self.isc - self.i0 * (np.exp(np.asarray(v) / self.nvt) - 1) - np.asarray(v) / self.rsh
+
+    def mpp(self, intensity: float = None) -> float:
+        """Returns the true maximum power point at the given intensity
+
+        Args:
+            intensity (float): light intensity (# suns)
+
+        Returns:
+            float: voltage at MPP (V)
+            float: power at MPP (W)
+        """
+
+        v = np.linspace(0, self.voc * 1.1, 2000)
+        p = v * self.current(v, intensity)
+        idx = np.argmax(p)
+        return v[idx], p[idx]
+
+    def jv(self, vmin: float, vmax: float, steps: int) -> np.ndarray:
+        """Returns a JV curve at the current intensity
+
+        Returns:
+            np.ndarray: voltage (V)
+            np.ndarray: current (A)
+        """
+
+        v = np.linspace(vmin, vmax, steps)
+        return v, self.current(v)
+
+
+class SimulatedLoad:
+    """Stands in for the Chroma, applying voltages to a SimulatedModule while keeping track of instrument time"""
+
+    def __init__(
+        self, module: SimulatedModule, source_delay: float = 1.0, measure_time: float = 0.1, noise: float = 0.0, seed: int = 0
+    ) -> None:
+        """Initializes the simulated load
+
+        Args:
+            module (SimulatedModule): module connected to the load
+            source_delay (float): settling time per voltage set (s)
+            measure_time (float): time to measure voltage and current (s)
+            noise (float): relative current noise (1 sigma)
+            seed (int): random seed for noise
+        """
+
+        self.module = module
+        self.source_delay = source_delay
+        self.measure_time = measure_time
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+
+        self.v = 0.0
+        self.instrument_time = 0.0
+        self.num_measurements = 0
+
+    def set_V_measure_I(self, channel: int, voltage: float, lock=True) -> float:
+        """Sets voltage and measures current (same call signature as Chroma)
+
+        Returns:
+            float: voltage (V) reading
+            float: current (A) reading
+        """
+
+        self.v = voltage
+        self.instrument_time += self.source_delay + self.measure_time
+        self.num_measurements += 1
+
+        i = float(self.module.current(voltage))
+        if self.noise:
+            i *= 1 + self.rng.normal(0, self.noise)
+        return voltage, i
+
+
+def irradiance_traces(duration: float, dt: float = 1.0, seed: int = 0) -> dict:
+    """Builds a set of irradiance traces used for benchmarking
+
+    Args:
+        duration (float): length of each trace (s)
+        dt (float): time resolution (s)
+        seed (int): random seed for the broken cloud trace
+
+    Returns:
+        dict: traces[name] = (time (s), intensity (# suns))
+    """
+
+    t = np.arange(0, duration, dt)
+    rng = np.random.default_rng(seed)
+    traces = {}
+
+    # Clear sky
+    traces["clear"] = (t, np.ones_like(t))
+
+    # Single cloud edge: sun, cloud, sun
+    g = np.ones_like(t)
+    g[(t > duration / 3) & (t < 2 * duration / 3)] = 0.3
+    traces["cloud_edge"] = (t, g)
+
+    # Slow ramp, e.g. morning
+    traces["ramp"] = (t, np.linspace(0.1, 1.0, len(t)))
+
+    # Broken clouds: random dwell times at random levels
+    g = np.ones_like(t)
+    idx = 0
+    while idx < len(t):
+        dwell = int(rng.integers(10, 120) / dt)
+        g[idx:idx + dwell] = rng.choice([1.0, 0.9, 0.5, 0.25])
+        idx += dwell
+    traces["broken_clouds"] = (t, g)
+
+    return traces
@@ -0,0 +1,175 @@
+import time
+import argparse
+import numpy as np
+
+from parasol.relay.relay import Relay
+from parasol.simulation.serial_emulators import R421B16Emulator
+
+
+def run_switching(multi_relay_frames: bool, latency: float, fault_rate: float, cycles: int, seed: int = 0) -> dict:
+    """Steps through every module the way a JV round does, against emulated relay boards on a pseudo terminal
+
+    The real Relay/Modbus stack talks to the emulator over the pty, so frame building, CRC checks, receive
+    timeouts and the fallback to single relay frames all run as they do on the bench.
+
+    Args:
+        multi_relay_frames (bool): set a whole board with one write multiple frame
+        latency (float): board response latency (s), on top of the 9600 baud wire time
+        fault_rate (float): probability that a board drops a response or corrupts its CRC
+        cycles (int): number of rounds over every module
+        seed (int): seed for the injected faults
+
+    Returns:
+        dict: switches, frames per switch, mean/max switch time (s), mean frame latency (s), frame errors,
+            switch errors, relay transitions, whether the boards ended up in the shadow state
+    """
+
+    emulator = R421B16Emulator(latency=latency, fault_rate=fault_rate, seed=seed).start()
+    try:
+        relay = Relay(serial_port=emulator.port)
+        relay.multi_relay_frames = multi_relay_frames
+        relay.modbus.latency_stats(reset=True)
+        frames = relay.frame_count
+        emulator.reset_stats()
+        emulator.transitions = 0
+
+        times = []
+        switch_errors = 0
+        for _ in range(cycles):
+            for module in relay.relay_library:
+                start = time.perf_counter()
+                try:
+                    relay.only(module)
+                except Exception:
+                    switch_errors += 1
+                times.append(time.perf_counter() - start)
+        relay.all_off()
+
+        latencies = relay.modbus.latency_stats()
+        count = sum(s["count"] for s in latencies.values())
+        consistent = all(
+            emulator.get_relays_on(board) == [r for r in range(1, relay.NUM_RELAYS + 1) if relay.relay_open[(board - 1) * relay.NUM_RELAYS + r]]
+            for board in relay.relayboards
+        )
+        relay.modbus.close()
+    finally:
+        emulator.stop()
+
+    return {
+        "switches": len(times),
+        "frames_per_switch": (relay.frame_count - frames) / len(times),
+        "mean_switch": float(np.mean(times)),
+        "max_switch": float(np.max(times)),
+        "mean_frame": sum(s["mean"] * s["count"] for s in latencies.values()) / count if count else 0.0,
+        "frame_errors": sum(s["errors"] for s in latencies.values()),
+        "switch_errors": switch_errors,
+        "transitions": emulator.transitions,
+        "consistent": consistent,
+    }
+
+
+def run_scan_order(relay_mode: int, break_before_make: bool, latency: float, cycles: int) -> dict:
+    """Runs JV cycles over every string against emulated relay boards, visiting modules in list order with
+    every relay off after each module, then in the planned order with shared relays latched
+
+    Args:
+        relay_mode (int): relay wiring, see Relay.create_relay_tables
+        break_before_make (bool): old module off before the new one on
+        latency (float): board response latency (s), on top of the 9600 baud wire time
+        cycles (int): number of JV cycles over every string
+
+    Returns:
+        dict: results[order] = {frames, time (s), transitions} per JV cycle of one string
+    """
+
+    emulator = R421B16Emulator(latency=latency).start()
+    try:
+        relay = Relay(serial_port=emulator.port)
+        relay.relay_mode = relay_mode
+        relay.break_before_make = break_before_make
+        relay.create_relay_tables()
+        strings = [
+            list(range((string - 1) * relay.NUM_DEVS + 1, string * relay.NUM_DEVS + 1))
+            for string in range(1, relay.NUM_STRINGS + 1)
+        ]
+
+        def list_order(modules):
+            for module in modules:
+                relay.only(module)
+                relay.all_off()
+
+        def planned_order(modules):
+            for module in relay.plan_scan(modules)["order"]:
+                relay.move_to(module)
+            relay.all_off()
+
+        results = {}
+        for order, visit in [("list order", list_order), ("planned order", planned_order)]:
+            frames = relay.frame_count
+            emulator.transitions = 0
+            start = time.perf_counter()
+            for _ in range(cycles):
+                for modules in strings:
+                    visit(modules)
+            count = cycles * len(strings)
+            results[order] = {
+                "frames": (relay.frame_count - frames) / count,
+                "time": (time.perf_counter() - start) / count,
+                "transitions": emulator.transitions / count,
+            }
+        relay.modbus.close()
+    finally:
+        emulator.stop()
+
+    return results
+
+
+def benchmark(latency: float = 0.002, fault_rate: float = 0.0, cycles: int = 2) -> dict:
+    """Compares one frame per board against one frame per relay command
+
+    Returns:
+        dict: results[mode] = run_switching() results
+    """
+
+    return {
+        "multi relay frames": run_switching(True, latency, fault_rate, cycles),
+        "single relay frames": run_switching(False, latency, fault_rate, cycles),
+    }
+
+
+def print_results(results: dict) -> None:
+    """Prints benchmark results as a table"""
+
+    print(f"{'mode':<22}{'frames/switch':>14}{'switch (ms)':>13}{'max (ms)':>10}{'frame (ms)':>12}{'errors':>8}{'transitions':>13}{'consistent':>12}")
+    for mode, r in results.items():
+        print(
+            f"{mode:<22}{r['frames_per_switch']:>14.2f}{r['mean_switch']*1e3:>13.1f}{r['max_switch']*1e3:>10.1f}"
+            f"{r['mean_frame']*1e3:>12.1f}{r['frame_errors']:>8d}{r['transitions']:>13d}{str(r['consistent']):>12}"
+        )
+
+
+def print_scan_order(latency: float = 0.002, cycles: int = 2) -> None:
+    """Prints frames, switching time and relay transitions per JV cycle of one string for each module order"""
+
+    print(f"{'relay mode':<12}{'break before make':<19}{'order':<15}{'frames':>8}{'time (ms)':>11}{'transitions':>13}")
+    for relay_mode in [0, 1]:
+        for break_before_make in [True, False]:
+            for order, r in run_scan_order(relay_mode, break_before_make, latency, cycles).items():
+                print(
+                    f"{relay_mode:<12}{str(break_before_make):<19}{order:<15}{r['frames']:>8.1f}"
+                    f"{r['time']*1e3:>11.1f}{r['transitions']:>13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark relay switching against emulated R421B16 boards")
+    parser.add_argument("--latency", type=float, default=0.002, help="board response latency (s)")
+    parser.add_argument("--fault-rate", type=float, default=0.0, help="fraction of frames dropped or corrupted")
+    parser.add_argument("--cycles", type=int, default=2, help="rounds over every module")
+    parser.add_argument("--scan-order", action="store_true", help="compare module visit orders per JV cycle instead")
+    args = parser.parse_args()
+
+    if args.scan_order:
+        print_scan_order(args.latency, args.cycles)
+    else:
+        print_results(benchmark(args.latency, args.fault_rate, args.cycles))
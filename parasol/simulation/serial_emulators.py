@@ -0,0 +1,384 @@
+import os
+import pty
+import tty
+import time
+import random
+import select
+from collections import deque
+from threading import Thread, Event, Lock
+
+from parasol.relay.modbus import Modbus
+from parasol.relay.R421B16 import (
+    NUM_RELAYS,
+    CMD_ON,
+    CMD_OFF,
+    CMD_TOGGLE,
+    CMD_LATCH,
+    CMD_MOMENTARY,
+    CMD_DELAY,
+    CMD_ALL_ON,
+    CMD_ALL_OFF,
+    FUNCTION_CONTROL_COMMAND,
+    FUNCTION_READ_STATUS,
+    FUNCTION_WRITE_MULTIPLE,
+)
+
+# Faults that can be injected into the next responses
+TIMEOUT = "timeout" # no response
+BAD_CRC = "bad_crc" # response with a corrupted CRC/LRC
+FAULTS = [TIMEOUT, BAD_CRC]
+
+
+class PtyEmulator:
+    """Serial device emulated behind a pseudo terminal, open `port` with pyserial like a USB - RS485 dongle
+
+    Subclasses split the byte stream into frames and answer them. Responses go out after the configured
+    latency plus, with wire_timing, the time the bytes would take on the wire at the baud rate. Linux/macOS only.
+    """
+
+    def __init__(self, latency: float = 0.0, baud_rate: int = 9600, wire_timing: bool = True, fault_rate: float = 0.0, seed: int = None) -> None:
+        """Opens the pseudo terminal
+
+        Args:
+            latency (float): time from the end of a request to the start of the response (s)
+            baud_rate (int): baud rate used for wire timing
+            wire_timing (bool): add the time the response takes on the wire at baud_rate
+            fault_rate (float): probability that a request gets a random fault from FAULTS
+            seed (int, optional): seed for the random faults
+        """
+
+        self.latency = latency
+        self.baud_rate = baud_rate
+        self.wire_timing = wire_timing
+        self.fault_rate = fault_rate
+        self.random = random.Random(seed)
+
+        # Raw mode on both ends so no bytes are translated
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+
+        self.lock = Lock()
+        self.faults = deque()
+        self.stats = {"requests": 0, "responses": 0, "rejected": 0, "faults": 0}
+        self.stop_event = Event()
+        self.thread = None
+
+    def start(self):
+        """Starts answering requests in a background thread
+
+        Returns:
+            PtyEmulator: self, so the emulator can be created and started in one line
+        """
+
+        self.stop_event.clear()
+        self.thread = Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops answering and closes the pseudo terminal"""
+
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        os.close(self.master)
+        os.close(self.slave)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def inject(self, fault: str, count: int = 1) -> None:
+        """Applies a fault to the next requests
+
+        Args:
+            fault (str): fault from FAULTS
+            count (int): number of requests to apply it to
+        """
+
+        if fault not in FAULTS:
+            raise ValueError(f"Unknown fault '{fault}', use one of {FAULTS}")
+        with self.lock:
+            self.faults.extend([fault] * count)
+
+    def reset_stats(self) -> None:
+        """Zeros the request counters"""
+
+        with self.lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def split(self, buffer: bytes) -> tuple:
+        """Splits complete frames off the front of the byte stream
+
+        Args:
+            buffer (bytes): bytes received so far
+
+        Returns:
+            list[bytes]: complete frames
+            bytes: remaining bytes
+        """
+
+        raise NotImplementedError
+
+    def respond(self, frame: bytes) -> bytes:
+        """Answers one frame
+
+        Args:
+            frame (bytes): complete request frame
+
+        Returns:
+            bytes: response, None to stay silent (bad checksum, other address)
+        """
+
+        raise NotImplementedError
+
+    def corrupt(self, response: bytes) -> bytes:
+        """Corrupts the checksum of a response"""
+
+        raise NotImplementedError
+
+    def _next_fault(self) -> str:
+        """Takes the fault for the next request, injected faults first"""
+
+        with self.lock:
+            if self.faults:
+                return self.faults.popleft()
+        if self.fault_rate and self.random.random() < self.fault_rate:
+            return self.random.choice(FAULTS)
+        return None
+
+    def _run(self) -> None:
+        """Reads requests and writes responses until stopped"""
+
+        buffer = b""
+        while not self.stop_event.is_set():
+            readable, _, _ = select.select([self.master], [], [], 0.05)
+            if not readable:
+                continue
+            try:
+                buffer += os.read(self.master, 1024)
+            except OSError:
+                break
+
+            frames, buffer = self.split(buffer)
+            for frame in frames:
+                response = self.respond(frame)
+                fault = self._next_fault()
+                with self.lock:
+                    self.stats["requests"] += 1
+                    self.stats["rejected"] += response is None
+                    self.stats["faults"] += fault is not None and response is not None
+                if response is None or fault == TIMEOUT:
+                    continue
+                if fault == BAD_CRC:
+                    response = self.corrupt(response)
+
+                delay = self.latency
+                if self.wire_timing:
+                    delay += len(response) * 10 / self.baud_rate
+                if delay:
+                    time.sleep(delay)
+                os.write(self.master, response)
+                with self.lock:
+                    self.stats["responses"] += 1
+
+
+class R421B16Emulator(PtyEmulator):
+    """R421B16 relay boards on one RS-485 bus, speaking Modbus RTU with CRC16"""
+
+    def __init__(self, addresses=range(1, 13), **kwargs) -> None:
+        """Initializes the boards with every relay off
+
+        Args:
+            addresses (iterable[int]): Modbus addresses of the boards on the bus
+            **kwargs: latency, baud_rate, wire_timing, fault_rate, seed (see PtyEmulator)
+        """
+
+        super().__init__(**kwargs)
+
+        # relays[address][relay] = on, relay 1 to 16 (index 0 unused)
+        self.relays = {address: [False] * (NUM_RELAYS + 1) for address in addresses}
+
+        # number of relay state changes, a proxy for contact wear
+        self.transitions = 0
+
+    def get_relays_on(self, address: int) -> list:
+        """Returns the relays that are on
+
+        Args:
+            address (int): board address
+
+        Returns:
+            list[int]: relay numbers 1 to 16
+        """
+
+        with self.lock:
+            return [relay for relay in range(1, NUM_RELAYS + 1) if self.relays[address][relay]]
+
+    @staticmethod
+    def _frame_length(buffer: bytes) -> int:
+        """Length of the RTU frame at the front of buffer, None until enough bytes are in"""
+
+        if len(buffer) < 2:
+            return None
+        if buffer[1] in (FUNCTION_CONTROL_COMMAND, FUNCTION_READ_STATUS):
+            return 8
+        if buffer[1] == FUNCTION_WRITE_MULTIPLE:
+            return 9 + buffer[6] if len(buffer) >= 7 else None
+        return len(buffer) # unknown function, drop what we have
+
+    def split(self, buffer: bytes) -> tuple:
+        frames = []
+        while True:
+            length = self._frame_length(buffer)
+            if length is None or len(buffer) < length:
+                return frames, buffer
+            frames.append(buffer[:length])
+            buffer = buffer[length:]
+
+    def _command(self, address: int, relay: int, cmd: int) -> None:
+        """Applies a control command to a relay, call with the lock held"""
+
+        state = self.relays[address]
+        before = list(state)
+        if cmd == CMD_ALL_ON:
+            state[1:] = [True] * NUM_RELAYS
+        elif cmd == CMD_ALL_OFF:
+            state[1:] = [False] * NUM_RELAYS
+        elif 1 <= relay <= NUM_RELAYS:
+            if cmd in (CMD_ON, CMD_DELAY):
+                state[relay] = True
+            elif cmd in (CMD_OFF, CMD_MOMENTARY):
+                # momentary pulses the relay, it is off again by the time anyone looks
+                state[relay] = False
+            elif cmd == CMD_TOGGLE:
+                state[relay] = not state[relay]
+            elif cmd == CMD_LATCH:
+                state[1:] = [r == relay for r in range(1, NUM_RELAYS + 1)]
+        self.transitions += sum(a != b for a, b in zip(before, state))
+
+    def respond(self, frame: bytes) -> bytes:
+        data = list(frame)
+
+        # Boards ignore frames with a bad CRC or for other addresses
+        if len(data) < 4 or Modbus.crc(data[:-2]) != data[-2:] or data[0] not in self.relays:
+            return None
+        address, function = data[0], data[1]
+
+        with self.lock:
+            if function == FUNCTION_CONTROL_COMMAND:
+                self._command(address, data[3], data[4])
+                response = data[:6]
+            elif function == FUNCTION_WRITE_MULTIPLE:
+                first, count = data[3], data[5]
+                for index in range(count):
+                    self._command(address, first + index, data[7 + 2 * index])
+                response = data[:6]
+            elif function == FUNCTION_READ_STATUS:
+                relay = data[3]
+                on = 1 if 1 <= relay <= NUM_RELAYS and self.relays[address][relay] else 0
+                response = [address, function, 0x02, 0x00, on]
+            else:
+                return None
+
+        return bytes(response + Modbus.crc(response))
+
+    def corrupt(self, response: bytes) -> bytes:
+        return response[:-1] + bytes([response[-1] ^ 0xFF])
+
+
+class OmegaEmulator(PtyEmulator):
+    """Omega PID controllers on one RS-485 bus, speaking Modbus ASCII with LRC
+
+    Register 1000 holds the temperature and 1001 the setpoint, both in 0.1 C. The temperature moves toward
+    the setpoint at ramp_rate.
+    """
+
+    def __init__(self, temperatures: dict = None, ramp_rate: float = 0.5, **kwargs) -> None:
+        """Initializes the controllers with setpoints equal to their temperatures
+
+        Args:
+            temperatures (dict): temperatures[address] = starting temperature (C), defaults to {1: 25}
+            ramp_rate (float): heating/cooling rate toward the setpoint (C/s)
+            **kwargs: latency, baud_rate, wire_timing, fault_rate, seed (see PtyEmulator)
+        """
+
+        super().__init__(**kwargs)
+
+        if temperatures is None:
+            temperatures = {1: 25.0}
+        self.ramp_rate = ramp_rate
+        self.temperatures = dict(temperatures)
+        self.setpoints = dict(temperatures)
+        self.updated = time.monotonic()
+
+    @staticmethod
+    def lrc(body: bytes) -> bytes:
+        """LRC of the hex characters of a frame, as two hex characters"""
+
+        values = [int(body[i : i + 2], 16) for i in range(0, len(body), 2)]
+        return "{0:02X}".format((-sum(values)) % 256).encode()
+
+    def _ramp(self) -> None:
+        """Moves temperatures toward their setpoints, call with the lock held"""
+
+        now = time.monotonic()
+        step = self.ramp_rate * (now - self.updated)
+        self.updated = now
+        for address, temperature in self.temperatures.items():
+            error = self.setpoints[address] - temperature
+            self.temperatures[address] = temperature + max(-step, min(step, error))
+
+    def split(self, buffer: bytes) -> tuple:
+        frames = []
+        while b"\r\n" in buffer:
+            frame, buffer = buffer.split(b"\r\n", 1)
+            start = frame.rfind(b":")
+            if start >= 0:
+                frames.append(frame[start:] + b"\r\n")
+        return frames, buffer
+
+    def respond(self, frame: bytes) -> bytes:
+        body = frame[1:-4]
+        if len(body) < 12 or frame[-4:-2] != self.lrc(body):
+            return None
+        try:
+            address = int(body[0:2], 16)
+            command = int(body[2:4], 16)
+            register = body[4:8].decode()
+            content = int(body[8:12], 16)
+        except ValueError:
+            return None
+        if address not in self.temperatures:
+            return None
+
+        with self.lock:
+            self._ramp()
+            registers = {
+                "1000": round(self.temperatures[address] * 10),
+                "1001": round(self.setpoints[address] * 10),
+            }
+
+            # Write single register, the controller echoes the request
+            if command == 6 and register == "1001":
+                self.setpoints[address] = content / 10
+                return frame
+
+            # Read holding registers
+            if command == 3 and register in registers:
+                names = list(registers)[list(registers).index(register):][:content]
+                data = "".join("{0:04X}".format(registers[name]) for name in names).encode()
+                body = "{0:02X}{1:02X}{2:02X}".format(address, command, len(data) // 2).encode() + data
+                return b":" + body + self.lrc(body) + b"\r\n"
+
+        return None
+
+    def corrupt(self, response: bytes) -> bytes:
+        lrc = int(response[-4:-2], 16) ^ 0xFF
+        return response[:-4] + "{0:02X}".format(lrc).encode() + b"\r\n"
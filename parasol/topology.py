@@ -0,0 +1,117 @@
+from parasol.configuration.configuration import Configuration
+config = Configuration()
+constants = config.get_config()['topology']
+
+# Process wide topology, built from the config on first use
+_topology = None
+
+
+class Topology:
+    """Layout of the rack: strings, their modules, load channels and monitoring stations
+
+    Every lookup the controller, relay and UI make per string or module is a precomputed dict, so the cost
+    of a lookup does not grow with the size of the rack.
+    """
+
+    def __init__(
+        self,
+        num_strings: int,
+        modules_per_string: int,
+        load_channels: list = None,
+        outdoor_stations: list = None,
+        indoor_stations: list = None,
+    ) -> None:
+        """Builds the lookup tables
+
+        Args:
+            num_strings (int): number of strings, ids 1 to num_strings
+            modules_per_string (int): modules per string, module channels are numbered string by string from 1
+            load_channels (list[int], optional): load channel of each string, strings are numbered 1, 2, ... if empty
+            outdoor_stations (list[int], optional): monitoring station of each string outdoors, a single entry
+                is shared by every string. Defaults to station 0 for every string
+            indoor_stations (list[int], optional): monitoring station of each string indoors, a single entry
+                is shared by every string. Defaults to station = string id
+
+        Raises:
+            ValueError: a list does not have an entry per string, or two strings share a load channel
+        """
+
+        self.num_strings = num_strings
+        self.modules_per_string = modules_per_string
+        self.num_modules = num_strings * modules_per_string
+        self.strings = list(range(1, num_strings + 1))
+
+        # module_channels[id] = [modules], module_string[module] = id
+        self.module_channels = {}
+        self.module_string = {}
+        for id in self.strings:
+            modules = list(range((id - 1) * modules_per_string + 1, id * modules_per_string + 1))
+            self.module_channels[id] = modules
+            for module in modules:
+                self.module_string[module] = id
+
+        # load_channels[id] = load channel
+        load_channels = load_channels or self.strings
+        self.load_channels = dict(zip(self.strings, self._per_string(load_channels, "load_channels", shared=False)))
+        if len(set(self.load_channels.values())) != num_strings:
+            raise ValueError("Two strings share a load channel")
+
+        # stations[mode][id] = monitoring station, station_strings[mode][station] = [ids]
+        self.stations = {
+            "outdoor": dict(zip(self.strings, self._per_string(outdoor_stations or [0], "outdoor_stations"))),
+            "indoor": dict(zip(self.strings, self._per_string(indoor_stations or self.strings, "indoor_stations"))),
+        }
+        self.station_strings = {}
+        for mode, stations in self.stations.items():
+            self.station_strings[mode] = {}
+            for id, station in stations.items():
+                self.station_strings[mode].setdefault(station, []).append(id)
+
+    def _per_string(self, values: list, name: str, shared: bool = True) -> list:
+        """Expands a per string list, a single entry is used for every string when shared"""
+
+        if shared and len(values) == 1:
+            return list(values) * self.num_strings
+        if len(values) != self.num_strings:
+            raise ValueError(f"topology.{name} needs one entry per string ({self.num_strings}), got {len(values)}")
+        return list(values)
+
+    def get_stations(self, mode: str) -> dict:
+        """Monitoring station of each string
+
+        Args:
+            mode (str): 'indoor' or 'outdoor', None has no stations
+
+        Returns:
+            dict: stations[id] = monitoring station
+        """
+
+        return dict(self.stations.get(mode, {}))
+
+    def string_of(self, module: int) -> int:
+        """Gets the string a module channel belongs to
+
+        Args:
+            module (int): module channel
+
+        Returns:
+            int: string id, None if the module is not in the rack
+        """
+
+        return self.module_string.get(module)
+
+
+def get_topology() -> Topology:
+    """Returns the topology of the configured rack, built on first use"""
+
+    global _topology
+
+    if _topology is None:
+        _topology = Topology(
+            constants["num_strings"],
+            constants["modules_per_string"],
+            constants["load_channels"],
+            constants["outdoor_stations"],
+            constants["indoor_stations"],
+        )
+    return _topology
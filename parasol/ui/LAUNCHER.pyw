@@ -1,4 +1,5 @@
 from LAUNCH_UI import LAUNCHER
 
-# Launch the GUI without terminal
-LAUNCHER()
+# Launch the GUI without terminal, guarded so analysis worker processes do not relaunch it
+if __name__ == "__main__":
+    LAUNCHER()